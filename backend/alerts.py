@@ -0,0 +1,96 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from crisis import CrisisEngine, forecast_to_columns
+
+
+# -----------------------------
+# Proactive Weather Alerts
+# -----------------------------
+def group_by_tile(subscriptions):
+    # [(user_id, tile), ...] -> {tile: [user_id, ...]}
+    users_by_tile = defaultdict(list)
+    for user_id, tile in subscriptions:
+        users_by_tile[tile].append(user_id)
+    return users_by_tile
+
+
+def fetch_tile_forecasts(tiles, fetch_tile, max_workers=8):
+    # One fetch per distinct tile, at most max_workers in flight
+    def fetch(tile):
+        try:
+            return tile, fetch_tile(tile), None
+        except Exception as e:
+            return tile, None, e
+
+    forecasts = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alert-fetch") as pool:
+        for tile, result, error in pool.map(fetch, tiles):
+            if error is None:
+                forecasts[tile] = result
+            else:
+                errors[tile] = str(error)
+    return forecasts, errors
+
+
+def build_alerts(users_by_tile, crisis_by_tile):
+    # One alert per (user, condition), pointing at the first slot it occurs
+    alerts = []
+    for tile, (crisis_mode, events) in crisis_by_tile.items():
+        if not crisis_mode:
+            continue
+        first_by_condition = {}
+        for event in events:
+            first = first_by_condition.setdefault(event["condition"], {"time": event["time"], "count": 0})
+            first["count"] += 1
+        for user_id in users_by_tile.get(tile, []):
+            for condition, first in first_by_condition.items():
+                alerts.append({
+                    "user_id": user_id,
+                    "tile": tile,
+                    "condition": condition,
+                    "event_time": first["time"],
+                    "slots": first["count"],
+                    # Re-running the job for the same forecast must not re-alert
+                    "dedupe_key": f"{user_id}:{tile}:{condition}:{first['time']}"
+                })
+    return alerts
+
+
+def run_alert_job(subscriptions, fetch_tile, engine=None, columns_fn=None, max_workers=8):
+    # fetch_tile(tile) -> (forecast, meta); columns_fn(tile, forecast, meta)
+    # lets the caller reuse cached columns. Work scales with distinct tiles;
+    # users only matter when alerts are expanded at the end.
+    started = time.perf_counter()
+    engine = engine or CrisisEngine()
+    columns_fn = columns_fn or (lambda tile, forecast, meta: forecast_to_columns(forecast))
+    users_by_tile = group_by_tile(subscriptions)
+    fetched, errors = fetch_tile_forecasts(list(users_by_tile), fetch_tile, max_workers)
+    crisis_by_tile = engine.evaluate_bulk({
+        tile: columns_fn(tile, forecast, meta) for tile, (forecast, meta) in fetched.items()
+    })
+    alerts = build_alerts(users_by_tile, crisis_by_tile)
+    stats = {
+        "users": len(subscriptions),
+        "tiles": len(users_by_tile),
+        "tiles_fetched": len(fetched),
+        "tiles_failed": len(errors),
+        "tiles_in_crisis": sum(1 for mode, _ in crisis_by_tile.values() if mode),
+        "alerts": len(alerts),
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+    return alerts, stats, errors
+
+
+# -----------------------------
+# Notifiers
+# -----------------------------
+class LogNotifier:
+    # Notifier interface: send(alerts) returns the ids that were delivered.
+    # Swap in SMS/push implementations with the same method.
+    def send(self, alerts):
+        for alert in alerts:
+            print(f"[weather alert] user={alert['user_id']} {alert['condition']} at {alert['event_time']} (tile {alert['tile']})")
+        return [alert["id"] for alert in alerts]
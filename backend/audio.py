@@ -0,0 +1,147 @@
+import os
+import subprocess
+import tempfile
+import wave
+from io import BytesIO
+
+import numpy as np
+
+
+# -----------------------------
+# In-memory Audio Ingestion
+# -----------------------------
+TARGET_SAMPLE_RATE = 16000
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class AudioTooLargeError(ValueError):
+    pass
+
+
+def read_upload(stream, max_bytes, chunk_size=READ_CHUNK_SIZE):
+    # Read an upload in chunks and stop as soon as it exceeds the cap
+    buf = BytesIO()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if buf.tell() + len(chunk) > max_bytes:
+            raise AudioTooLargeError(f"Audio upload exceeds {max_bytes // (1024 * 1024)} MB limit.")
+        buf.write(chunk)
+    return buf.getvalue()
+
+
+def _wav_to_float(data):
+    with wave.open(BytesIO(data), "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2")
+        if channels > 1:
+            # Downmix in integer space before the single float conversion
+            mono = samples[0::channels].astype(np.int32)
+            for c in range(1, channels):
+                mono += samples[c::channels]
+            return mono.astype(np.float32) * np.float32(1.0 / (32768.0 * channels)), rate
+        return samples.astype(np.float32) * np.float32(1.0 / 32768.0), rate
+    elif width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
+        ints = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8) | (raw[:, 2].astype(np.int32) << 16))
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes.")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def _resample(samples, rate, target_rate):
+    if rate == target_rate or len(samples) == 0:
+        return samples
+    # Linear interpolation; speech recognition doesn't need a polyphase filter
+    n_out = int(len(samples) * target_rate // rate)
+    positions = np.arange(n_out, dtype=np.float64) * (rate / target_rate)
+    index = positions.astype(np.int64)
+    frac = (positions - index).astype(np.float32)
+    nxt = np.minimum(index + 1, len(samples) - 1)
+    return samples[index] + (samples[nxt] - samples[index]) * frac
+
+
+# ISO base media (mp4/m4a/3gp) box types that can open the file
+_ISO_BMFF_BOXES = (b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide")
+
+
+def _needs_seekable_input(data):
+    # MP4-family files often carry their index (the moov atom) after the
+    # audio data, which ffmpeg can only reach by seeking, so they can't be
+    # read from a pipe
+    return data[4:8] in _ISO_BMFF_BOXES
+
+
+def _ffmpeg_decode(data, ffmpeg="ffmpeg", target_rate=TARGET_SAMPLE_RATE):
+    # Decode any container ffmpeg understands straight to 16-bit mono PCM.
+    # Streamable formats are piped through stdin; MP4-family files go
+    # through a temp file so ffmpeg can seek to the moov atom.
+    output_args = ["-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(target_rate), "pipe:1"]
+    if not _needs_seekable_input(data):
+        proc = subprocess.run(
+            [ffmpeg, "-hide_banner", "-loglevel", "error", "-i", "pipe:0"] + output_args,
+            input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False
+        )
+    else:
+        tmp = tempfile.NamedTemporaryFile(suffix=".m4a", delete=False)
+        try:
+            with tmp:
+                tmp.write(data)
+            proc = subprocess.run(
+                [ffmpeg, "-hide_banner", "-loglevel", "error", "-i", tmp.name] + output_args,
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False
+            )
+        finally:
+            os.remove(tmp.name)
+    if proc.returncode != 0:
+        raise ValueError(f"Audio conversion error: {proc.stderr.decode('utf-8', 'replace').strip()}")
+    return np.frombuffer(proc.stdout, dtype="<i2")
+
+
+def decode_to_pcm(data, ffmpeg="ffmpeg", target_rate=TARGET_SAMPLE_RATE, trim=True):
+    # Returns mono int16 PCM at target_rate, optionally with leading and
+    # trailing silence removed. WAV is parsed in-process (and trimmed before
+    # resampling so silence is never resampled); other formats (m4a from the
+    # app, ogg, mp3) go through a single ffmpeg pass.
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        samples, rate = _wav_to_float(data)
+        if trim:
+            samples = trim_silence(samples, rate)
+        samples = _resample(samples, rate, target_rate)
+        return (np.clip(samples, -1.0, 1.0) * 32767.0).astype(np.int16)
+    pcm = _ffmpeg_decode(data, ffmpeg, target_rate)
+    return trim_silence(pcm, target_rate) if trim else pcm
+
+
+def trim_silence(pcm, sample_rate=TARGET_SAMPLE_RATE, frame_ms=20, threshold_db=-35.0, padding_ms=200):
+    # Energy-based VAD: frames whose RMS is threshold_db below the loudest
+    # frame are silence. Only leading/trailing silence is removed.
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(pcm) // frame
+    if n_frames == 0:
+        return pcm
+    frames = pcm[:n_frames * frame].reshape(n_frames, frame).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    peak = rms.max()
+    if peak <= 0:
+        return pcm[:0]
+    voiced = np.flatnonzero(rms >= peak * (10.0 ** (threshold_db / 20.0)))
+    pad = int(padding_ms / frame_ms)
+    start = max(0, voiced[0] - pad) * frame
+    end = min(n_frames, voiced[-1] + 1 + pad) * frame
+    if voiced[-1] + 1 + pad >= n_frames:
+        end = len(pcm)
+    return pcm[start:end]
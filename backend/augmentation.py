@@ -1,59 +1,49 @@
+import os
+
 import tensorflow as tf
 from tensorflow.keras import layers, models
 from tensorflow.keras.applications import EfficientNetB0
 from tensorflow.keras.applications.efficientnet import preprocess_input
 
+from training_data import METADATA_FILE, load_dataset, read_metadata, write_shards
+
 # -------------------------
 # 1. Data Loading and Setup
 # -------------------------
 
 # Define parameters
 data_dir = r"C:\Users\LENOVO\Desktop\PlantVillage-Dataset\raw\color"
+# Pre-resized TFRecord shards of data_dir, written on the first run. Same
+# default folder as training_data.py, wherever the script is run from.
+shard_dir = os.environ.get("SHARD_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "shards"))
 img_size = (224, 224)
 batch_size = 32
 seed = 123
 
-# Create training dataset (80% of data)
-train_dataset = tf.keras.preprocessing.image_dataset_from_directory(
-    data_dir,
-    validation_split=0.2,
-    subset="training",
-    seed=seed,
-    image_size=img_size,
-    batch_size=batch_size
-)
+# Same weights initialisation, shuffling and augmentation on every run
+tf.keras.utils.set_random_seed(seed)
+
+if not os.path.exists(os.path.join(shard_dir, METADATA_FILE)):
+    write_shards(data_dir, shard_dir, seed=seed)
 
 # **Extract class names and number of classes BEFORE applying transformations**
-class_names = train_dataset.class_names
+class_names = read_metadata(shard_dir)["class_names"]
 num_classes = len(class_names)
 print("Found classes:", class_names)
 
-# Create validation dataset (20% of data)
-validation_dataset = tf.keras.preprocessing.image_dataset_from_directory(
-    data_dir,
-    validation_split=0.2,
-    subset="validation",
-    seed=seed,
-    image_size=img_size,
-    batch_size=batch_size
-)
-
-# Optimize datasets with caching, shuffling (for training), and prefetching
-AUTOTUNE = tf.data.AUTOTUNE
-
-train_dataset = train_dataset.cache().shuffle(1000).prefetch(buffer_size=AUTOTUNE)
-validation_dataset = validation_dataset.cache().prefetch(buffer_size=AUTOTUNE)
+# Training (80%) and validation (20%) splits are streamed from the shards
+# with parallel reads and decoding and prefetching, so the dataset no
+# longer has to fit in memory.
+train_dataset = load_dataset(shard_dir, "train", batch_size, seed=seed)
+validation_dataset = load_dataset(shard_dir, "validation", batch_size, seed=seed)
 
 # -------------------------
 # 2. Data Augmentation Setup
 # -------------------------
 
-# Build a Keras Sequential model for on-the-fly data augmentation.
-data_augmentation = tf.keras.Sequential([
-    layers.RandomFlip("horizontal"),
-    layers.RandomRotation(0.1),
-    layers.RandomZoom(0.1)
-], name="data_augmentation")
+# Random flip, rotation (0.1) and zoom (0.1) are applied to the training
+# batches inside the input pipeline (training_data.augment_batch), in
+# parallel with the training step rather than as layers in the model.
 
 # -------------------------
 # 3. Build the Model
@@ -63,10 +53,9 @@ data_augmentation = tf.keras.Sequential([
 base_model = EfficientNetB0(weights='imagenet', include_top=False, input_shape=img_size + (3,))
 base_model.trainable = False  # Freeze the base model initially
 
-# Build the full model by chaining augmentation, preprocessing, base model, and classification head.
+# Build the full model by chaining preprocessing, base model, and classification head.
 inputs = tf.keras.Input(shape=img_size + (3,))
-x = data_augmentation(inputs)          # Apply augmentation (only active during training)
-x = preprocess_input(x)                # Apply preprocessing required by EfficientNet
+x = preprocess_input(inputs)           # Apply preprocessing required by EfficientNet
 x = base_model(x, training=False)      # Pass the input through the base model
 x = layers.GlobalAveragePooling2D()(x) # Reduce the spatial dimensions
 x = layers.Dropout(0.2)(x)             # Add dropout for regularization
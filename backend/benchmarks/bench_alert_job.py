@@ -0,0 +1,56 @@
+"""Weather-alert batch job scaling: distinct tiles vs. number of users.
+
+Runs the alert job against a local stub OpenWeather server with a cold
+forecast cache. Holding tiles fixed while users grow should leave the job
+time nearly flat; growing tiles should grow it linearly (divided by the
+fetch concurrency). Run from the backend folder:
+
+    python benchmarks/bench_alert_job.py --workers 8 --latency-ms 50
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alerts import run_alert_job  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from stubs import StubOpenWeatherServer  # noqa: E402
+from weather import ForecastCache, OpenWeatherClient, geohash_encode  # noqa: E402
+
+
+def subscriptions(n_users, n_tiles, rng):
+    tiles = set()
+    while len(tiles) < n_tiles:
+        tiles.add(geohash_encode(rng.uniform(8, 35), rng.uniform(68, 97)))
+    tiles = sorted(tiles)
+    return [(user_id, rng.choice(tiles)) for user_id in range(n_users)]
+
+
+def run(stub, n_users, n_tiles, workers):
+    stub.calls = 0
+    cache = ForecastCache(OpenWeatherClient(HttpClient(), "x", base_url=stub.base_url).fetch_forecast)
+    subs = subscriptions(n_users, n_tiles, random.Random(n_tiles))
+    _, stats, _ = run_alert_job(subs, cache.get_tile, max_workers=workers)
+    print(f"users={n_users:>7} tiles={n_tiles:>4}  job={stats['seconds'] * 1000.0:8.1f} ms  "
+          f"upstream calls={stub.calls:>4}  alerts={stats['alerts']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    with StubOpenWeatherServer(latency=args.latency_ms / 1000.0) as stub:
+        print("fixed tiles, growing users")
+        for n_users in (1000, 10000, 100000):
+            run(stub, n_users, 64, args.workers)
+        print("fixed users, growing tiles")
+        for n_tiles in (32, 64, 128, 256):
+            run(stub, 10000, n_tiles, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Voice /chat ingestion: temp-file + pydub + sr.AudioFile vs. in-memory PCM.
+
+Synthesizes a speech-like clip (tone bursts with leading/trailing silence) as
+44.1 kHz stereo WAV and, when ffmpeg is available, OGG. Measures
+upload-to-recognizer-input time and the PCM bytes handed to the recognizer.
+Run from the backend folder:
+
+    python benchmarks/bench_audio.py --seconds 8 --iterations 10
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from io import BytesIO
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio import decode_to_pcm, read_upload  # noqa: E402
+
+
+def make_wav(seconds, rate=44100, silence=1.5):
+    t = np.arange(int(seconds * rate)) / rate
+    voice = 0.4 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 3 * t) > 0)
+    pad = np.zeros(int(silence * rate))
+    mono = np.concatenate([pad, voice, pad]) + np.random.normal(0, 0.002, len(voice) + 2 * len(pad))
+    stereo = np.repeat((np.clip(mono, -1, 1) * 32767).astype("<i2")[:, None], 2, axis=1)
+    buf = BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(stereo.tobytes())
+    return buf.getvalue()
+
+
+def to_ogg(wav_bytes):
+    proc = subprocess.run(["ffmpeg", "-loglevel", "error", "-i", "pipe:0", "-f", "ogg", "pipe:1"],
+                          input=wav_bytes, stdout=subprocess.PIPE, check=True)
+    return proc.stdout
+
+
+def legacy_path(data, filename):
+    # Previous flow: save under the client filename, convert non-WAV with
+    # pydub to a second file on disk, then reread it for the recognizer.
+    temp_path = os.path.join(tempfile.gettempdir(), filename)
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    audio_path = temp_path
+    if not filename.lower().endswith(".wav"):
+        from pydub import AudioSegment
+        wav_path = os.path.splitext(temp_path)[0] + ".wav"
+        AudioSegment.from_file(temp_path).export(wav_path, format="wav")
+        audio_path = wav_path
+    try:
+        import speech_recognition as sr
+        with sr.AudioFile(audio_path) as source:
+            return len(sr.Recognizer().record(source).frame_data)
+    except ImportError:
+        with wave.open(audio_path, "rb") as wav:
+            return len(wav.readframes(wav.getnframes()))
+
+
+def in_memory_path(data, filename):
+    pcm = decode_to_pcm(read_upload(BytesIO(data), 10 * 1024 * 1024))
+    return pcm.nbytes
+
+
+def measure(fn, data, filename, iterations):
+    payload = fn(data, filename)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(data, filename)
+    return (time.perf_counter() - start) * 1000.0 / iterations, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=8.0)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    wav = make_wav(args.seconds)
+    cases = [("wav", wav, "bench_clip.wav")]
+    if shutil.which("ffmpeg"):
+        cases.append(("ogg", to_ogg(wav), "bench_clip.ogg"))
+    else:
+        print("ffmpeg not found; skipping OGG case")
+    for label, data, filename in cases:
+        old_ms, old_bytes = measure(legacy_path, data, filename, args.iterations)
+        new_ms, new_bytes = measure(in_memory_path, data, filename, args.iterations)
+        print(f"{label:<4} before={old_ms:8.2f} ms ({old_bytes / 1024:8.1f} KiB to recognizer)  "
+              f"after={new_ms:8.2f} ms ({new_bytes / 1024:8.1f} KiB to recognizer)")
+
+
+if __name__ == "__main__":
+    main()
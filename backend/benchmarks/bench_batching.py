@@ -0,0 +1,88 @@
+"""Compare per-request inference against the micro-batching engine.
+
+Uses a synthetic stand-in model whose cost is a fixed per-call overhead plus a
+small per-image cost, which is roughly how Keras ``Model.predict`` behaves on
+CPU. Run from the backend folder:
+
+    python benchmarks/bench_batching.py --clients 32 --requests 20
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import BatchInferenceEngine  # noqa: E402
+
+
+class SyntheticModel:
+    def __init__(self, num_classes=38, call_overhead_ms=20.0, per_image_ms=2.0):
+        self.num_classes = num_classes
+        self.call_overhead = call_overhead_ms / 1000.0
+        self.per_image = per_image_ms / 1000.0
+        # A single CPU-bound runtime: concurrent calls do not overlap
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def predict(self, batch):
+        with self._lock:
+            self.calls += 1
+            time.sleep(self.call_overhead + self.per_image * len(batch))
+            logits = np.random.rand(len(batch), self.num_classes).astype("float32")
+            return logits / logits.sum(axis=1, keepdims=True)
+
+
+def _percentile(values, q):
+    return float(np.percentile(np.asarray(values) * 1000.0, q))
+
+
+def run(label, infer, clients, requests_per_client):
+    img = np.random.rand(1, 224, 224, 3).astype("float32")
+    latencies = []
+    lat_lock = threading.Lock()
+
+    def client():
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            infer(img)
+            elapsed = time.perf_counter() - start
+            with lat_lock:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for _ in range(clients):
+            pool.submit(client)
+    total = time.perf_counter() - start
+    print(f"{label:<14} req/s={len(latencies) / total:8.1f}  "
+          f"p50={_percentile(latencies, 50):8.1f} ms  p99={_percentile(latencies, 99):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--call-overhead-ms", type=float, default=20.0)
+    parser.add_argument("--per-image-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    model = SyntheticModel(call_overhead_ms=args.call_overhead_ms, per_image_ms=args.per_image_ms)
+    run("per-request", model.predict, args.clients, args.requests)
+    per_request_calls = model.calls
+
+    model.calls = 0
+    engine = BatchInferenceEngine(model.predict, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    run("micro-batched", engine.submit, args.clients, args.requests)
+    engine.stop()
+    print(f"forward passes: per-request={per_request_calls}  micro-batched={model.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Time-to-first-token for blocking /chat vs. SSE /chat/stream.
+
+Both routes are served by a throwaway Flask app backed by the fake streaming
+model, so no Gemini key or network is needed. Run from the backend folder:
+
+    python benchmarks/bench_chat_ttft.py --runs 5 --first-token-ms 500 --chunk-ms 80
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from flask import Flask, Response, jsonify, stream_with_context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streaming import stream_chat_events  # noqa: E402
+from stubs import FakeGenerativeModel  # noqa: E402
+
+
+def build_app(model):
+    app = Flask(__name__)
+
+    @app.route('/chat', methods=['POST'])
+    def chat():
+        return jsonify({"response": model.generate_content("prompt").text, "audio_response": ""})
+
+    @app.route('/chat/stream', methods=['POST'])
+    def chat_stream():
+        return Response(stream_with_context(stream_chat_events(model, "prompt")), mimetype="text/event-stream")
+
+    return app
+
+
+def measure(client, path):
+    start = time.perf_counter()
+    response = client.post(path, json={"prompt": "late blight?"}, buffered=False)
+    first = None
+    for chunk in response.response:
+        if first is None and chunk:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    response.close()
+    return first * 1000.0, total * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--first-token-ms", type=float, default=500.0)
+    parser.add_argument("--chunk-ms", type=float, default=80.0)
+    args = parser.parse_args()
+
+    model = FakeGenerativeModel(first_token_delay=args.first_token_ms / 1000.0, chunk_delay=args.chunk_ms / 1000.0)
+    client = build_app(model).test_client()
+    for path in ("/chat", "/chat/stream"):
+        samples = [measure(client, path) for _ in range(args.runs)]
+        ttft = statistics.median(s[0] for s in samples)
+        total = statistics.median(s[1] for s in samples)
+        print(f"{path:<13} time-to-first-byte={ttft:8.1f} ms  total={total:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Cold start: import time and RSS of the app with eager vs. lazy heavy dependencies.
+
+Each scenario runs in a fresh interpreter that imports the app (with the
+fake Gemini/TTS stand-ins and a temporary database), serves one request
+through the test client, and reports import time, time to that first
+response, peak RSS and which heavy modules ended up loaded. "eager"
+additionally imports what app.py used to import at top level
+(TensorFlow, google.generativeai, speech_recognition, pydub) and loads
+--model if given; libraries that are not installed are listed as missing.
+Run from the backend folder:
+
+    python benchmarks/bench_cold_start.py --model plant_disease_prediction_model.h5
+"""
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("tensorflow", "google.generativeai", "speech_recognition", "pydub", "selenium", "gtts")
+SCENARIOS = [
+    # (label, blueprints, eager, first request)
+    ("eager imports (before)", None, True, "/health"),
+    ("lazy, all blueprints", None, False, "/health"),
+    ("lazy, marketplace only", "marketplace", False, "/rentals"),
+    ("lazy, geo only", "geo", False, "/health"),
+    ("lazy, disease only", "disease", False, "/health"),
+]
+
+
+def child(blueprints, eager, path, model):
+    sys.path.insert(0, BACKEND_DIR)
+    start = time.perf_counter()
+    missing = []
+    if eager:
+        for name in HEAVY_MODULES[:4]:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                missing.append(name)
+    import app
+    if eager and model:
+        app.subsystems["disease"].disease_model.get()
+    imported = time.perf_counter()
+    with app.app.app_context():
+        app.migrate()
+    response = app.app.test_client().get(path)
+    first_response = time.perf_counter()
+    print(json.dumps({
+        "import_s": imported - start,
+        "first_response_s": first_response - start,
+        "status": response.status_code,
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        "loaded": [name for name in HEAVY_MODULES if name in sys.modules],
+        "missing": missing
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="disease model to load in the eager scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario (best is reported)")
+    parser.add_argument("--child", nargs=3, metavar=("BLUEPRINTS", "EAGER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        blueprints, eager, path = args.child
+        child(blueprints, eager == "1", path, args.model)
+        return
+
+    print(f"{'scenario':<26} {'import s':>8} {'1st resp s':>10} {'peak RSS MiB':>13}  heavy modules loaded")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, blueprints, eager, path in SCENARIOS:
+            env = dict(os.environ, KRISHISAHAY_FAKE_LLM="1", KRISHISAHAY_FAKE_TTS="1", MODEL_WARMUP="lazy",
+                       DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'cold_start.db')}", PREDICTION_CACHE_DB="",
+                       LLM_CACHE_DB="", GEOCODE_CACHE_DB="", PLACE_DETAILS_DB="", SCHEMES_DB=os.path.join(tmp, "schemes.sqlite3"),
+                       MEDIA_ROOT=os.path.join(tmp, "media"))
+            if blueprints:
+                env["KRISHISAHAY_BLUEPRINTS"] = blueprints
+            command = [sys.executable, os.path.abspath(__file__), "--child", blueprints or "", "1" if eager else "0", path]
+            if args.model:
+                command += ["--model", os.path.abspath(args.model)]
+            runs = []
+            for _ in range(args.repeat):
+                out = subprocess.run(command, env=env, check=True, capture_output=True, text=True, cwd=tmp).stdout
+                runs.append(json.loads(out.strip().splitlines()[-1]))
+            best = min(runs, key=lambda r: r["import_s"])
+            note = ", ".join(best["loaded"]) or "-"
+            if best["missing"]:
+                note += f"  (not installed: {', '.join(best['missing'])})"
+            print(f"{label:<26} {best['import_s']:8.2f} {best['first_response_s']:10.2f} {best['peak_rss_mib']:13.0f}  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Crisis detection cost: per-request Python loop vs. vectorized rule engine.
+
+Evaluates the default rule table over synthetic 40-slot forecasts for many
+tiles, one request at a time (old loop and engine) and in one bulk pass. The
+one-off cost of converting each cached forecast to columns is reported
+separately.
+Run from the backend folder:
+
+    python benchmarks/bench_crisis.py --tiles 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crisis import CrisisEngine, forecast_to_columns, rules_for  # noqa: E402
+from stubs import fake_forecast  # noqa: E402
+
+
+def legacy_scan(forecast_data):
+    # The loop previously inlined in /weather
+    crisis_mode = False
+    crisis_events = []
+    for item in forecast_data.get("list", []):
+        weather_info = item.get("weather", [{}])[0]
+        weather_main = weather_info.get("main", "").lower()
+        forecast_time = item.get("dt_txt", "Unknown time")
+        temp = item.get("main", {}).get("temp", None)
+        wind_speed = item.get("wind", {}).get("speed", 0)
+        rain = item.get("rain", {}).get("3h", 0)
+        if weather_main in ["thunderstorm", "tornado"]:
+            crisis_mode = True
+            crisis_events.append({"time": forecast_time, "condition": weather_main.title()})
+        if rain and rain > 20:
+            crisis_mode = True
+            crisis_events.append({"time": forecast_time, "condition": "Heavy Rain"})
+        if temp is not None and temp > 40:
+            crisis_mode = True
+            crisis_events.append({"time": forecast_time, "condition": "Extreme Heat"})
+        if temp is not None and temp < 5:
+            crisis_mode = True
+            crisis_events.append({"time": forecast_time, "condition": "Severe Cold"})
+        if wind_speed and wind_speed > 20:
+            crisis_mode = True
+            crisis_events.append({"time": forecast_time, "condition": "High Winds"})
+        if weather_main in ["dust", "sand", "ash"] and wind_speed > 10:
+            crisis_mode = True
+            crisis_events.append({"time": forecast_time, "condition": "Dust/Sand Storm"})
+    return crisis_mode, crisis_events
+
+
+def timed(label, fn, n_tiles):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000.0
+    print(f"{label:<28} total={elapsed:9.2f} ms  per tile={elapsed / n_tiles * 1000.0:8.1f} us")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tiles", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    forecasts = {f"t{i}": fake_forecast(rng.uniform(8, 35), rng.uniform(68, 97)) for i in range(args.tiles)}
+    engine = CrisisEngine()
+
+    old = timed("old loop, per request", lambda: {k: legacy_scan(f) for k, f in forecasts.items()}, args.tiles)
+    # Columns are built once per cached tile forecast and reused afterwards
+    columns = timed("columnarize (once per tile)", lambda: {k: forecast_to_columns(f) for k, f in forecasts.items()}, args.tiles)
+    per = timed("engine, per request", lambda: {k: engine.evaluate(c) for k, c in columns.items()}, args.tiles)
+    bulk = timed("engine, one bulk pass", lambda: engine.evaluate_bulk(columns), args.tiles)
+    timed("bulk + potato rules", lambda: CrisisEngine(rules_for("potato")).evaluate_bulk(columns), args.tiles)
+    print(f"results identical: {old == per == bulk}  tiles in crisis: {sum(m for m, _ in bulk.values())}")
+
+
+if __name__ == "__main__":
+    main()
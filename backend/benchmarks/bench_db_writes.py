@@ -0,0 +1,126 @@
+"""Concurrent writes: default SQLite settings vs. WAL + busy_timeout + pooled engine.
+
+N writer threads each register users and post rentals (the /register and
+POST /rentals transactions) while reader threads page through /rentals and
+run searches, against a temporary SQLite file migrated to the current
+schema. Reports write throughput, p99 write latency and "database is
+locked" failures for the old engine setup and for configure_database().
+Run from the backend folder:
+
+    python benchmarks/bench_db_writes.py --writers 8 --readers 4 --ops 200
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from flask import Flask
+from sqlalchemy.exc import IntegrityError, OperationalError
+from werkzeug.security import generate_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate  # noqa: E402
+from models import Rental, User, configure_database, db  # noqa: E402
+from rental_search import search_rentals  # noqa: E402
+from rentals import list_rentals  # noqa: E402
+
+EQUIPMENT = ["Tractor", "Harvester", "Rotavator", "Sprayer", "Seed Drill", "Thresher"]
+# Hashing is CPU work outside the transaction, the same for both setups
+PASSWORD_HASH = generate_password_hash("secret")
+
+
+def new_rental(rng, username):
+    equipment = rng.choice(EQUIPMENT)
+    return Rental(title=f"{equipment} for rent", description=f"Well maintained {equipment.lower()}, operator available.",
+                  price=float(rng.randrange(300, 5000, 50)), contact="9800000000", equipment_type=equipment,
+                  rental_duration="per day", location="Nashik, Maharashtra", posted_by=username,
+                  lat=20.0 + rng.gauss(0, 0.3), lon=73.79 + rng.gauss(0, 0.3))
+
+
+def writer(app, worker, ops, latencies, errors):
+    rng = random.Random(worker)
+    with app.app_context():
+        for i in range(ops):
+            username = f"farmer-{worker}-{i}"
+            start = time.perf_counter()
+            try:
+                if not User.query.filter_by(username=username).first():
+                    db.session.add(User(username=username, password_hash=PASSWORD_HASH))
+                    db.session.commit()
+                db.session.add(new_rental(rng, username))
+                db.session.commit()
+                latencies.append((time.perf_counter() - start) * 1000.0)
+            except (OperationalError, IntegrityError) as e:
+                db.session.rollback()
+                errors.append(str(e.orig))
+        db.session.remove()
+
+
+def reader(app, stop, counter):
+    with app.app_context():
+        while not stop.is_set():
+            list_rentals(equipment_type="tractor", sort="price_asc", limit=20)
+            search_rentals("well maintained", 20.0, 73.79, radius_km=50)
+            db.session.remove()
+            counter.append(1)
+
+
+def run(label, uri, configure, args):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    if configure:
+        configure_database(app, uri)
+    else:
+        app.config["SQLALCHEMY_DATABASE_URI"] = uri
+        db.init_app(app)
+    with app.app_context():
+        migrate()
+        rng = random.Random(0)
+        db.session.add_all(new_rental(rng, "seed") for _ in range(args.seed))
+        db.session.commit()
+        mode = db.session.execute(db.text("PRAGMA journal_mode")).scalar()
+
+    latencies, errors, reads = [], [], []
+    stop = threading.Event()
+    readers = [threading.Thread(target=reader, args=(app, stop, reads)) for _ in range(args.readers)]
+    writers = [threading.Thread(target=writer, args=(app, w, args.ops, latencies, errors)) for w in range(args.writers)]
+    for thread in readers:
+        thread.start()
+    start = time.perf_counter()
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    locked = sum("locked" in e for e in errors)
+    p99 = np.percentile(latencies, 99) if latencies else float("nan")
+    print(f"{label:<28} journal={mode:<7} {len(latencies) / elapsed:8.1f} writes/s  p99={p99:8.1f} ms  "
+          f"reads/s={len(reads) / elapsed:7.1f}  failed={len(errors)} (locked={locked})")
+    with app.app_context():
+        db.engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=200, help="user + rental writes per writer")
+    parser.add_argument("--seed", type=int, default=5000, help="rentals stored before the run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run("default engine (before)", f"sqlite:///{os.path.join(tmp, 'before.db')}", False, args)
+        run("configure_database (after)", f"sqlite:///{os.path.join(tmp, 'after.db')}", True, args)
+
+
+if __name__ == "__main__":
+    main()
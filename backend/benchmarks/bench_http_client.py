@@ -0,0 +1,80 @@
+"""Outbound HTTP: plain requests.get vs. the pooled HttpClient, plus breaker behaviour.
+
+Starts a local stub OpenWeather server. Compares sequential and concurrent
+latency with a new connection per call against keep-alive pooling, then
+takes the upstream down to show retries, the circuit opening (callers fail
+fast instead of waiting on the upstream) and recovery after the reset
+timeout. Run from the backend folder:
+
+    python benchmarks/bench_http_client.py --requests 500 --clients 16
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import CircuitOpenError, HttpClient  # noqa: E402
+from stubs import StubOpenWeatherServer  # noqa: E402
+
+
+def run(label, get, url, n, clients):
+    latencies = []
+
+    def one(i):
+        start = time.perf_counter()
+        r = get(url, params={"lat": 20 + i % 7, "lon": 77, "appid": "x"})
+        r.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(n)))
+    total = time.perf_counter() - start
+    print(f"{label:<28} req/s={n / total:8.1f}  p50={np.percentile(latencies, 50):6.2f} ms  "
+          f"p99={np.percentile(latencies, 99):6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--reset-timeout", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with StubOpenWeatherServer(latency=args.latency_ms / 1000.0) as stub:
+        url = f"{stub.base_url}/forecast"
+        client = HttpClient(retries=2, backoff_base=0.05, failure_threshold=5, reset_timeout=args.reset_timeout)
+        for clients in (1, args.clients):
+            run(f"requests.get  x{clients}", requests.get, url, args.requests, clients)
+            run(f"HttpClient    x{clients}", lambda u, params: client.get(u, params=params, endpoint="bench"),
+                url, args.requests, clients)
+
+        stub.fail = True
+        stub.calls = 0
+        outcomes = {"503": 0, "circuit open": 0}
+        start = time.perf_counter()
+        for _ in range(20):
+            try:
+                client.get(url, endpoint="bench")
+                outcomes["503"] += 1
+            except CircuitOpenError:
+                outcomes["circuit open"] += 1
+        print(f"upstream down: 20 calls in {(time.perf_counter() - start) * 1000.0:.0f} ms -> {outcomes}, "
+              f"upstream hits={stub.calls}, circuit={client.breaker(url.split('/')[2]).state}")
+
+        stub.fail = False
+        time.sleep(args.reset_timeout)
+        r = client.get(url, params={"lat": 1, "lon": 1}, endpoint="bench")
+        print(f"after reset timeout: status={r.status_code} circuit={client.breaker(url.split('/')[2]).state}")
+        print(f"metrics={client.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Disease model on CPU: Keras Model.predict vs. direct call vs. TFLite (float/float16/dynamic/int8).
+
+Builds the EfficientNetB0 classifier from augmentation.py with random
+weights (or loads --model), exports it with export_model.py in every
+quantization mode, and measures each backend in its own process:
+single-image p50/p99 latency, batch-of-16 throughput, peak RSS and file
+size, plus top-1 agreement with Keras. Pass --data-dir to calibrate INT8
+and check parity on real validation images. Run from the backend folder:
+
+    python benchmarks/bench_inference_backends.py --runs 50
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NUM_CLASSES = 38
+
+
+def build_model(path):
+    import tensorflow as tf
+    from tensorflow.keras import layers
+
+    data_augmentation = tf.keras.Sequential([
+        layers.RandomFlip("horizontal"),
+        layers.RandomRotation(0.1),
+        layers.RandomZoom(0.1)
+    ], name="data_augmentation")
+    base_model = tf.keras.applications.EfficientNetB0(weights=None, include_top=False, input_shape=(224, 224, 3))
+    inputs = tf.keras.Input(shape=(224, 224, 3))
+    x = data_augmentation(inputs)
+    x = base_model(x, training=False)
+    x = layers.GlobalAveragePooling2D()(x)
+    x = layers.Dropout(0.2)(x)
+    outputs = layers.Dense(NUM_CLASSES, activation="softmax")(x)
+    tf.keras.Model(inputs, outputs).save(path)
+
+
+def measure(backend, path, runs, threads):
+    # Runs in a fresh process so RSS reflects one backend only
+    from inference import load_backend
+
+    start = time.perf_counter()
+    if backend == "keras-predict":
+        import tensorflow as tf
+        model = tf.keras.models.load_model(path)
+
+        def predict(batch):
+            return model.predict(batch, verbose=0)
+    else:
+        predict = load_backend(path, backend, intra_op_threads=threads).predict
+    load_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    single = rng.random((1, 224, 224, 3), dtype=np.float32)
+    batch = rng.random((16, 224, 224, 3), dtype=np.float32)
+    predict(single)
+    predict(batch)
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        predict(single)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    start = time.perf_counter()
+    for _ in range(max(1, runs // 8)):
+        predict(batch)
+    batch_rate = 16 * max(1, runs // 8) / (time.perf_counter() - start)
+    print(json.dumps({
+        "load_s": load_s,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "images_per_s": batch_rate,
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="Keras .h5 model (default: build one with random weights)")
+    parser.add_argument("--data-dir", help="validation images for INT8 calibration and parity")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=os.cpu_count())
+    parser.add_argument("--measure", nargs=2, metavar=("BACKEND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure, runs=args.runs, threads=args.threads)
+        return
+
+    import tensorflow as tf
+    from export_model import convert, parity, strip_augmentation, validation_samples
+    from inference import TFLiteBackend
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = args.model
+        if model_path is None:
+            model_path = os.path.join(tmp, "model.h5")
+            build_model(model_path)
+        model = strip_augmentation(tf.keras.models.load_model(model_path))
+        if args.data_dir:
+            images, labels = validation_samples(args.data_dir, 500)
+        else:
+            images, labels = np.random.default_rng(1).random((64, 224, 224, 3), dtype=np.float32), None
+
+        variants = [("keras-predict", model_path, "keras Model.predict (before)"), ("keras", model_path, "keras direct call")]
+        for quantize in ("none", "float16", "dynamic", "int8"):
+            content = convert(model, quantize, images[:200])
+            path = os.path.join(tmp, f"model.{quantize}.tflite")
+            with open(path, "wb") as f:
+                f.write(content)
+            report = parity(lambda batch: model(batch, training=False), TFLiteBackend(model_content=content).predict, images, labels)
+            print(f"tflite {quantize:<8} parity: " + ", ".join(f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}" for k, v in report.items()))
+            variants.append(("tflite", path, f"tflite {quantize}"))
+
+        print(f"{'backend':<30} {'file MiB':>8} {'load s':>7} {'p50 ms':>8} {'p99 ms':>8} {'img/s @16':>10} {'peak RSS MiB':>13}")
+        for backend, path, label in variants:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure", backend, path, "--runs", str(args.runs), "--threads", str(args.threads)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            print(f"{label:<30} {os.path.getsize(path) / 2**20:8.1f} {result['load_s']:7.2f} {result['p50_ms']:8.1f} "
+                  f"{result['p99_ms']:8.1f} {result['images_per_s']:10.1f} {result['peak_rss_mib']:13.0f}")
+        print("TFLite RSS includes TensorFlow unless tflite_runtime is installed.")
+
+
+if __name__ == "__main__":
+    main()
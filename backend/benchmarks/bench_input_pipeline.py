@@ -0,0 +1,154 @@
+"""Training input pipeline: images/s fed to the model, in-memory cache vs. TFRecord shards.
+
+Generates a synthetic PlantVillage-like tree (--classes folders of
+--image-size JPEG leaves), then measures each pipeline in its own process
+over --epochs epochs: augmented images per second delivered to a training
+loop that spends --step-ms per batch, plus peak RSS.
+
+  folder+cache (before)  image_dataset_from_directory + .cache(), with
+                         the Keras data_augmentation layers applied per
+                         batch on the training step's critical path
+  shards jpeg / raw      training_data.load_dataset over shards written by
+                         training_data.write_shards (write time reported)
+
+Also checks that two pipelines built with the same seed yield identical
+batches. Run from the backend folder:
+
+    python benchmarks/bench_input_pipeline.py --images 4000 --epochs 2
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def make_dataset(root, classes, images, size):
+    # Leaf-like ellipses with class-dependent colour and random spots
+    rng = np.random.default_rng(0)
+    for c in range(classes):
+        folder = os.path.join(root, f"Crop___class_{c:02d}")
+        os.makedirs(folder, exist_ok=True)
+        hue = np.array([40 + (5 * c) % 120, 120 + (3 * c) % 100, 30 + (7 * c) % 90])
+        for i in range(images // classes):
+            img = Image.new("RGB", (size, size), tuple(int(v) for v in rng.integers(150, 230, 3)))
+            draw = ImageDraw.Draw(img)
+            m = int(rng.integers(5, size // 6))
+            draw.ellipse((m, m, size - m, size - m), fill=tuple(int(v) for v in np.clip(hue + rng.integers(-20, 20, 3), 0, 255)))
+            for _ in range(int(rng.integers(3, 12))):
+                x, y = (int(v) for v in rng.integers(size // 4, 3 * size // 4, 2))
+                r = int(rng.integers(3, 12))
+                draw.ellipse((x - r, y - r, x + r, y + r), fill=(90, 60, 30))
+            img.save(os.path.join(folder, f"image_{i:05d}.JPG"), quality=90)
+
+
+def measure(variant, data_dir, shard_dir, epochs, batch_size, step_ms):
+    import tensorflow as tf
+
+    build_s = 0.0
+    if variant == "folder":
+        from tensorflow.keras import layers
+        dataset = tf.keras.utils.image_dataset_from_directory(
+            data_dir, validation_split=0.2, subset="training", seed=123, image_size=(224, 224), batch_size=batch_size
+        ).cache().shuffle(1000, seed=123).prefetch(tf.data.AUTOTUNE)
+        data_augmentation = tf.keras.Sequential([
+            layers.RandomFlip("horizontal"),
+            layers.RandomRotation(0.1),
+            layers.RandomZoom(0.1)
+        ], name="data_augmentation")
+
+        def batches():
+            for images, labels in dataset:
+                yield data_augmentation(images, training=True), labels
+    else:
+        from training_data import load_dataset, write_shards
+        encoding = variant.split("-")[1]
+        start = time.perf_counter()
+        write_shards(data_dir, shard_dir, images_per_shard=256, encoding=encoding)
+        build_s = time.perf_counter() - start
+        dataset = load_dataset(shard_dir, "train", batch_size)
+
+        def batches():
+            return iter(dataset)
+
+    rates = []
+    for _ in range(epochs):
+        count = 0
+        start = time.perf_counter()
+        for images, labels in batches():
+            count += int(images.shape[0])
+            if step_ms:
+                time.sleep(step_ms / 1000.0)
+        rates.append(count / (time.perf_counter() - start))
+    print(json.dumps({
+        "build_s": build_s,
+        "rates": rates,
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    }))
+
+
+def check_determinism(shard_dir, batch_size):
+    from training_data import load_dataset
+    first = [next(iter(load_dataset(shard_dir, "train", batch_size, seed=7))) for _ in range(2)]
+    other_seed = next(iter(load_dataset(shard_dir, "train", batch_size, seed=8)))
+    same = all(np.array_equal(a.numpy(), b.numpy()) for a, b in zip(first[0], first[1]))
+    different = not np.array_equal(first[0][0].numpy(), other_seed[0].numpy())
+    print(json.dumps({"same_seed_identical": same, "other_seed_differs": different}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=4000)
+    parser.add_argument("--classes", type=int, default=38)
+    parser.add_argument("--image-size", type=int, default=256, help="PlantVillage photos are 256x256")
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--step-ms", type=float, default=0.0, help="simulated training step per batch")
+    parser.add_argument("--measure", nargs=3, metavar=("VARIANT", "DATA_DIR", "SHARD_DIR"), help=argparse.SUPPRESS)
+    parser.add_argument("--determinism", metavar="SHARD_DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure, epochs=args.epochs, batch_size=args.batch_size, step_ms=args.step_ms)
+        return
+    if args.determinism:
+        check_determinism(args.determinism, args.batch_size)
+        return
+
+    def child(*extra):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--epochs", str(args.epochs), "--batch-size", str(args.batch_size),
+             "--step-ms", str(args.step_ms)] + list(extra),
+            check=True, capture_output=True, text=True
+        ).stdout
+        return json.loads(out.strip().splitlines()[-1])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "images")
+        start = time.perf_counter()
+        make_dataset(data_dir, args.classes, args.images, args.image_size)
+        print(f"synthetic dataset: {args.images} images, {args.classes} classes, {args.image_size}px "
+              f"({time.perf_counter() - start:.1f}s to generate); step {args.step_ms:.0f} ms/batch")
+        header = " ".join(f"{f'epoch {i + 1} img/s':>14}" for i in range(args.epochs))
+        print(f"{'pipeline':<22} {'prep s':>7} {header} {'peak RSS MiB':>13}")
+        for variant, label in (("folder", "folder+cache (before)"), ("shards-jpeg", "shards jpeg"), ("shards-raw", "shards raw")):
+            shard_dir = os.path.join(tmp, variant)
+            result = child("--measure", variant, data_dir, shard_dir)
+            rates = " ".join(f"{rate:14.0f}" for rate in result["rates"])
+            print(f"{label:<22} {result['build_s']:7.1f} {rates} {result['peak_rss_mib']:13.0f}")
+        result = child("--determinism", os.path.join(tmp, "shards-jpeg"))
+        print(f"same seed -> identical batches: {result['same_seed_identical']}; "
+              f"different seed -> different batches: {result['other_seed_differs']}")
+
+
+if __name__ == "__main__":
+    main()
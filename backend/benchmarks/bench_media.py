@@ -0,0 +1,85 @@
+"""Rental photos: full-size originals vs. WebP renditions from the media store.
+
+Generates synthetic phone-sized JPEGs, stores them through MediaStore,
+waits for the background renditions and reports render time and bytes per
+size. Then serves them through a minimal Flask app with the same route as
+the backend, showing what a 20-item list view downloads and that repeat
+requests revalidate with 304. Run from the backend folder:
+
+    python benchmarks/bench_media.py --photos 20 --workers 2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+import numpy as np
+from flask import Flask, jsonify
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from media import MediaStore  # noqa: E402
+
+
+def synthetic_photo(rng, size=(4000, 3000)):
+    # Smooth gradients plus sensor-like noise compress like a real photo
+    w, h = size
+    x = np.broadcast_to(np.linspace(0, 1, w, dtype=np.float32), (h, w))
+    y = np.broadcast_to(np.linspace(0, 1, h, dtype=np.float32)[:, None], (h, w))
+    base = np.stack([x * 200 + y * 40, (1 - x) * 120 + y * 100, y * 180 + 30], axis=-1)
+    noise = rng.normal(0, 12, (h, w, 3)).astype(np.float32)
+    buf = BytesIO()
+    Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8)).save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    photos = [synthetic_photo(rng) for _ in range(args.photos)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MediaStore(tmp, max_workers=args.workers)
+        start = time.perf_counter()
+        hashes = [store.save(BytesIO(data)) for data in photos]
+        saved = time.perf_counter()
+        while store.stats()["pending"]:
+            time.sleep(0.01)
+        done = time.perf_counter()
+        renditions = store.stats()["renditions_made"]
+        print(f"stored {args.photos} photos in {(saved - start) * 1000:.0f} ms (upload path), "
+              f"{renditions} renditions in {done - saved:.2f} s ({(done - saved) / max(1, renditions) * 1000 * args.workers:.0f} ms each)")
+        # Re-uploading the same bytes stores nothing new
+        assert store.save(BytesIO(photos[0])) == hashes[0]
+
+        app = Flask(__name__)
+
+        @app.route("/media/<content_hash>/<size>")
+        def media_endpoint(content_hash, size):
+            response = store.send(content_hash, size)
+            return response if response is not None else (jsonify({"error": "Media not found."}), 404)
+
+        client = app.test_client()
+        for size in ("original", "large", "thumb"):
+            total = 0
+            for content_hash in hashes:
+                response = client.get(f"/media/{content_hash}/{size}")
+                total += len(response.get_data())
+                response.close()
+            print(f"list view of {len(hashes)} x {size:<8} {total / 1024:10.1f} KiB")
+
+        first = client.get(f"/media/{hashes[0]}/thumb")
+        again = client.get(f"/media/{hashes[0]}/thumb", headers={"If-None-Match": first.headers["ETag"]})
+        print(f"thumb: {first.status_code} {first.headers['Content-Type']} Cache-Control: {first.headers['Cache-Control']}")
+        print(f"revalidate: {again.status_code}, {len(again.get_data())} bytes")
+        print(f"unknown size: {client.get(f'/media/{hashes[0]}/huge').status_code}")
+
+
+if __name__ == "__main__":
+    main()
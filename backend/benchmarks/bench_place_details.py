@@ -0,0 +1,65 @@
+"""Store taps: proxying raw /place_details vs. the prefetched, slimmed details cache.
+
+Starts a local stub GoMaps server, runs store searches, and then "taps"
+stores from the top of each result list. Compares the tap latency and the
+response size of a raw proxy against the details cache warmed by prefetch.
+Run from the backend folder:
+
+    python benchmarks/bench_place_details.py --searches 50 --taps 3
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import HttpClient  # noqa: E402
+from places import PLACE_DETAIL_FIELDS, GoMapsClient, PlaceDetailsCache  # noqa: E402
+from stubs import StubGoMapsServer  # noqa: E402
+
+
+def taps(label, fetch, place_ids):
+    latencies, sizes = [], []
+    for place_id in place_ids:
+        start = time.perf_counter()
+        payload = fetch(place_id)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        sizes.append(len(json.dumps(payload)))
+    print(f"{label:<18} p50={np.percentile(latencies, 50):7.2f} ms  p99={np.percentile(latencies, 99):7.2f} ms  "
+          f"mean size={np.mean(sizes) / 1024:6.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=50)
+    parser.add_argument("--taps", type=int, default=3)
+    parser.add_argument("--prefetch-top", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    with StubGoMapsServer(latency=args.latency_ms / 1000.0) as stub:
+        places = GoMapsClient(HttpClient(), "x", base_url=stub.base_url)
+        searches = [places.text_search(rng.uniform(18, 24), rng.uniform(72, 80), "fertilizer store") for _ in range(args.searches)]
+        tapped = [s["place_id"] for stores in searches for s in stores[:args.taps]]
+
+        taps("raw proxy", lambda place_id: places.details(place_id), tapped)
+
+        cache = PlaceDetailsCache(lambda place_id: places.details(place_id, fields=PLACE_DETAIL_FIELDS))
+        start = time.perf_counter()
+        for stores in searches:
+            cache.prefetch([s["place_id"] for s in stores[:args.prefetch_top]])
+        while cache.stats()["prefetch_pending"]:
+            time.sleep(0.01)
+        print(f"prefetched {cache.prefetched} places in {time.perf_counter() - start:.2f} s")
+        taps("prefetched + slim", lambda place_id: {"status": "OK", "result": cache.get(place_id)}, tapped)
+        print(f"cache={cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
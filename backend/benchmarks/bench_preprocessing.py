@@ -0,0 +1,84 @@
+"""Preprocessing ms per image: temp-file + full decode vs. in-memory draft decode.
+
+Generates a synthetic phone-sized JPEG (4000x3000 by default) so no dataset is
+needed. Run from the backend folder:
+
+    python benchmarks/bench_preprocessing.py --iterations 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing import preprocess_image, get_thread_buffer  # noqa: E402
+
+
+def make_photo(width, height, fmt="JPEG", mode="RGB"):
+    yy, xx = np.mgrid[0:height, 0:width]
+    r = (xx * 255 // max(width - 1, 1)).astype(np.uint8)
+    g = (yy * 255 // max(height - 1, 1)).astype(np.uint8)
+    b = ((xx + yy) % 256).astype(np.uint8)
+    img = Image.fromarray(np.dstack([r, g, b]), "RGB").convert(mode)
+    buf = BytesIO()
+    img.save(buf, format=fmt, quality=90)
+    return buf.getvalue()
+
+
+def legacy_path(data, filename):
+    # The previous /predict path: save upload to the temp dir, reopen, resize
+    # at full decode resolution and build the array in several steps.
+    temp_path = os.path.join(tempfile.gettempdir(), filename)
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    img = Image.open(temp_path)
+    img = img.resize((224, 224))
+    img_array = np.array(img)
+    img_array = np.expand_dims(img_array, axis=0)
+    img_array = img_array.astype('float32') / 255.0
+    os.remove(temp_path)
+    return img_array
+
+
+def in_memory_path(data, filename):
+    return preprocess_image(BytesIO(data), (224, 224), out=get_thread_buffer((224, 224)))
+
+
+def measure(fn, data, filename, iterations):
+    fn(data, filename)  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(data, filename)
+    return (time.perf_counter() - start) * 1000.0 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    cases = [
+        ("jpeg rgb", make_photo(args.width, args.height), "bench.jpg"),
+        ("png rgb", make_photo(args.width // 4, args.height // 4, "PNG"), "bench.png"),
+        ("png rgba", make_photo(args.width // 4, args.height // 4, "PNG", "RGBA"), "bench_rgba.png"),
+    ]
+    for label, data, filename in cases:
+        old_ms = measure(legacy_path, data, filename, args.iterations)
+        new_ms = measure(in_memory_path, data, filename, args.iterations)
+        # RGBA/grayscale uploads come out with the wrong channel count on the old path
+        old_shape = legacy_path(data, filename).shape
+        new_shape = in_memory_path(data, filename).shape
+        print(f"{label:<10} before={old_ms:8.2f} ms {str(old_shape):<18} "
+              f"after={new_ms:8.2f} ms {new_shape}")
+
+
+if __name__ == "__main__":
+    main()
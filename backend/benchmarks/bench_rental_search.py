@@ -0,0 +1,122 @@
+"""Rental search: LIKE + Python distance scan vs. FTS5 + R-tree on synthetic listings.
+
+Seeds synthetic rentals scattered around Maharashtra towns into a temporary
+SQLite file, builds the search index, and compares p50/p99 latency of
+typical searches ("tractor near Nashik under 2000") with a naive full scan.
+Also checks that new listings are searchable immediately (index triggers).
+Run from the backend folder:
+
+    python benchmarks/bench_rental_search.py --rentals 300000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate  # noqa: E402
+from models import Rental, db  # noqa: E402
+from places import haversine_km  # noqa: E402
+from rental_search import search_rentals  # noqa: E402
+
+EQUIPMENT = ["Tractor", "Harvester", "Rotavator", "Sprayer", "Seed Drill", "Thresher", "Plough", "Water Pump"]
+TOWNS = {
+    "Nashik": (20.00, 73.79), "Pune": (18.52, 73.86), "Nagpur": (21.15, 79.09), "Aurangabad": (19.88, 75.34),
+    "Solapur": (17.66, 75.91), "Kolhapur": (16.70, 74.24), "Satara": (17.68, 74.02), "Jalgaon": (21.01, 75.56),
+    "Amravati": (20.93, 77.75), "Latur": (18.40, 76.56)
+}
+ADJECTIVES = ["well maintained", "new", "powerful", "fuel efficient", "second hand", "heavy duty"]
+
+
+def seed(n, rng):
+    rows = []
+    towns = list(TOWNS.items())
+    for _ in range(n):
+        equipment = rng.choice(EQUIPMENT)
+        town, (lat, lon) = rng.choice(towns)
+        rows.append({
+            "title": f"{rng.choice(ADJECTIVES).title()} {equipment} in {town}",
+            "description": f"{rng.choice(ADJECTIVES).capitalize()} {equipment.lower()} with operator, diesel included. "
+                           f"Available for {rng.choice(['sowing', 'harvest', 'tilling', 'spraying'])} season.",
+            "price": float(rng.randrange(300, 5000, 50)),
+            "contact": "9800000000",
+            "equipment_type": equipment,
+            "rental_duration": "per day",
+            "location": f"{town}, Maharashtra",
+            "posted_by": "farmer",
+            "lat": lat + rng.gauss(0, 0.3),
+            "lon": lon + rng.gauss(0, 0.3)
+        })
+    for i in range(0, n, 5000):
+        db.session.execute(Rental.__table__.insert(), rows[i:i + 5000])
+    db.session.commit()
+
+
+def naive_search(q, lat, lon, radius_km, max_price):
+    # What a search would cost without indexes: LIKE over every row, then
+    # distances for all of them in Python
+    query = Rental.query
+    for term in q.split():
+        query = query.filter(db.or_(Rental.title.ilike(f"%{term}%"), Rental.description.ilike(f"%{term}%")))
+    if max_price is not None:
+        query = query.filter(Rental.price <= max_price)
+    rows = query.all()
+    distances = haversine_km(lat, lon, np.array([r.lat for r in rows]), np.array([r.lon for r in rows]))
+    keep = np.flatnonzero(distances <= radius_km)
+    return [rows[i] for i in keep[np.argsort(distances[keep])][:20]]
+
+
+def measure(label, fn, runs):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        db.session.remove()
+    count = len(result[0]) if isinstance(result, tuple) else len(result)
+    print(f"{label:<40} p50={np.percentile(latencies, 50):8.2f} ms  p99={np.percentile(latencies, 99):8.2f} ms  results={count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rentals", type=int, default=300000)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tmp, 'rentals.db')}"
+        db.init_app(app)
+        with app.app_context():
+            migrate(target=4)  # tables only; the search index is timed below
+            start = time.perf_counter()
+            seed(args.rentals, random.Random(23))
+            seeded = time.perf_counter()
+            migrate()
+            print(f"seeded {args.rentals} rentals in {seeded - start:.1f} s, indexed in {time.perf_counter() - seeded:.1f} s")
+
+            nashik = TOWNS["Nashik"]
+            measure("naive: tractor near Nashik <= 2000", lambda: naive_search("tractor", *nashik, 25, 2000), max(3, args.runs // 5))
+            measure("tractor near Nashik <= 2000", lambda: search_rentals("tractor", *nashik, radius_km=25, max_price=2000), args.runs)
+            measure("tractor near Nashik, by distance", lambda: search_rentals("tractor", *nashik, radius_km=25, sort="distance"), args.runs)
+            measure("within 10 km of Pune", lambda: search_rentals(None, *TOWNS["Pune"], radius_km=10), args.runs)
+            measure("'heavy duty harvester', anywhere", lambda: search_rentals("heavy duty harvester"), args.runs)
+            measure("'sprayer' page 5, anywhere", lambda: search_rentals("sprayer", page=5), args.runs)
+
+            rental = Rental(title="Mini Power Weeder", description="Compact weeder", price=700.0, contact="1",
+                            equipment_type="Weeder", rental_duration="per day", location="Nashik", posted_by="x",
+                            lat=nashik[0], lon=nashik[1])
+            db.session.add(rental)
+            db.session.commit()
+            found, _ = search_rentals("weeder", *nashik, radius_km=5)
+            print(f"new listing searchable: {[r['id'] for r in found] == [rental.id]}")
+
+
+if __name__ == "__main__":
+    main()
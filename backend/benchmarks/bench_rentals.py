@@ -0,0 +1,111 @@
+"""GET /rentals: full-table dump vs. filtered keyset pages on a seeded SQLite database.
+
+Seeds synthetic rentals into a temporary SQLite file through the app's
+models, then compares p50/p99 latency and JSON payload size of the old
+Rental.query.all() dump with typical first and deep keyset pages. Also
+checks that walking every page with the cursor returns each matching row
+exactly once. Run from the backend folder:
+
+    python benchmarks/bench_rentals.py --rentals 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate  # noqa: E402
+from models import Rental, db  # noqa: E402
+from rentals import list_rentals, rental_to_dict  # noqa: E402
+
+EQUIPMENT = ["Tractor", "Harvester", "Rotavator", "Sprayer", "Seed Drill", "Thresher", "Plough", "Water Pump"]
+PLACES = ["Nashik", "Pune", "Nagpur", "Aurangabad", "Solapur", "Kolhapur", "Satara", "Jalgaon", "Amravati", "Latur"]
+
+
+def seed(n, rng):
+    rows = []
+    for i in range(n):
+        equipment = rng.choice(EQUIPMENT)
+        place = rng.choice(PLACES)
+        rows.append({
+            "title": f"{equipment} for rent in {place}",
+            "description": f"Well maintained {equipment.lower()} available with operator. " * rng.randint(2, 8),
+            "price": float(rng.randrange(300, 5000, 50)),
+            "contact": f"98{rng.randrange(10 ** 7, 10 ** 8)}",
+            "equipment_type": equipment,
+            "rental_duration": rng.choice(["per day", "per hour", "per acre"]),
+            "location": f"{place}, Maharashtra",
+            "posted_by": f"farmer{rng.randrange(5000)}"
+        })
+    for i in range(0, n, 5000):
+        db.session.execute(Rental.__table__.insert(), rows[i:i + 5000])
+    db.session.commit()
+
+
+def measure(label, fn, runs):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        payload = json.dumps(fn())
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        db.session.remove()
+    print(f"{label:<34} p50={np.percentile(latencies, 50):8.2f} ms  p99={np.percentile(latencies, 99):8.2f} ms  "
+          f"payload={len(payload) / 1024:9.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rentals", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tmp, 'rentals.db')}"
+        db.init_app(app)
+        with app.app_context():
+            migrate()
+            start = time.perf_counter()
+            seed(args.rentals, random.Random(17))
+            print(f"seeded {args.rentals} rentals in {time.perf_counter() - start:.1f} s")
+
+            measure("full dump (before)", lambda: {"rentals": [rental_to_dict(r) for r in Rental.query.all()]}, max(3, args.runs // 10))
+
+            def page(**kwargs):
+                rentals, cursor = list_rentals(**kwargs)
+                return {"rentals": rentals, "next_cursor": cursor}
+
+            measure("newest, first page", lambda: page(), args.runs)
+            measure("tractor by price, first page", lambda: page(equipment_type="tractor", sort="price_asc"), args.runs)
+            measure("Nashik 1000-2000, price desc", lambda: page(location="nashik", min_price=1000, max_price=2000, sort="price_desc"), args.runs)
+            card = ("id", "title", "price", "location")
+            measure("newest, card fields only", lambda: page(fields=card), args.runs)
+
+            # Deep page: the cursor after ~90% of tractor rows
+            _, deep = list_rentals(equipment_type="tractor", sort="price_asc", limit=int(args.rentals / len(EQUIPMENT) * 0.9))
+            measure("tractor by price, deep page", lambda: page(equipment_type="tractor", sort="price_asc", cursor=deep), args.runs)
+
+            seen, cursor = [], None
+            while True:
+                rentals, cursor = list_rentals(equipment_type="sprayer", sort="price_desc", cursor=cursor, limit=100, fields=("id",))
+                seen += [r["id"] for r in rentals]
+                if cursor is None:
+                    break
+            expected = Rental.query.filter(Rental.equipment_type == "Sprayer").count()
+            print(f"cursor walk: {len(seen)} rows, {len(set(seen))} unique, expected {expected}")
+
+            plan = db.session.execute(db.text(
+                "EXPLAIN QUERY PLAN SELECT id FROM rental WHERE lower(equipment_type) = 'tractor' ORDER BY price, id LIMIT 21"
+            )).fetchall()
+            print("plan:", "; ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Latency of /govt_schemes full-text search over a synthetic scheme store.
+
+Seeds N schemes into a temporary SQLite store and times BM25 searches
+(full words, as-you-type prefixes, keyset-paginated follow-up pages) against
+the plain paginated listing. Run from the backend folder:
+
+    python benchmarks/bench_scheme_search.py --schemes 5000 --iterations 200
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schemes import SchemeStore  # noqa: E402
+
+WORDS = ("kisan credit card soil health irrigation subsidy crop insurance pradhan mantri yojana "
+         "organic farming horticulture dairy fisheries seed fertilizer tractor loan interest "
+         "drip micro rainfed watershed livestock poultry women self help group market price").split()
+MINISTRIES = ["Ministry of Agriculture and Farmers Welfare", "Ministry of Rural Development",
+              "Ministry of Fisheries, Animal Husbandry and Dairying", "Ministry of Jal Shakti",
+              "Department of Food and Public Distribution"]
+
+
+def synthetic_schemes(n, rng):
+    schemes = []
+    for i in range(n):
+        schemes.append({
+            "title": " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(3, 6))) + f" {i}",
+            "link": f"https://www.myscheme.gov.in/schemes/s{i}",
+            "ministry": rng.choice(MINISTRIES),
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 40)))
+        })
+    return schemes
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    store = SchemeStore(os.path.join(tempfile.mkdtemp(), "schemes.sqlite3"))
+    start = time.perf_counter()
+    store.replace_all(synthetic_schemes(args.schemes, rng))
+    print(f"indexed {store.count()} schemes in {(time.perf_counter() - start) * 1000.0:.0f} ms")
+
+    _, cursor = store.search("crop insurance", per_page=10)
+    cases = [
+        ("listing page 1", lambda: store.page(1, 10)),
+        ("listing page 200 (offset)", lambda: store.page(200, 10)),
+        ("search 'crop insurance'", lambda: store.search("crop insurance", per_page=10)),
+        ("search prefix 'kis'", lambda: store.search("kis", per_page=10)),
+        ("search prefix 'soil hea'", lambda: store.search("soil hea", per_page=10)),
+        ("search next page (cursor)", lambda: store.search("crop insurance", per_page=10, cursor=cursor)),
+    ]
+    for label, fn in cases:
+        p50, p99 = timed(fn, args.iterations)
+        print(f"{label:<28} p50={p50:7.3f} ms  p99={p99:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
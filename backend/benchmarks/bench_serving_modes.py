@@ -0,0 +1,221 @@
+"""Serving modes: memory per worker and throughput per core with N forked web workers.
+
+Each scenario runs in a fresh "master" process that forks --workers
+workers the way gunicorn does, then hammers every worker with single-image
+predictions for --seconds and reads RSS and PSS (proportional set size,
+which splits shared pages between the processes mapping them) from
+/proc/<pid>/smaps_rollup. The model is a synthetic two-layer NumPy network
+whose first layer (--weights-mib) dominates memory, standing in for the
+disease model's weights:
+
+  private (before)   every worker loads its own copy of the weights
+  prefork CoW        the master loads them once; workers share the pages
+  prefork mmap       weights memory-mapped from the file, as TFLite does
+  inference server   one inference_server.py process owns the model;
+                     workers send images through shared memory
+
+Each mode runs with the per-worker BLAS thread budget gunicorn.conf.py
+uses (cores // workers) and with one thread per core in every worker
+(oversubscribed). Linux only. Run from the backend folder:
+
+    python benchmarks/bench_serving_modes.py --workers 4 --seconds 5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+NUM_CLASSES = 38
+INPUT_SHAPE = (224, 224, 3)
+MODES = [
+    ("private", "private (before)"),
+    ("cow", "prefork CoW"),
+    ("mmap", "prefork mmap"),
+    ("server", "inference server"),
+]
+
+
+class SyntheticModel:
+    # Downsample 224x224 -> 112x112, dense hidden layer, softmax
+    name = "synthetic"
+
+    def __init__(self, w1, w2):
+        self.w1 = w1
+        self.w2 = w2
+
+    def predict(self, batch):
+        import numpy as np
+        x = np.asarray(batch, dtype=np.float32)[:, ::2, ::2, :].reshape(len(batch), -1)
+        h = np.maximum(x @ self.w1, 0.0)
+        logits = h @ self.w2
+        logits -= logits.max(axis=1, keepdims=True)
+        e = np.exp(logits)
+        return e / e.sum(axis=1, keepdims=True)
+
+
+def write_weights(path, weights_mib):
+    import numpy as np
+    inputs = (INPUT_SHAPE[0] // 2) * (INPUT_SHAPE[1] // 2) * INPUT_SHAPE[2]
+    hidden = max(1, int(weights_mib * 2**20 / (inputs * 4)))
+    rng = np.random.default_rng(0)
+    np.save(path, (rng.standard_normal((inputs, hidden), dtype=np.float32) * 0.01))
+    np.save(path + ".w2.npy", rng.standard_normal((hidden, NUM_CLASSES), dtype=np.float32))
+
+
+def load_model(path, mmap=False):
+    import numpy as np
+    w1 = np.load(path, mmap_mode="r" if mmap else None)
+    return SyntheticModel(w1, np.load(path + ".w2.npy"))
+
+
+def cpu_seconds(pid):
+    # User + system CPU time of a live process
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rpartition(")")[2].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def memory(pid):
+    # RSS and PSS in MiB
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0]) / 1024.0
+    return values["Rss"], values["Pss"]
+
+
+# -----------------------------
+# Worker / master processes
+# -----------------------------
+def worker(mode, path, shared_model, socket_path, conn, start, duration):
+    import numpy as np
+    if mode == "private":
+        model = load_model(path)
+    elif mode == "server":
+        from inference_server import RemoteModel
+        model = RemoteModel(socket_path, max_batch_size=1)
+    else:
+        model = shared_model
+    image = np.random.default_rng(os.getpid()).random((1,) + INPUT_SHAPE, dtype=np.float32)
+    model.predict(image)
+    conn.send("ready")
+    start.wait()
+    count = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        model.predict(image)
+        count += 1
+    conn.send(count)
+    conn.recv()
+
+
+def serve(path, socket_path, ready):
+    from inference_server import InferenceServer
+    server = InferenceServer(socket_path, load_model(path), max_batch_size=16, max_wait_ms=2)
+    ready.set()
+    server.serve_forever()
+
+
+def master(mode, path, workers, duration):
+    import numpy as np
+    ctx = multiprocessing.get_context("fork")
+    shared_model = None
+    if mode == "cow":
+        shared_model = load_model(path)
+    elif mode == "mmap":
+        shared_model = load_model(path, mmap=True)
+        # Fault the pages in once, like a warm page cache after deploy
+        shared_model.predict(np.zeros((1,) + INPUT_SHAPE, dtype=np.float32))
+
+    server = None
+    socket_path = os.path.join(os.path.dirname(path), "inference.sock")
+    if mode == "server":
+        ready = ctx.Event()
+        server = ctx.Process(target=serve, args=(path, socket_path, ready), daemon=True)
+        server.start()
+        ready.wait(60)
+
+    start = ctx.Event()
+    procs = []
+    for _ in range(workers):
+        parent_conn, child_conn = ctx.Pipe()
+        proc = ctx.Process(target=worker, args=(mode, path, shared_model, socket_path, child_conn, start, duration))
+        proc.start()
+        procs.append((proc, parent_conn))
+    for _, conn in procs:
+        conn.recv()
+    pids = [proc.pid for proc, _ in procs] + ([server.pid] if server else [])
+    cpu_start = sum(cpu_seconds(pid) for pid in pids)
+    start.set()
+    counts = [conn.recv() for _, conn in procs]
+    cpu_s = sum(cpu_seconds(pid) for pid in pids) - cpu_start
+    # Measured after the run, once every worker has touched the weights
+    worker_memory = [memory(proc.pid) for proc, _ in procs]
+    extra_pss = memory(os.getpid())[1] + (memory(server.pid)[1] if server else 0.0)
+    for proc, conn in procs:
+        conn.send("exit")
+        proc.join()
+    if server:
+        server.terminate()
+        server.join()
+    print(json.dumps({
+        "images_per_s": sum(counts) / duration,
+        "cpu_s": cpu_s,
+        "rss_mib": sum(r for r, _ in worker_memory) / workers,
+        "pss_mib": sum(p for _, p in worker_memory) / workers,
+        "total_pss_mib": sum(p for _, p in worker_memory) + extra_pss
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--weights-mib", type=float, default=128.0)
+    parser.add_argument("--master", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.master:
+        master(*args.master, workers=args.workers, duration=args.seconds)
+        return
+
+    cores = os.cpu_count() or 1
+    budget = max(1, cores // args.workers)
+    print(f"{args.workers} workers, {cores} cores, {args.weights_mib:.0f} MiB of weights")
+    print(f"{'mode':<18} {'BLAS threads':>12} {'RSS/worker':>10} {'PSS/worker':>10} {'total PSS':>10} {'img/s':>8} {'img/s/core':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weights.npy")
+        write_weights(path, args.weights_mib)
+        for mode, label in MODES:
+            thread_settings = [budget] if cores == budget else [budget, cores]
+            for threads in thread_settings:
+                env = dict(os.environ, OPENBLAS_NUM_THREADS=str(threads), OMP_NUM_THREADS=str(threads), MKL_NUM_THREADS=str(threads))
+                if mode == "server":
+                    # One process computes, so it may use every core
+                    if threads != budget:
+                        continue
+                    threads = cores
+                    env.update(OPENBLAS_NUM_THREADS=str(cores), OMP_NUM_THREADS=str(cores), MKL_NUM_THREADS=str(cores))
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--master", mode, path, "--workers", str(args.workers), "--seconds", str(args.seconds)],
+                    env=env, check=True, capture_output=True, text=True
+                ).stdout
+                result = json.loads(out.strip().splitlines()[-1])
+                # Throughput per core actually kept busy (CPU seconds / wall seconds)
+                busy_cores = max(result["cpu_s"] / args.seconds, 1e-9)
+                print(f"{label:<18} {threads:>12} {result['rss_mib']:10.0f} {result['pss_mib']:10.0f} {result['total_pss_mib']:10.0f} "
+                      f"{result['images_per_s']:8.1f} {result['images_per_s'] / busy_cores:10.1f}")
+    print("total PSS includes the master and, for the inference server, the server process.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Load test /store_finder: a GoMaps text search per request vs. the spatial store index.
+
+Starts a local stub GoMaps server. Simulated farmers are scattered around a
+few villages and search for a handful of store types concurrently. Reports
+req/s, p50/p99 latency, upstream calls and how many of the direct search's
+stores the indexed answer also returns. Run from the backend folder:
+
+    python benchmarks/bench_store_finder.py --clients 32 --requests 2000 --villages 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import HttpClient  # noqa: E402
+from places import GoMapsClient, StoreIndex  # noqa: E402
+from stubs import StubGoMapsServer  # noqa: E402
+
+STORE_TYPES = ["fertilizer store", "seed store", "agricultural equipment store", None]
+
+
+def farmer_queries(n, villages, rng):
+    centres = [(rng.uniform(18.0, 24.0), rng.uniform(72.0, 80.0)) for _ in range(villages)]
+    queries = []
+    for _ in range(n):
+        lat, lon = rng.choice(centres)
+        # Within ~2 km of the village centre
+        queries.append((lat + rng.uniform(-0.015, 0.015), lon + rng.uniform(-0.015, 0.015), rng.choice(STORE_TYPES)))
+    return queries
+
+
+def run(label, find, queries, clients, stub):
+    stub.calls = 0
+    latencies = []
+    answers = [None] * len(queries)
+
+    def one(i):
+        start = time.perf_counter()
+        answers[i] = find(*queries[i])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(len(queries))))
+    total = time.perf_counter() - start
+    print(f"{label:<12} req/s={len(queries) / total:8.1f}  p50={np.percentile(latencies, 50):7.2f} ms  "
+          f"p99={np.percentile(latencies, 99):7.2f} ms  upstream calls={stub.calls}")
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--villages", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    queries = farmer_queries(args.requests, args.villages, random.Random(5))
+    with StubGoMapsServer(latency=args.latency_ms / 1000.0) as stub:
+        places = GoMapsClient(HttpClient(), "x", base_url=stub.base_url)
+        direct = run("direct", places.text_search, queries, args.clients, stub)
+
+        index = StoreIndex(places.text_search)
+        indexed = run("store index", lambda lat, lon, t: index.find(lat, lon, t)[0], queries, args.clients, stub)
+        print(f"index={index.stats()}")
+
+        overlap = [
+            len({s["place_id"] for s in a[:10]} & {s["place_id"] for s in b[:10]}) / max(1, min(10, len(a)))
+            for a, b in zip(direct, indexed)
+        ]
+        print(f"top-10 overlap with direct search: mean={np.mean(overlap):.2f}  min={np.min(overlap):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Test-time augmentation: latency per TTA factor, batched views vs. one call per view.
+
+For each factor (1, 2, 4, 8 views) this times, per photo: building the
+views with preprocessing.preprocess_tta, then running them either as one
+batch through BatchInferenceEngine (what /predict?tta=N does) or as N
+separate single-image calls. Without --model the network is a synthetic
+stand-in with a fixed per-call overhead plus a per-image cost (see
+bench_batching.py); with --model the real backend is loaded via
+inference.load_backend. Run from the backend folder:
+
+    python benchmarks/bench_tta.py --runs 30
+    python benchmarks/bench_tta.py --model plant_disease_prediction_model.tflite
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_preprocessing import make_photo  # noqa: E402
+from inference import BatchInferenceEngine, load_backend  # noqa: E402
+from preprocessing import TTA_VIEWS, preprocess_tta  # noqa: E402
+
+FACTORS = [f for f in (1, 2, 4, 8) if f <= len(TTA_VIEWS)]
+
+
+class SyntheticModel:
+    name = "synthetic"
+
+    def __init__(self, num_classes=38, call_overhead_ms=15.0, per_image_ms=3.0):
+        self.num_classes = num_classes
+        self.call_overhead = call_overhead_ms / 1000.0
+        self.per_image = per_image_ms / 1000.0
+
+    def predict(self, batch):
+        time.sleep(self.call_overhead + self.per_image * len(batch))
+        logits = np.random.rand(len(batch), self.num_classes).astype("float32")
+        return logits / logits.sum(axis=1, keepdims=True)
+
+
+def p50(values):
+    return float(np.percentile(values, 50)) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="real model (.h5 or .tflite) instead of the synthetic stand-in")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--call-overhead-ms", type=float, default=15.0)
+    parser.add_argument("--per-image-ms", type=float, default=3.0)
+    parser.add_argument("--photo", default="4000x3000", help="synthetic JPEG size, WxH")
+    args = parser.parse_args()
+
+    if args.model:
+        model = load_backend(args.model)
+    else:
+        model = SyntheticModel(call_overhead_ms=args.call_overhead_ms, per_image_ms=args.per_image_ms)
+    engine = BatchInferenceEngine(model.predict, max_batch_size=16, max_wait_ms=0)
+    width, height = (int(v) for v in args.photo.split("x"))
+    photo = make_photo(width, height)
+    buffer = np.empty((max(FACTORS), 224, 224, 3), dtype=np.float32)
+    engine.submit(preprocess_tta(photo, 1, out=buffer[:1]))
+
+    print(f"model: {model.name}, photo {args.photo}, {args.runs} runs per factor")
+    print(f"{'views':>5} {'preprocess ms':>13} {'batched ms':>10} {'per-view ms':>11} {'total ms':>9} {'vs 1x':>6}")
+    baseline = None
+    for factor in FACTORS:
+        prep, batched, looped = [], [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            views = preprocess_tta(photo, factor, out=buffer[:factor])
+            prep.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            batched_probs = engine.submit(views).mean(axis=0)
+            batched.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            looped_probs = np.mean([engine.submit(views[i:i + 1])[0] for i in range(factor)], axis=0)
+            looped.append(time.perf_counter() - start)
+            assert batched_probs.shape == looped_probs.shape
+        total = p50(prep) + p50(batched)
+        if baseline is None:
+            baseline = total
+        print(f"{factor:5d} {p50(prep):13.1f} {p50(batched):10.1f} {p50(looped):11.1f} {total:9.1f} {total / baseline:5.2f}x")
+    engine.stop()
+    print("total = preprocess + batched forward; per-view runs one forward call per view.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Load test /weather forecasts: direct upstream per request vs. geo-tile cache.
+
+Starts a local stub OpenWeather server. Simulated farmers are scattered
+around a few district centres and request forecasts concurrently. Reports
+req/s, p50/p99 latency and upstream calls, and checks stale serving when the
+upstream goes down. Run from the backend folder:
+
+    python benchmarks/bench_weather.py --clients 32 --requests 2000 --districts 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import HttpClient  # noqa: E402
+from stubs import StubOpenWeatherServer  # noqa: E402
+from weather import ForecastCache, OpenWeatherClient  # noqa: E402
+
+
+def farmer_locations(n, districts, rng):
+    centres = [(rng.uniform(18.0, 24.0), rng.uniform(72.0, 80.0)) for _ in range(districts)]
+    points = []
+    for _ in range(n):
+        lat, lon = rng.choice(centres)
+        # Within ~1.5 km of the district centre
+        points.append((lat + rng.uniform(-0.007, 0.007), lon + rng.uniform(-0.007, 0.007)))
+    return points
+
+
+def run(label, fetch, points, clients, stub):
+    stub.calls = 0
+    latencies = []
+
+    def one(point):
+        start = time.perf_counter()
+        fetch(*point)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, points))
+    total = time.perf_counter() - start
+    print(f"{label:<16} req/s={len(points) / total:8.1f}  p50={np.percentile(latencies, 50):7.2f} ms  "
+          f"p99={np.percentile(latencies, 99):7.2f} ms  upstream calls={stub.calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--districts", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    points = farmer_locations(args.requests, args.districts, random.Random(3))
+    with StubOpenWeatherServer(latency=args.latency_ms / 1000.0) as stub:
+        def direct(lat, lon):
+            # Previous endpoint: plain requests.get, new connection every time
+            r = requests.get(f"{stub.base_url}/forecast", params={"lat": lat, "lon": lon, "appid": "x", "units": "metric"})
+            r.raise_for_status()
+            return r.json()
+
+        run("direct", direct, points, args.clients, stub)
+
+        client = OpenWeatherClient(HttpClient(), "x", base_url=stub.base_url)
+        cache = ForecastCache(client.fetch_forecast)
+        run("tile cache", cache.get, points, args.clients, stub)
+        print(f"distinct tiles={len({cache.tile_for(*p) for p in points})}  cache={cache.stats()}")
+
+        # Upstream outage: expire every entry and serve stale data
+        stub.fail = True
+        for _, entry in cache.entries.items():
+            entry["expires_at"] = 0
+        _, meta = cache.get(*points[0])
+        print(f"upstream down -> stale={meta['stale']} tile={meta['tile']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import importlib
+
+
+# -----------------------------
+# API Blueprints
+# -----------------------------
+# Each feature area is a blueprint in its own module and imports its heavy
+# dependencies on first use. Only enabled areas are imported at all, so a
+# worker serving just the marketplace never loads the disease model stack.
+BLUEPRINT_NAMES = ("disease", "chat", "schemes", "geo", "marketplace")
+
+
+def load_blueprints(names=BLUEPRINT_NAMES):
+    # {name: module}; each module exposes `bp` and optionally stats()
+    unknown = [name for name in names if name not in BLUEPRINT_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown blueprints {unknown}; expected some of: {', '.join(BLUEPRINT_NAMES)}.")
+    return {name: importlib.import_module(f"blueprints.{name}") for name in names}
@@ -0,0 +1,209 @@
+import os
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context, url_for
+
+from audio import TARGET_SAMPLE_RATE, AudioTooLargeError, decode_to_pcm, read_upload
+from blueprints.common import bundle_dir, gemini_model
+from streaming import stream_chat_events
+from stubs import FakeTTSBackend
+from tts import GTTSBackend, TTSService
+
+bp = Blueprint("chat", __name__)
+
+# -----------------------------
+# Set ffmpeg path (if needed)
+# -----------------------------
+# ffmpeg decodes voice notes that are not WAV (e.g. m4a from the app)
+if os.name == 'nt':
+    # Replace with the actual path if necessary
+    FFMPEG_PATH = os.environ.get("FFMPEG_PATH", r"C:\ffmpeg-2025-02-06-git-6da82b4485-essentials_build\ffmpeg.exe")
+else:
+    FFMPEG_PATH = os.environ.get("FFMPEG_PATH", "ffmpeg")
+
+MAX_AUDIO_UPLOAD_BYTES = int(os.environ.get("MAX_AUDIO_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+# read_aloud speech is synthesized per sentence on a bounded pool, with
+# chunks cached by (text, lang). Finished clips are files in TTS_CLIP_DIR,
+# so /audio/<id> works whichever worker process receives it.
+TTS_CLIP_DIR = os.environ.get("TTS_CLIP_DIR", os.path.join(bundle_dir, "cache", "tts_clips"))
+tts_backend = FakeTTSBackend() if os.environ.get("KRISHISAHAY_FAKE_TTS") == "1" else GTTSBackend()
+tts_service = TTSService(
+    tts_backend,
+    max_workers=int(os.environ.get("TTS_WORKERS", "4")),
+    clip_dir=TTS_CLIP_DIR or None,
+    clip_ttl_s=float(os.environ.get("TTS_CLIP_TTL_S", str(24 * 3600)))
+)
+
+def transcribe_audio(pcm, sample_rate=TARGET_SAMPLE_RATE):
+    # `pcm` is mono int16 audio, already trimmed of leading/trailing silence
+    import speech_recognition as sr
+
+    if len(pcm) == 0:
+        raise ValueError("Audio is not clear or unrecognizable.")
+    recognizer = sr.Recognizer()
+    audio_data = sr.AudioData(pcm.tobytes(), sample_rate, 2)
+    try:
+        text = recognizer.recognize_google(audio_data)
+        return text
+    except sr.UnknownValueError:
+        raise ValueError("Audio is not clear or unrecognizable.")
+    except sr.RequestError as e:
+        raise RuntimeError(f"Speech Recognition service error: {e}")
+
+def stats():
+    return {"tts": tts_service.stats()}
+
+# -----------------------------
+# Chat Endpoints
+# -----------------------------
+def parse_chat_request():
+    # Returns (prompt, language, read_aloud, error_response) for JSON or
+    # voice (multipart "audio") chat requests.
+    if 'audio' in request.files:
+        file = request.files["audio"]
+        if file.filename == "":
+            return None, None, None, (jsonify({"error": "No audio file provided."}), 400)
+        # Decoded in memory to 16 kHz mono PCM; nothing is written to disk
+        try:
+            audio_bytes = read_upload(file.stream, MAX_AUDIO_UPLOAD_BYTES)
+        except AudioTooLargeError as e:
+            return None, None, None, (jsonify({"error": str(e)}), 413)
+        try:
+            pcm = decode_to_pcm(audio_bytes, ffmpeg=FFMPEG_PATH)
+        except Exception as e:
+            return None, None, None, (jsonify({"error": f"Audio conversion error: {e}"}), 500)
+        try:
+            prompt = transcribe_audio(pcm)
+        except Exception as e:
+            return None, None, None, (jsonify({"error": str(e)}), 500)
+        language = request.form.get("language", "en")
+        read_aloud = request.form.get("read_aloud", "false").lower() == "true"
+    else:
+        data = request.get_json()
+        if not data or "prompt" not in data:
+            return None, None, None, (jsonify({"error": "No prompt provided."}), 400)
+        prompt = data["prompt"]
+        language = data.get("language", "en")
+        read_aloud = data.get("read_aloud", False)
+    return prompt, language, read_aloud, None
+
+def build_chat_prompt(prompt):
+    system_message = (
+        "You are KrishiSahay, an AI assistant specialized in crop management, crop diseases, healthy plant practices, and crop-related advice. "
+        "You will only answer questions related to crops and agriculture."
+    )
+    return f"{system_message}\nUser: {prompt}"
+
+def synthesize_speech_url(text, language):
+    # Audio is served from /audio/<id> rather than inlined as base64; an
+    # empty reply has no audio (None)
+    clip_id = tts_service.synthesize(text, language)
+    if clip_id is None:
+        return None
+    return url_for('chat.audio_endpoint', clip_id=clip_id, _external=True)
+
+@bp.route('/chat', methods=['POST'])
+def chat_endpoint():
+    prompt, language, read_aloud, error = parse_chat_request()
+    if error:
+        return error
+    prompt_with_context = build_chat_prompt(prompt)
+    try:
+        response = gemini_model.generate_content(prompt_with_context)
+        text_response = response.text
+        if read_aloud:
+            audio_data_url = synthesize_speech_url(text_response, language)
+        else:
+            audio_data_url = ""
+        result = {
+            "response": text_response,
+            "audio_response": audio_data_url
+        }
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/chat/stream', methods=['POST'])
+def chat_stream_endpoint():
+    # Same request format as /chat, but the answer is sent as Server-Sent
+    # Events: "token" chunks as Gemini produces them, an "audio" event when
+    # read_aloud is set, then "done" (or "error").
+    prompt, language, read_aloud, error = parse_chat_request()
+    if error:
+        return error
+    synthesize = (lambda text: synthesize_speech_url(text, language)) if read_aloud else None
+    events = stream_chat_events(gemini_model, build_chat_prompt(prompt), synthesize)
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@bp.route('/audio/<clip_id>', methods=['GET'])
+def audio_endpoint(clip_id):
+    audio = tts_service.get_clip(clip_id)
+    if audio is None:
+        return jsonify({"error": "Audio not found or expired."}), 404
+    response = Response(audio, mimetype=tts_service.mimetype)
+    response.set_etag(clip_id)
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    # Handles Range/If-Range so players can seek and resume
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(audio))
+
+@bp.route('/')
+def home():
+    return '''
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>KrishiSahay Chat</title>
+        <style>
+            body { font-family: Arial, sans-serif; margin: 20px; }
+            .response { margin: 10px 0; padding: 10px; border: 1px solid #ccc; }
+            .speaker-button { cursor: pointer; margin-left: 10px; font-size: 18px; }
+            textarea { width: 80%; }
+        </style>
+    </head>
+    <body>
+        <h1>KrishiSahay Chat</h1>
+        <textarea id="prompt" rows="4" placeholder="Type your query about crops..."></textarea><br>
+        <button onclick="sendPrompt()">Send</button>
+        <div id="chat-responses"></div>
+        <script>
+            function sendPrompt() {
+                const prompt = document.getElementById('prompt').value;
+                fetch('/chat', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ prompt: prompt, read_aloud: true, language: 'en' })
+                })
+                .then(response => response.json())
+                .then(data => {
+                    const chatDiv = document.getElementById('chat-responses');
+                    let responseHtml = '<div class="response">';
+                    responseHtml += '<p>' + data.response + '</p>';
+                    responseHtml += '<button class="speaker-button" onclick="playAudio(\\'' + (data.audio_response || '') + '\\')">&#128266;</button>';
+                    responseHtml += '</div>';
+                    chatDiv.innerHTML = responseHtml + chatDiv.innerHTML;
+                })
+                .catch(error => console.error('Error:', error));
+            }
+            
+            function playAudio(audioDataUrl) {
+                if (audioDataUrl) {
+                    var audio = new Audio(audioDataUrl);
+                    audio.play();
+                } else {
+                    var responses = document.getElementsByClassName('response');
+                    if (responses.length > 0) {
+                        var text = responses[0].getElementsByTagName('p')[0].innerText;
+                        var msg = new SpeechSynthesisUtterance(text);
+                        window.speechSynthesis.speak(msg);
+                    }
+                }
+            }
+        </script>
+    </body>
+    </html>
+    '''
@@ -0,0 +1,468 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import numpy as np
+from flask import Blueprint, jsonify, request
+
+from blueprints.common import bundle_dir, generate_cached, llm_cache
+from cache import PredictionCache
+from inference import BatchInferenceEngine, load_backend
+from lazy import Lazy
+from preprocessing import TTA_VIEWS, get_thread_buffer, preprocess_image, preprocess_tta
+
+bp = Blueprint("disease", __name__, cli_group=None)
+
+# -----------------------------
+# Disease Model
+# -----------------------------
+# Path to the plant disease prediction model. DISEASE_MODEL_PATH may point
+# at a .tflite file made by export_model.py, which runs on the TFLite
+# interpreter.
+model_path = os.environ.get("DISEASE_MODEL_PATH", os.path.join(bundle_dir, 'plant_disease_prediction_model.h5'))
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND") or None
+# Threads per forward pass / between independent graph ops. With several
+# workers on one host, keep workers x intra-op threads <= cores.
+INFERENCE_INTRA_OP_THREADS = int(os.environ.get("INFERENCE_INTRA_OP_THREADS", os.environ.get("INFERENCE_NUM_THREADS", "0"))) or None
+INFERENCE_INTER_OP_THREADS = int(os.environ.get("INFERENCE_INTER_OP_THREADS", "0")) or None
+# When set, predictions go to the shared inference process listening on
+# this Unix socket (inference_server.py) instead of a model in this worker.
+INFERENCE_SOCKET = os.environ.get("INFERENCE_SOCKET") or None
+# "background": load on a background thread once the app serves its first
+# request; "lazy": load on the first prediction; "eager": load at import.
+MODEL_WARMUP = os.environ.get("MODEL_WARMUP", "background")
+
+# Concurrent /predict requests are merged into dynamic batches and run with
+# one forward pass per batch on a background worker thread.
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", "16"))
+INFERENCE_MAX_WAIT_MS = float(os.environ.get("INFERENCE_MAX_WAIT_MS", "5"))
+INFERENCE_TIMEOUT_S = float(os.environ.get("INFERENCE_TIMEOUT_S", "30"))
+
+def _load_disease_model():
+    if INFERENCE_SOCKET:
+        from inference_server import RemoteModel
+        model = RemoteModel(INFERENCE_SOCKET, max_batch_size=INFERENCE_MAX_BATCH_SIZE)
+        print(f"Plant disease predictions served by {INFERENCE_SOCKET}.")
+        return model
+    model = load_backend(model_path, INFERENCE_BACKEND, intra_op_threads=INFERENCE_INTRA_OP_THREADS,
+                         inter_op_threads=INFERENCE_INTER_OP_THREADS, max_batch_size=INFERENCE_MAX_BATCH_SIZE)
+    print(f"Plant disease model loaded successfully ({model.name}).")
+    return model
+
+# TensorFlow is only imported when the model is loaded
+disease_model = Lazy(_load_disease_model, name="disease_model")
+if MODEL_WARMUP == "eager":
+    try:
+        disease_model.get()
+    except Exception as e:
+        print(f"Error loading model: {e}")
+
+@bp.before_app_request
+def _warm_up_model():
+    # Runs after the server is accepting connections; returns immediately
+    if MODEL_WARMUP == "background":
+        disease_model.warm_up()
+
+def _run_disease_model(batch):
+    return disease_model.get().predict(batch)
+
+inference_engine = BatchInferenceEngine(
+    _run_disease_model,
+    max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=INFERENCE_MAX_WAIT_MS
+)
+
+# Repeated uploads of the same photo are answered from a content-addressed
+# cache. The model version is part of the key so a new model starts cold.
+def _model_version():
+    try:
+        stat = os.stat(model_path)
+        return f"{os.path.basename(model_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+    except OSError:
+        return "unknown"
+
+MODEL_VERSION = os.environ.get("MODEL_VERSION") or _model_version()
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", "4096"))
+# Set to an empty string to keep the cache in memory only
+PREDICTION_CACHE_DB = os.environ.get("PREDICTION_CACHE_DB", os.path.join(bundle_dir, "cache", "predictions.sqlite3"))
+
+prediction_cache = PredictionCache(
+    MODEL_VERSION,
+    max_entries=PREDICTION_CACHE_SIZE,
+    db_path=PREDICTION_CACHE_DB or None,
+    ttl=float(os.environ.get("PREDICTION_CACHE_TTL_S", str(30 * 24 * 3600))),
+    max_disk_entries=int(os.environ.get("PREDICTION_CACHE_DB_MAX_ENTRIES", "100000"))
+)
+
+# /diagnose runs its Gemini lookups concurrently on this pool and returns
+# whatever finished within the timeout.
+DIAGNOSE_TIMEOUT_S = float(os.environ.get("DIAGNOSE_TIMEOUT_S", "20"))
+# Below this top-class probability /diagnose skips the Gemini lookups and
+# asks for a better photo instead (0 disables; overridable per request
+# with min_confidence).
+DIAGNOSE_MIN_CONFIDENCE = float(os.environ.get("DIAGNOSE_MIN_CONFIDENCE", "0"))
+# Classes listed with a low-confidence answer when top_k is not given
+LOW_CONFIDENCE_TOP_K = 3
+diagnose_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("DIAGNOSE_WORKERS", "16")), thread_name_prefix="diagnose")
+
+# Updated human-friendly class names
+classes = [
+    "Apple - Apple Scab",
+    "Apple - Black Rot",
+    "Apple - Cedar Apple Rust",
+    "Apple - Healthy",
+    "Blueberry - Healthy",
+    "Cherry (including sour) - Powdery Mildew",
+    "Cherry (including sour) - Healthy",
+    "Corn (maize) - Cercospora Leaf Spot, Gray Leaf Spot",
+    "Corn (maize) - Common Rust",
+    "Corn (maize) - Northern Leaf Blight",
+    "Corn (maize) - Healthy",
+    "Grape - Black Rot",
+    "Grape - Esca (Black Measles)",
+    "Grape - Leaf Blight (Isariopsis Leaf Spot)",
+    "Grape - Healthy",
+    "Orange - Haunglongbing (Citrus Greening)",
+    "Peach - Bacterial Spot",
+    "Peach - Healthy",
+    "Bell Pepper - Bacterial Spot",
+    "Bell Pepper - Healthy",
+    "Potato - Early Blight",
+    "Potato - Late Blight",
+    "Potato - Healthy",
+    "Raspberry - Healthy",
+    "Soybean - Healthy",
+    "Squash - Powdery Mildew",
+    "Strawberry - Leaf Scorch",
+    "Strawberry - Healthy",
+    "Tomato - Bacterial Spot",
+    "Tomato - Early Blight",
+    "Tomato - Late Blight",
+    "Tomato - Leaf Mold",
+    "Tomato - Septoria Leaf Spot",
+    "Tomato - Spider Mites (Two-spotted Spider Mite)",
+    "Tomato - Target Spot",
+    "Tomato - Tomato Yellow Leaf Curl Virus",
+    "Tomato - Tomato Mosaic Virus",
+    "Tomato - Healthy"
+]
+
+# -----------------------------
+# Helper Functions
+# -----------------------------
+def load_and_preprocess_image(image_source, target_size=(224, 224)):
+    # Accepts a path, raw bytes or an upload stream; decodes in memory into
+    # this thread's reusable float32 buffer.
+    return preprocess_image(image_source, target_size, out=get_thread_buffer(target_size))
+
+def predict_probabilities(image_source, tta=1):
+    # Class probabilities for one photo. With tta > 1 the model sees that
+    # many flipped/cropped views in a single batch and the results are
+    # averaged.
+    if tta > 1:
+        batch = preprocess_tta(image_source, tta, out=get_thread_buffer((224, 224), batch=tta))
+    else:
+        batch = load_and_preprocess_image(image_source)
+    predictions = inference_engine.submit(batch, timeout=INFERENCE_TIMEOUT_S)
+    return np.asarray(predictions, dtype=np.float32).mean(axis=0)
+
+def predict_disease(image_source, tta=1):
+    probabilities = predict_probabilities(image_source, tta)
+    predicted_class_index = int(np.argmax(probabilities))
+    predicted_disease = classes[predicted_class_index]
+    return predicted_class_index, predicted_disease, probabilities
+
+def classify_image(image_bytes, tta=1):
+    # The cached record keeps every class probability, so top-k answers and
+    # confidence checks come from the cache too
+    cache_key = prediction_cache.key(image_bytes, variant=f"tta{tta}" if tta > 1 else None)
+    cached = prediction_cache.get(cache_key)
+    if cached is not None and "probabilities" in cached:
+        return cached
+    predicted_class_index, predicted_disease, probabilities = predict_disease(image_bytes, tta)
+    result = {
+        "predicted_class": predicted_class_index,
+        "predicted_disease": predicted_disease,
+        "probabilities": [round(float(p), 6) for p in probabilities]
+    }
+    prediction_cache.set(cache_key, result)
+    return result
+
+def top_predictions(probabilities, k):
+    ranked = sorted(range(len(probabilities)), key=lambda i: probabilities[i], reverse=True)[:k]
+    return [
+        {"class": i, "disease": classes[i], "probability": probabilities[i]}
+        for i in ranked
+    ]
+
+def prediction_response(record, top_k=0, tta=1):
+    # The original {"predicted_class", "predicted_disease"} answer, plus the
+    # confidence and top-k classes when asked for
+    result = {
+        "predicted_class": record["predicted_class"],
+        "predicted_disease": record["predicted_disease"]
+    }
+    if top_k:
+        result["confidence"] = record["probabilities"][record["predicted_class"]]
+        result["top_k"] = top_predictions(record["probabilities"], top_k)
+    if tta > 1:
+        result["tta"] = tta
+    return result
+
+def parse_prediction_options():
+    # Optional top_k, tta and min_confidence, as form fields or query
+    # parameters. Returns (options, error_response).
+    values = request.values
+    try:
+        top_k = int(values.get("top_k", 0))
+        tta = int(values.get("tta", 1))
+        min_confidence = float(values.get("min_confidence", DIAGNOSE_MIN_CONFIDENCE))
+    except ValueError:
+        return None, (jsonify({"error": "top_k and tta must be integers and min_confidence a number."}), 400)
+    if not 0 <= top_k <= len(classes):
+        return None, (jsonify({"error": f"top_k must be between 0 and {len(classes)}."}), 400)
+    if not 1 <= tta <= len(TTA_VIEWS):
+        return None, (jsonify({"error": f"tta must be between 1 and {len(TTA_VIEWS)}."}), 400)
+    if not 0.0 <= min_confidence <= 1.0:
+        return None, (jsonify({"error": "min_confidence must be between 0 and 1."}), 400)
+    return {"top_k": top_k, "tta": tta, "min_confidence": min_confidence}, None
+
+def get_disease_info(disease_name):
+    prompt = (
+        f"Explain the crop disease '{disease_name}' in simple, short, and clear language that a farmer can easily understand. "
+        "The answer must include exactly five sections with the following headings in the exact format provided:\n\n"
+        "1. **Introduction**: A brief overview of the disease.\n"
+        "2. **Causes**: What factors lead to this disease.\n"
+        "3. **Prevention Methods**: How to prevent or reduce the risk of the disease.\n"
+        "4. **Danger Level**: How severe or harmful the disease is.\n"
+        "5. **Recommended Remedies**: Short suggestions for treatments such as pesticides or fertilizers.\n\n"
+        "Ensure your answer starts with '1. **Introduction**:' and that no section is omitted. Keep your sentences short and avoid technical jargon."
+    )
+    return generate_cached(prompt)
+
+def get_healthy_advice():
+    prompt = (
+        "My crop is healthy. In simple and short language that a farmer can easily understand, give me a few easy tips to keep it healthy and prevent diseases."
+    )
+    return generate_cached(prompt)
+
+def get_recommended_store_type(disease_name):
+    prompt = (f"For the crop disease '{disease_name}', what is the best type of store a farmer should visit to buy treatments like pesticides or fertilizers? Provide only a short answer (for example, 'fertilizer store').")
+    return generate_cached(prompt).strip()
+
+def stats():
+    return {
+        "prediction_cache": prediction_cache.stats(),
+        "llm_cache": llm_cache.stats()
+    }
+
+# -----------------------------
+# Endpoints for Crop-related Functionality
+# -----------------------------
+@bp.route('/predict', methods=['POST'])
+def predict_endpoint():
+    if "image" not in request.files:
+        return jsonify({"error": "No image file provided."}), 400
+    file = request.files["image"]
+    if file.filename == "":
+        return jsonify({"error": "No image file provided."}), 400
+    options, error = parse_prediction_options()
+    if error:
+        return error
+    try:
+        record = classify_image(file.read(), tta=options["tta"])
+        return jsonify(prediction_response(record, options["top_k"], options["tta"]))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/diagnose', methods=['POST'])
+def diagnose_endpoint():
+    # Classification plus the follow-up lookups the app used to make one after
+    # another (/disease_info or /healthy_advice, then /recommended_store_type)
+    # in a single round-trip, with the lookups running concurrently.
+    if "image" not in request.files:
+        return jsonify({"error": "No image file provided."}), 400
+    file = request.files["image"]
+    if file.filename == "":
+        return jsonify({"error": "No image file provided."}), 400
+    options, error = parse_prediction_options()
+    if error:
+        return error
+    try:
+        record = classify_image(file.read(), tta=options["tta"])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    response_data = prediction_response(record, options["top_k"], options["tta"])
+    if options["min_confidence"] > 0:
+        confidence = record["probabilities"][record["predicted_class"]]
+        response_data["low_confidence"] = confidence < options["min_confidence"]
+        if response_data["low_confidence"]:
+            # Don't spend Gemini calls explaining what is likely the wrong
+            # disease; return the candidates and ask for a better photo
+            response_data.update(prediction_response(record, options["top_k"] or LOW_CONFIDENCE_TOP_K, options["tta"]))
+            response_data["message"] = ("The photo could not be classified confidently. Retake it in daylight, "
+                                        "close to a single affected leaf.")
+            response_data["partial"] = False
+            return jsonify(response_data)
+
+    predicted_disease = response_data["predicted_disease"]
+    if "healthy" in predicted_disease.lower():
+        lookups = {"advice": diagnose_executor.submit(get_healthy_advice)}
+    else:
+        lookups = {"disease_info": diagnose_executor.submit(get_disease_info, predicted_disease)}
+    lookups["store_type"] = diagnose_executor.submit(get_recommended_store_type, predicted_disease)
+
+    # One shared deadline, so total latency is bounded by the slowest lookup
+    deadline = time.monotonic() + DIAGNOSE_TIMEOUT_S
+    errors = {}
+    for name, future in lookups.items():
+        try:
+            response_data[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            errors[name] = "Timed out."
+        except Exception as e:
+            errors[name] = str(e)
+    response_data["partial"] = bool(errors)
+    if errors:
+        response_data["errors"] = errors
+    return jsonify(response_data)
+
+@bp.route('/disease_info', methods=['GET'])
+def disease_info_endpoint():
+    disease_name = request.args.get('disease_name')
+    if not disease_name:
+        return jsonify({"error": "No disease name provided."}), 400
+    try:
+        info = get_disease_info(disease_name)
+        return jsonify({"disease_info": info})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/healthy_advice', methods=['GET'])
+def healthy_advice_endpoint():
+    try:
+        advice = get_healthy_advice()
+        return jsonify({"advice": advice})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/recommended_store_type', methods=['GET'])
+def recommended_store_type_endpoint():
+    disease_name = request.args.get("disease_name")
+    if not disease_name:
+        return jsonify({"error": "No disease name provided."}), 400
+    try:
+        store_type = get_recommended_store_type(disease_name)
+        return jsonify({"store_type": store_type})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/disease_prediction')
+def disease_prediction_html():
+    return '''
+    <!DOCTYPE html>
+    <html>
+    <head>
+      <title>Disease Prediction</title>
+      <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+      </style>
+    </head>
+    <body>
+      <h1>Disease Prediction</h1>
+      <h2>Pick an Image</h2>
+      <form id="uploadForm" enctype="multipart/form-data">
+        <input type="file" id="imageFile" name="image" accept="image/*"><br><br>
+        <button type="button" onclick="uploadImage()">Upload Image</button>
+      </form>
+      <hr>
+      <h2>Or Capture an Image</h2>
+      <video id="video" width="300" height="200" autoplay></video><br>
+      <button id="captureButton">Capture</button>
+      <canvas id="canvas" width="300" height="200" style="display:none;"></canvas><br>
+      <button id="submitCapture" style="display:none;" onclick="submitCapturedImage()">Submit Captured Image</button>
+      <div id="result"></div>
+      <script>
+      const video = document.getElementById('video');
+      const canvas = document.getElementById('canvas');
+      const captureButton = document.getElementById('captureButton');
+      const submitCapture = document.getElementById('submitCapture');
+      const resultDiv = document.getElementById('result');
+      if(navigator.mediaDevices && navigator.mediaDevices.getUserMedia) {
+          navigator.mediaDevices.getUserMedia({ video: true }).then(function(stream) {
+              video.srcObject = stream;
+              video.play();
+          });
+      }
+      captureButton.addEventListener('click', function() {
+          const context = canvas.getContext('2d');
+          context.drawImage(video, 0, 0, canvas.width, canvas.height);
+          canvas.style.display = 'block';
+          submitCapture.style.display = 'inline-block';
+      });
+      function submitCapturedImage() {
+          canvas.toBlob(function(blob) {
+              const formData = new FormData();
+              formData.append('image', blob, 'captured.png');
+              fetch('/predict', {
+                  method: 'POST',
+                  body: formData
+              })
+              .then(response => response.json())
+              .then(data => {
+                  resultDiv.innerHTML = '<h3>Prediction Result</h3><p>Predicted Disease: ' + data.predicted_disease + '</p>';
+              })
+              .catch(error => {
+                  resultDiv.innerHTML = 'Error: ' + error;
+              });
+          }, 'image/png');
+      }
+      function uploadImage() {
+          const fileInput = document.getElementById('imageFile');
+          if(fileInput.files.length === 0) {
+              alert("Please select an image file.");
+              return;
+          }
+          const formData = new FormData();
+          formData.append('image', fileInput.files[0]);
+          fetch('/predict', {
+              method: 'POST',
+              body: formData
+          })
+          .then(response => response.json())
+          .then(data => {
+              resultDiv.innerHTML = '<h3>Prediction Result</h3><p>Predicted Disease: ' + data.predicted_disease + '</p>';
+          })
+          .catch(error => {
+              resultDiv.innerHTML = 'Error: ' + error;
+          });
+      }
+      </script>
+    </body>
+    </html>
+    '''
+
+# -----------------------------
+# CLI Commands
+# -----------------------------
+@bp.cli.command("warm-llm-cache")
+def warm_llm_cache_command():
+    """Precompute Gemini answers for every known class."""
+    jobs = [("healthy advice", get_healthy_advice)]
+    for disease_name in classes:
+        jobs.append((f"{disease_name} info", lambda d=disease_name: get_disease_info(d)))
+        jobs.append((f"{disease_name} store type", lambda d=disease_name: get_recommended_store_type(d)))
+
+    def run(job):
+        label, fn = job
+        try:
+            fn()
+            return label, None
+        except Exception as e:
+            return label, e
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for label, error in pool.map(run, jobs):
+            print(f"{'FAILED' if error else 'ok':<6} {label}" + (f": {error}" if error else ""))
+    print(f"LLM cache: {llm_cache.stats()}")
@@ -0,0 +1,266 @@
+import os
+import time
+
+import click
+from flask import Blueprint, jsonify, request
+
+from alerts import LogNotifier, fetch_tile_forecasts, run_alert_job
+from blueprints.common import bundle_dir, forecast_cache, places_client
+from cache import LRUCache
+from crisis import CrisisEngine, forecast_to_columns, load_rule_overrides, rules_for
+from http_client import CircuitOpenError
+from models import db, UserLocation, AlertOutbox
+from places import PLACE_DETAIL_FIELDS, PlaceDetailsCache, PlacesAPIError, StoreIndex
+
+bp = Blueprint("geo", __name__, cli_group=None)
+
+# Store searches are answered from a spatial index of stores already fetched
+# when an earlier search for the same store type ran nearby; GoMaps is only
+# queried for uncovered areas or after the TTL.
+store_index = StoreIndex(
+    lambda lat, lon, store_type: places_client.text_search(lat, lon, store_type, radius=50000),
+    reuse_km=float(os.environ.get("STORE_REUSE_KM", "5")),
+    ttl=float(os.environ.get("STORE_CACHE_TTL_S", str(24 * 3600)))
+)
+
+# Place details are cached (slimmed to what the app shows) for a week, and
+# the top results of each store search are prefetched in the background.
+PLACE_DETAILS_DB = os.environ.get("PLACE_DETAILS_DB", os.path.join(bundle_dir, "cache", "place_details.sqlite3"))
+PLACE_PREFETCH_TOP = int(os.environ.get("PLACE_PREFETCH_TOP", "5"))
+place_details_cache = PlaceDetailsCache(
+    lambda place_id: places_client.details(place_id, fields=PLACE_DETAIL_FIELDS),
+    ttl=float(os.environ.get("PLACE_DETAILS_TTL_S", str(7 * 24 * 3600))),
+    db_path=PLACE_DETAILS_DB or None,
+    prefetch_workers=int(os.environ.get("PLACE_PREFETCH_WORKERS", "4"))
+)
+
+# Crisis alerts come from a declarative rule table (optionally extended per
+# crop/region) evaluated with vectorized masks. Results are memoized per
+# tile forecast, so the scan runs once per tile and rule set.
+if os.environ.get("CRISIS_RULES_PATH"):
+    load_rule_overrides(os.environ["CRISIS_RULES_PATH"])
+forecast_columns = LRUCache(10000)
+crisis_results = LRUCache(20000)
+
+def get_forecast_columns(tile, fetched_at, forecast):
+    key = (tile, fetched_at)
+    columns = forecast_columns.get(key)
+    if columns is None:
+        columns = forecast_to_columns(forecast)
+        forecast_columns.set(key, columns)
+    return columns
+
+def evaluate_crisis(tile_meta, forecast, crop=None, region=None):
+    key = (tile_meta["tile"], tile_meta["fetched_at"], (crop or "").lower(), (region or "").lower())
+    result = crisis_results.get(key)
+    if result is None:
+        columns = get_forecast_columns(tile_meta["tile"], tile_meta["fetched_at"], forecast)
+        result = CrisisEngine(rules_for(crop, region)).evaluate(columns)
+        crisis_results.set(key, result)
+    return result
+
+def precompute_crisis_alerts(crop=None, region=None, tiles=None, max_workers=8):
+    # Bulk pass over every fresh cached tile for one rule set, after
+    # fetching any of `tiles` that aren't cached yet
+    if tiles:
+        fetch_tile_forecasts(tiles, forecast_cache.get_tile, max_workers)
+    snapshot = forecast_cache.snapshot()
+    results = CrisisEngine(rules_for(crop, region)).evaluate_bulk({
+        tile: get_forecast_columns(tile, fetched_at, data)
+        for tile, (data, fetched_at) in snapshot.items()
+    })
+    for tile, result in results.items():
+        key = (tile, snapshot[tile][1], (crop or "").lower(), (region or "").lower())
+        crisis_results.set(key, result)
+    return results
+
+def stats():
+    return {
+        "weather": forecast_cache.stats(),
+        "stores": store_index.stats(),
+        "place_details": place_details_cache.stats()
+    }
+
+# -----------------------------
+# Store, Place & Weather Endpoints
+# -----------------------------
+@bp.route('/store_finder', methods=['GET'])
+def store_finder_endpoint():
+    lat = request.args.get("lat")
+    lon = request.args.get("lon")
+    store_type = request.args.get("store_type")
+    if not lat or not lon:
+        return jsonify({"error": "Latitude and longitude required."}), 400
+    try:
+        lat = float(lat)
+        lon = float(lon)
+    except ValueError:
+        return jsonify({"error": "Invalid coordinates provided."}), 400
+
+    try:
+        stores, _ = store_index.find(lat, lon, store_type)
+        place_details_cache.prefetch([s["place_id"] for s in stores[:PLACE_PREFETCH_TOP]])
+        return jsonify({"stores": stores})
+    except PlacesAPIError as e:
+        return jsonify({"error": str(e), "details": e.details}), 500
+    except CircuitOpenError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": f"Error fetching store data: {e}"}), 500
+
+@bp.route('/place_details', methods=['GET'])
+def place_details_endpoint():
+    place_id = request.args.get("place_id")
+    if not place_id:
+        return jsonify({"error": "No place_id provided."}), 400
+    try:
+        if request.args.get("full") == "1":
+            # Raw GoMaps payload, uncached
+            return jsonify(places_client.details(place_id))
+        return jsonify({"status": "OK", "result": place_details_cache.get(place_id)})
+    except PlacesAPIError as e:
+        return jsonify({"error": str(e), "details": e.details}), 500
+    except CircuitOpenError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": f"Error fetching place details: {e}"}), 500
+
+@bp.route('/weather', methods=['GET'])
+def weather_forecast_endpoint():
+    lat = request.args.get("lat")
+    lon = request.args.get("lon")
+    if not lat or not lon:
+        return jsonify({"error": "Latitude and longitude required."}), 400
+    try:
+        lat = float(lat)
+        lon = float(lon)
+    except ValueError:
+        return jsonify({"error": "Invalid coordinates provided."}), 400
+
+    try:
+        cached_forecast, tile_meta = forecast_cache.get(lat, lon)
+        # Shallow copy: the cached forecast is shared by every user in the tile
+        forecast_data = dict(cached_forecast)
+        forecast_data["tile"] = tile_meta["tile"]
+        forecast_data["stale"] = tile_meta["stale"]
+        forecast_data["fetched_at"] = tile_meta["fetched_at"]
+
+        crisis_mode, crisis_events = evaluate_crisis(
+            tile_meta, cached_forecast,
+            crop=request.args.get("crop"),
+            region=request.args.get("region")
+        )
+        forecast_data["crisis_mode"] = crisis_mode
+        forecast_data["crisis_events"] = crisis_events
+        
+        return jsonify(forecast_data)
+    except CircuitOpenError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        print("Error in /weather endpoint:", e)
+        return jsonify({"error": str(e)}), 500
+
+# -----------------------------
+# Weather Alerts
+# -----------------------------
+ALERT_MAX_ATTEMPTS = int(os.environ.get("ALERT_MAX_ATTEMPTS", "5"))
+ALERT_RETRY_BACKOFF_S = float(os.environ.get("ALERT_RETRY_BACKOFF_S", "60"))
+
+def queue_weather_alerts(max_workers=8):
+    # Groups users by stored tile, fetches each tile's forecast once and
+    # writes new alerts to the outbox for a notifier to deliver.
+    subscriptions = db.session.query(UserLocation.user_id, UserLocation.tile).all()
+    alerts, stats, errors = run_alert_job(
+        subscriptions,
+        forecast_cache.get_tile,
+        columns_fn=lambda tile, forecast, meta: get_forecast_columns(tile, meta["fetched_at"], forecast),
+        max_workers=max_workers
+    )
+    existing = set()
+    keys = [alert["dedupe_key"] for alert in alerts]
+    for i in range(0, len(keys), 500):
+        rows = db.session.query(AlertOutbox.dedupe_key).filter(AlertOutbox.dedupe_key.in_(keys[i:i + 500])).all()
+        existing.update(row[0] for row in rows)
+    now = time.time()
+    rows = [
+        {
+            "user_id": alert["user_id"],
+            "tile": alert["tile"],
+            "condition": alert["condition"],
+            "event_time": alert["event_time"],
+            "dedupe_key": alert["dedupe_key"],
+            "status": "pending",
+            "created_at": now
+        }
+        for alert in alerts if alert["dedupe_key"] not in existing
+    ]
+    if rows:
+        db.session.execute(AlertOutbox.__table__.insert(), rows)
+    db.session.commit()
+    stats["queued"] = len(rows)
+    return stats, errors
+
+def dispatch_weather_alerts(notifier, batch_size=500, max_attempts=None, retry_backoff_s=None):
+    # Delivers due pending alerts. An alert the notifier didn't deliver stays
+    # pending and is retried after retry_backoff_s, doubling each attempt;
+    # it is marked failed only after max_attempts.
+    max_attempts = ALERT_MAX_ATTEMPTS if max_attempts is None else max_attempts
+    retry_backoff_s = ALERT_RETRY_BACKOFF_S if retry_backoff_s is None else retry_backoff_s
+    sent_total = 0
+    started = time.time()
+    while True:
+        pending = AlertOutbox.query.filter(
+            AlertOutbox.status == "pending",
+            db.or_(AlertOutbox.next_attempt_at.is_(None), AlertOutbox.next_attempt_at <= started)
+        ).order_by(AlertOutbox.id).limit(batch_size).all()
+        if not pending:
+            return sent_total
+        try:
+            sent_ids = set(notifier.send([
+                {"id": a.id, "user_id": a.user_id, "tile": a.tile, "condition": a.condition, "event_time": a.event_time}
+                for a in pending
+            ]))
+        except Exception as e:
+            print(f"Alert delivery failed: {e}")
+            sent_ids = set()
+        now = time.time()
+        for alert in pending:
+            alert.attempts = (alert.attempts or 0) + 1
+            if alert.id in sent_ids:
+                alert.status = "sent"
+                alert.sent_at = now
+            elif alert.attempts >= max_attempts:
+                alert.status = "failed"
+            else:
+                alert.next_attempt_at = now + retry_backoff_s * 2 ** (alert.attempts - 1)
+        db.session.commit()
+        sent_total += len(sent_ids)
+
+@bp.cli.command("precompute-crisis-alerts")
+@click.option("--crop", default=None, help="Add this crop's rules to the defaults.")
+@click.option("--region", default=None, help="Add this region's rules to the defaults.")
+@click.option("--workers", default=8, show_default=True, help="Concurrent forecast fetches.")
+def precompute_crisis_alerts_command(crop, region, workers):
+    """Evaluate crisis rules for every stored user location in one pass."""
+    tiles = [tile for (tile,) in db.session.query(UserLocation.tile).distinct()]
+    results = precompute_crisis_alerts(crop, region, tiles=tiles, max_workers=workers)
+    in_crisis = sorted(tile for tile, (crisis_mode, _) in results.items() if crisis_mode)
+    print(f"Evaluated {len(results)} tiles; {len(in_crisis)} in crisis: {', '.join(in_crisis) or '-'}")
+
+@bp.cli.command("send-weather-alerts")
+@click.option("--workers", default=8, show_default=True, help="Concurrent forecast fetches.")
+@click.option("--every", default=0, type=float, help="Repeat every N seconds (0 runs once).")
+@click.option("--dispatch/--no-dispatch", default=True, show_default=True, help="Deliver pending alerts after queueing.")
+def send_weather_alerts_command(workers, every, dispatch):
+    """Queue crisis alerts for every stored user location and deliver them."""
+    notifier = LogNotifier()
+    while True:
+        stats, errors = queue_weather_alerts(max_workers=workers)
+        print(f"Alert job: {stats}")
+        for tile, error in errors.items():
+            print(f"  forecast failed for tile {tile}: {error}")
+        if dispatch:
+            print(f"Delivered {dispatch_weather_alerts(notifier)} alerts.")
+        if not every:
+            return
+        time.sleep(every)
@@ -0,0 +1,284 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from flask import Blueprint, current_app, jsonify, request, session
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from blueprints.common import bundle_dir, forecast_cache, places_client
+from cache import ResponseCache
+from media import InvalidImageError, MediaStore, is_content_hash
+from models import db, User, UserLocation, Rental
+from rental_search import parse_search_args, search_rentals
+from rentals import list_rentals, parse_rental_args, rental_to_dict
+
+bp = Blueprint("marketplace", __name__, cli_group=None)
+
+# Rental photos are stored by content hash with WebP renditions made on a
+# small worker pool, and served from /media/<hash>/<size>
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT", os.path.join(bundle_dir, "uploads", "media"))
+media_store = MediaStore(MEDIA_ROOT, max_workers=int(os.environ.get("MEDIA_WORKERS", "2")))
+
+# Rental locations are free text; geocoded results are cached for a month
+GEOCODE_CACHE_DB = os.environ.get("GEOCODE_CACHE_DB", os.path.join(bundle_dir, "cache", "geocode.sqlite3"))
+geocode_cache = ResponseCache(30 * 24 * 3600, max_entries=4096, db_path=GEOCODE_CACHE_DB or None, table="geocode")
+
+# New listings are saved first and geocoded on this pool, so posting never
+# waits on the geocoder; `flask geocode-rentals` backfills any that fail.
+geocode_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("GEOCODE_WORKERS", "2")), thread_name_prefix="geocode")
+
+def _geocode_key(text):
+    return ResponseCache.key(" ".join(text.lower().split()))
+
+def geocode_location(text):
+    # (lat, lon) for a place name, or None if it can't be resolved
+    def lookup():
+        point = places_client.geocode(text)
+        return {"lat": point[0], "lon": point[1]} if point else {"lat": None, "lon": None}
+    result = geocode_cache.get_or_compute(_geocode_key(text), lookup)
+    return (result["lat"], result["lon"]) if result["lat"] is not None else None
+
+def cached_geocode(text):
+    # geocode_location without the upstream call: (lat, lon) or None
+    result = geocode_cache.get(_geocode_key(text))
+    return (result["lat"], result["lon"]) if result and result["lat"] is not None else None
+
+def geocode_rental(app, rental_id, location):
+    # Background job: fill in a new listing's coordinates unless the
+    # poster (or a backfill) already has
+    with app.app_context():
+        try:
+            point = geocode_location(location)
+        except Exception as e:
+            print(f"Geocoding '{location}' failed: {e}")
+            return None
+        if point:
+            Rental.query.filter(Rental.id == rental_id, Rental.lat.is_(None)).update(
+                {Rental.lat: point[0], Rental.lon: point[1]}, synchronize_session=False
+            )
+            db.session.commit()
+        return point
+
+def stats():
+    return {"media": media_store.stats()}
+
+# -----------------------------
+# Registration, Login & Rental Endpoints
+# -----------------------------
+@bp.route('/register', methods=['POST'])
+def register():
+    data = request.get_json()
+    if not data:
+        return jsonify({"error": "No registration data provided."}), 400
+    username = data.get('username')
+    password = data.get('password')
+    if not username or not password:
+        return jsonify({"error": "Username and password are required."}), 400
+    if User.query.filter_by(username=username).first():
+        return jsonify({"error": "Username already exists."}), 400
+    password_hash = generate_password_hash(password)
+    new_user = User(username=username, password_hash=password_hash)
+    db.session.add(new_user)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent registration of the same name
+        db.session.rollback()
+        return jsonify({"error": "Username already exists."}), 400
+    return jsonify({"message": "User registered successfully."})
+
+@bp.route('/login', methods=['POST'])
+def login():
+    data = request.get_json()
+    if not data:
+        return jsonify({"error": "No login data provided."}), 400
+    username = data.get('username')
+    password = data.get('password')
+    if not username or not password:
+        return jsonify({"error": "Username and password are required."}), 400
+    user = User.query.filter_by(username=username).first()
+    if user and check_password_hash(user.password_hash, password):
+        session['logged_in'] = True
+        session['username'] = username
+        return jsonify({"message": "Login successful."})
+    else:
+        return jsonify({"error": "Invalid credentials."}), 401
+
+@bp.route('/logout', methods=['POST'])
+def logout():
+    session.clear()
+    return jsonify({"message": "Logged out successfully."})
+
+@bp.route('/location', methods=['POST'])
+def set_location():
+    # Stores the farmer's location so proactive weather alerts can reach them
+    if not session.get('logged_in'):
+        return jsonify({"error": "Authentication required to save location."}), 401
+    data = request.get_json()
+    if not data or data.get("lat") is None or data.get("lon") is None:
+        return jsonify({"error": "Latitude and longitude required."}), 400
+    try:
+        lat = float(data["lat"])
+        lon = float(data["lon"])
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid coordinates provided."}), 400
+    user = User.query.filter_by(username=session.get('username')).first()
+    if not user:
+        return jsonify({"error": "User not found."}), 404
+    location = UserLocation.query.filter_by(user_id=user.id).first()
+    if not location:
+        location = UserLocation(user_id=user.id)
+        db.session.add(location)
+    location.lat = lat
+    location.lon = lon
+    location.tile = forecast_cache.tile_for(lat, lon)
+    location.updated_at = time.time()
+    db.session.commit()
+    return jsonify({"message": "Location saved.", "tile": location.tile})
+
+@bp.route('/rentals', methods=['GET'])
+def get_rentals():
+    # Keyset-paginated: pass next_cursor back as ?cursor= for the next page
+    try:
+        params = parse_rental_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    rentals, next_cursor = list_rentals(**params)
+    return jsonify({"rentals": rentals, "next_cursor": next_cursor})
+
+@bp.route('/media/<content_hash>/<size>', methods=['GET'])
+def media_endpoint(content_hash, size):
+    try:
+        response = media_store.send(content_hash, size)
+    except InvalidImageError as e:
+        return jsonify({"error": str(e)}), 415
+    if response is None:
+        return jsonify({"error": "Media not found."}), 404
+    return response
+
+@bp.route('/rentals/search', methods=['GET'])
+def search_rentals_endpoint():
+    # Text (?q=), distance (?lat=&lon= or ?near=<place>, ?radius_km=) and
+    # price/type filters, ranked by text relevance discounted by distance
+    try:
+        params = parse_search_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    near = (request.args.get("near") or "").strip()
+    if near and params["lat"] is None:
+        try:
+            point = geocode_location(near)
+        except Exception as e:
+            return jsonify({"error": f"Could not geocode '{near}': {e}"}), 502
+        if point is None:
+            return jsonify({"error": f"Unknown place: {near}"}), 400
+        params["lat"], params["lon"] = point
+    if not params["q"] and params["lat"] is None:
+        return jsonify({"error": "Provide a search query (q) or a location (lat/lon or near)."}), 400
+    try:
+        rentals, has_more = search_rentals(**params)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "rentals": rentals,
+        "page": params["page"],
+        "next_page": params["page"] + 1 if has_more else None
+    })
+
+@bp.route('/rentals', methods=['POST'])
+def add_rental():
+    if not session.get('logged_in'):
+        return jsonify({"error": "Authentication required to add rental."}), 401
+    # Support both JSON and multipart/form-data
+    if request.content_type.startswith('multipart/form-data'):
+        data = request.form.to_dict()
+    else:
+        data = request.get_json()
+    title = data.get('title')
+    description = data.get('description')
+    price = data.get('price')
+    contact = data.get('contact')
+    equipment_type = data.get('equipment_type')
+    rental_duration = data.get('rental_duration')
+    location = data.get('location')
+    if not title or not description or price is None or not contact or not equipment_type or not rental_duration or not location:
+         return jsonify({"error": "Missing required rental information. All fields are required."}), 400
+    try:
+        price = float(price)
+    except:
+        return jsonify({"error": "Price must be a number."}), 400
+    lat, lon = data.get('lat'), data.get('lon')
+    try:
+        lat, lon = (float(lat), float(lon)) if lat not in (None, "") and lon not in (None, "") else (None, None)
+    except (TypeError, ValueError):
+        return jsonify({"error": "lat and lon must be numbers."}), 400
+    if lat is None:
+        # Only a cached answer here; otherwise geocoded after the commit
+        lat, lon = cached_geocode(location) or (None, None)
+    new_rental = Rental(
+        title=title,
+        description=description,
+        price=price,
+        contact=contact,
+        equipment_type=equipment_type,
+        rental_duration=rental_duration,
+        location=location,
+        posted_by=session.get('username'),
+        lat=lat,
+        lon=lon
+    )
+    # Process optional photo upload
+    if 'photo' in request.files:
+        photo_file = request.files['photo']
+        if photo_file.filename != "":
+            try:
+                new_rental.photo = media_store.save(photo_file.stream)
+            except InvalidImageError as e:
+                return jsonify({"error": str(e)}), 400
+    db.session.add(new_rental)
+    db.session.commit()
+    if new_rental.lat is None:
+        geocode_executor.submit(geocode_rental, current_app._get_current_object(), new_rental.id, location)
+    return jsonify({
+        "message": "Rental added successfully.",
+        "rental": rental_to_dict(new_rental)
+    })
+
+# -----------------------------
+# CLI Commands
+# -----------------------------
+@bp.cli.command("geocode-rentals")
+@click.option("--limit", default=1000, show_default=True, help="Rentals to geocode per run.")
+def geocode_rentals_command(limit):
+    """Fill in lat/lon for rentals posted without coordinates."""
+    rentals = Rental.query.filter(Rental.lat.is_(None)).limit(limit).all()
+    located = 0
+    for rental in rentals:
+        try:
+            point = geocode_location(rental.location)
+        except Exception as e:
+            print(f"{rental.id}: {e}")
+            continue
+        if point:
+            rental.lat, rental.lon = point
+            located += 1
+    db.session.commit()
+    print(f"Geocoded {located} of {len(rentals)} rentals.")
+
+@bp.cli.command("import-legacy-photos")
+def import_legacy_photos_command():
+    """Move rental photos saved as uploads/<filename> into the media store."""
+    moved = 0
+    for rental in Rental.query.filter(Rental.photo.isnot(None)).all():
+        if is_content_hash(rental.photo) or not os.path.isfile(rental.photo):
+            continue
+        try:
+            with open(rental.photo, "rb") as f:
+                rental.photo = media_store.save(f)
+            moved += 1
+        except InvalidImageError as e:
+            print(f"{rental.id}: {e}")
+    db.session.commit()
+    print(f"Imported {moved} photos.")
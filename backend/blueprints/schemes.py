@@ -0,0 +1,71 @@
+import hashlib
+import os
+
+from flask import Blueprint, jsonify, request
+
+from blueprints.common import bundle_dir, http_client
+from schemes import SchemeRefresher, SchemeStore, scrape_schemes
+
+bp = Blueprint("schemes", __name__, cli_group=None)
+
+# Government schemes are scraped periodically into a local SQLite store
+SCHEMES_DB = os.environ.get("SCHEMES_DB", os.path.join(bundle_dir, "cache", "schemes.sqlite3"))
+SCHEMES_PER_PAGE = 10
+scheme_store = SchemeStore(SCHEMES_DB)
+scheme_refresher = SchemeRefresher(
+    scheme_store,
+    scrape_fn=lambda: scrape_schemes(http_client=http_client),
+    interval=float(os.environ.get("SCHEMES_REFRESH_INTERVAL_S", str(6 * 3600))),
+    max_age=float(os.environ.get("SCHEMES_MAX_AGE_S", str(12 * 3600)))
+)
+
+# -----------------------------
+# Scheme Endpoints
+# -----------------------------
+@bp.route('/govt_schemes', methods=['GET'])
+def govt_schemes_endpoint():
+    # Served from the local scheme store; scraping happens in the background
+    page = request.args.get("page", default="1")
+    try:
+        page = int(page)
+    except:
+        page = 1
+    per_page = request.args.get("per_page", default=SCHEMES_PER_PAGE, type=int)
+    per_page = min(max(1, per_page), 100)
+
+    search = request.args.get("search", default="").strip()
+    cursor = request.args.get("cursor")
+
+    scheme_refresher.revalidate()
+    meta = scheme_store.get_meta()
+    try:
+        if search:
+            schemes, next_cursor = scheme_store.search(search, page, per_page, cursor)
+        else:
+            schemes, next_cursor = scheme_store.page(page, per_page, cursor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = jsonify({
+        "schemes": schemes,
+        "page": page,
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+        "total": scheme_store.count(),
+        "last_refreshed": meta["last_refreshed"],
+        "stale": scheme_refresher.is_stale(),
+        "refreshing": scheme_refresher.refreshing
+    })
+    if meta["etag"]:
+        response.set_etag(hashlib.sha1(f"{meta['etag']}|{page}|{per_page}|{cursor}|{search}".encode("utf-8")).hexdigest())
+    return response.make_conditional(request)
+
+# -----------------------------
+# CLI Commands
+# -----------------------------
+@bp.cli.command("refresh-schemes")
+def refresh_schemes_command():
+    """Scrape government schemes into the local store now."""
+    if scheme_refresher.refresh():
+        print(f"Stored {scheme_store.count()} schemes.")
+    else:
+        print(f"Refresh failed: {scheme_store.get_meta()['last_error']}")
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+
+# -----------------------------
+# In-memory LRU Cache
+# -----------------------------
+class LRUCache:
+    def __init__(self, max_entries=1024):
+        self.max_entries = max(1, int(max_entries))
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def items(self):
+        # Snapshot without touching recency or hit/miss counters
+        with self._lock:
+            return list(self._data.items())
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# -----------------------------
+# SQLite Key/Value Store
+# -----------------------------
+def reopen_after_fork(store):
+    # A SQLite connection must not be used on both sides of a fork (e.g. in
+    # gunicorn workers forked from a preloaded app): the child calls
+    # store.reopen() to get its own connection and lock.
+    ref = weakref.ref(store)
+
+    def reopen():
+        target = ref()
+        if target is not None:
+            target.reopen()
+
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=reopen)
+
+
+class SQLiteStore:
+    # Small JSON key/value table used to persist caches across restarts.
+    # Expired rows, and the oldest rows beyond max_rows, are deleted by set()
+    # at most once per purge_interval.
+    def __init__(self, path, table="cache", purge_interval=3600, max_rows=None):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.table = table
+        self.purge_interval = purge_interval
+        self.max_rows = max_rows
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, expires_at REAL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_expires_at ON {table} (expires_at)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_created_at ON {table} (created_at)")
+        self._conn.commit()
+        reopen_after_fork(self)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def reopen(self):
+        # The parent's connection is left alone; closing it here could
+        # disturb the parent's locks on the database file
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def get(self, key):
+        return self.get_with_expiry(key)[0]
+
+    def get_with_expiry(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None, None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return None, None
+        return json.loads(value), expires_at
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, expires_at)
+            )
+            self._conn.commit()
+        if now - self._last_purge >= self.purge_interval:
+            self.purge_expired()
+
+    def purge_expired(self):
+        # Returns the number of rows deleted
+        now = time.time()
+        self._last_purge = now
+        with self._lock:
+            deleted = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (now,)
+            ).rowcount
+            if self.max_rows is not None:
+                deleted += self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN"
+                    f" (SELECT key FROM {self.table} ORDER BY created_at DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+                ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def delete_other_prefixes(self, prefix):
+        # Drops every row whose key doesn't start with `prefix`; returns the
+        # number deleted
+        with self._lock:
+            deleted = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE substr(key, 1, ?) != ?", (len(prefix), prefix)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+# -----------------------------
+# Prediction Cache
+# -----------------------------
+class PredictionCache:
+    # Content-addressed: the key is a hash of the uploaded bytes plus the
+    # model version, so re-submitted photos skip the forward pass and a new
+    # model never serves stale predictions. The disk tier keeps rows for
+    # `ttl` seconds and at most `max_disk_entries` of them, and drops other
+    # model versions' rows when opened.
+    def __init__(self, model_version, max_entries=4096, db_path=None, ttl=30 * 24 * 3600, max_disk_entries=100000):
+        self.model_version = model_version
+        self.ttl = ttl
+        self.memory = LRUCache(max_entries)
+        self.store = SQLiteStore(db_path, table="predictions", max_rows=max_disk_entries) if db_path else None
+        if self.store is not None:
+            self.store.delete_other_prefixes(f"{model_version}:")
+        self.disk_hits = 0
+
+    def key(self, image_bytes, variant=None):
+        # `variant` separates results computed differently from the same
+        # photo (e.g. with test-time augmentation)
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        if variant:
+            return f"{self.model_version}:{variant}:{digest}"
+        return f"{self.model_version}:{digest}"
+
+    def get(self, key):
+        result = self.memory.get(key)
+        if result is not None or self.store is None:
+            return result
+        result = self.store.get(key)
+        if result is not None:
+            self.disk_hits += 1
+            self.memory.set(key, result)
+        return result
+
+    def set(self, key, result):
+        self.memory.set(key, result)
+        if self.store is not None:
+            self.store.set(key, result, ttl=self.ttl)
+
+    def stats(self):
+        stats = self.memory.stats()
+        # A disk hit is counted as a memory miss by the LRU
+        stats["disk_hits"] = self.disk_hits
+        stats["misses"] = self.memory.misses - self.disk_hits
+        stats["model_version"] = self.model_version
+        stats["persistent"] = self.store is not None
+        return stats
+
+
+# -----------------------------
+# Single-flight De-duplication
+# -----------------------------
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    # Concurrent calls for the same key share one execution of fn.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+# -----------------------------
+# TTL Response Cache
+# -----------------------------
+class ResponseCache:
+    # TTL cache for deterministic upstream responses (e.g. LLM prompts). Misses
+    # for the same key are collapsed into a single upstream call.
+    def __init__(self, ttl, max_entries=1024, db_path=None, table="responses"):
+        self.ttl = ttl
+        self.memory = LRUCache(max_entries)
+        self.store = SQLiteStore(db_path, table=table) if db_path else None
+        self.flight = SingleFlight()
+        self.disk_hits = 0
+        self.upstream_calls = 0
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        entry = self.memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.time():
+                return value
+            self.memory.pop(key)
+        if self.store is not None:
+            value, expires_at = self.store.get_with_expiry(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, (value, expires_at or time.time() + self.ttl))
+                return value
+        return None
+
+    def set(self, key, value):
+        self.memory.set(key, (value, time.time() + self.ttl))
+        if self.store is not None:
+            self.store.set(key, value, ttl=self.ttl)
+
+    def get_or_compute(self, key, fn):
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def compute():
+            # Another caller may have filled the cache while we queued
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            self.upstream_calls += 1
+            result = fn()
+            self.set(key, result)
+            return result
+
+        return self.flight.do(key, compute)
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["upstream_calls"] = self.upstream_calls
+        stats["ttl_seconds"] = self.ttl
+        stats["persistent"] = self.store is not None
+        return stats
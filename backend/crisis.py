@@ -0,0 +1,185 @@
+import json
+import operator
+import threading
+
+import numpy as np
+
+
+# -----------------------------
+# Crisis Rule Tables
+# -----------------------------
+# A rule fires for a forecast slot when every clause in "when" holds. Clauses
+# are (column, op, value); columns are temp (°C), wind (m/s), rain (mm/3h)
+# and weather (lower-cased OpenWeather "main"). "condition" is the event
+# label; "{weather}" is replaced with the slot's title-cased weather.
+DEFAULT_RULES = [
+    {"condition": "{weather}", "when": [("weather", "in", ["thunderstorm", "tornado"])]},
+    {"condition": "Heavy Rain", "when": [("rain", ">", 20)]},
+    {"condition": "Extreme Heat", "when": [("temp", ">", 40)]},
+    {"condition": "Severe Cold", "when": [("temp", "<", 5)]},
+    {"condition": "High Winds", "when": [("wind", ">", 20)]},
+    {"condition": "Dust/Sand Storm", "when": [("weather", "in", ["dust", "sand", "ash"]), ("wind", ">", 10)]},
+]
+
+# Extra rules appended for a crop (?crop=...) on top of DEFAULT_RULES
+CROP_RULES = {
+    "potato": [
+        {"condition": "Frost Risk", "when": [("temp", "<", 2)]},
+        {"condition": "Late Blight Weather", "when": [("humidity", ">=", 90), ("temp", ">=", 10), ("temp", "<=", 24)]},
+    ],
+    "tomato": [
+        {"condition": "Chilling Injury Risk", "when": [("temp", "<", 10)]},
+        {"condition": "Flower Drop Heat", "when": [("temp", ">", 35)]},
+    ],
+    "wheat": [
+        {"condition": "Terminal Heat Stress", "when": [("temp", ">", 34)]},
+        {"condition": "Frost Risk", "when": [("temp", "<", 2)]},
+    ],
+    "rice": [
+        {"condition": "Flooding Rain", "when": [("rain", ">", 50)]},
+    ],
+}
+
+# Extra rules per region key (e.g. a state code), same format as CROP_RULES
+REGION_RULES = {}
+
+_OPS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+}
+
+
+def load_rule_overrides(path):
+    # Optional JSON file: {"default": [...], "crops": {...}, "regions": {...}}
+    global DEFAULT_RULES
+    with open(path, encoding="utf-8") as f:
+        overrides = json.load(f)
+    if "default" in overrides:
+        DEFAULT_RULES = overrides["default"]
+    CROP_RULES.update(overrides.get("crops", {}))
+    REGION_RULES.update(overrides.get("regions", {}))
+
+
+def rules_for(crop=None, region=None):
+    rules = list(DEFAULT_RULES)
+    if crop:
+        rules += CROP_RULES.get(crop.strip().lower(), [])
+    if region:
+        rules += REGION_RULES.get(region.strip().lower(), [])
+    return rules
+
+
+# -----------------------------
+# Columnar Forecasts
+# -----------------------------
+# OpenWeather "main" strings are interned to process-wide integer codes so
+# "in" clauses are integer comparisons and columns from different forecasts
+# can be concatenated without remapping.
+_WEATHER_CODES = {}
+_WEATHER_NAMES = []
+_WEATHER_LOCK = threading.Lock()
+
+
+def _weather_code(name):
+    code = _WEATHER_CODES.get(name)
+    if code is None:
+        # Request threads intern concurrently; the name must be appended
+        # before its code is visible to other threads
+        with _WEATHER_LOCK:
+            code = _WEATHER_CODES.get(name)
+            if code is None:
+                _WEATHER_NAMES.append(name)
+                code = _WEATHER_CODES[name] = len(_WEATHER_NAMES) - 1
+    return code
+
+
+def forecast_to_columns(forecast):
+    # One pass per column over the JSON; None becomes NaN so missing values
+    # never trip a comparison. Build this once per cached forecast and reuse
+    # it for every rule set and request.
+    items = forecast.get("list", [])
+    return {
+        "temp": np.array([item.get("main", {}).get("temp") for item in items], dtype=float),
+        "humidity": np.array([item.get("main", {}).get("humidity") for item in items], dtype=float),
+        "wind": np.array([item.get("wind", {}).get("speed", 0) or 0 for item in items], dtype=float),
+        "rain": np.array([item.get("rain", {}).get("3h", 0) or 0 for item in items], dtype=float),
+        "weather": np.array([_weather_code(item.get("weather", [{}])[0].get("main", "").lower()) for item in items], dtype=np.int32),
+        "time": [item.get("dt_txt", "Unknown time") for item in items],
+    }
+
+
+def stack_columns(columns_list):
+    # Many forecasts' columns as one set, plus the owning forecast per row
+    stacked = {
+        key: np.concatenate([c[key] for c in columns_list]) if columns_list else np.empty(0)
+        for key in ("temp", "humidity", "wind", "rain", "weather")
+    }
+    stacked["time"] = [t for c in columns_list for t in c["time"]]
+    stacked["owner"] = np.repeat(np.arange(len(columns_list)), [len(c["temp"]) for c in columns_list])
+    return stacked
+
+
+# -----------------------------
+# Crisis Engine
+# -----------------------------
+class CrisisEngine:
+    def __init__(self, rules=None):
+        self.rules = DEFAULT_RULES if rules is None else rules
+
+    @staticmethod
+    def _clause_mask(columns, column, op, value):
+        if column == "weather":
+            if op != "in":
+                raise ValueError(f"Unsupported operator for weather: {op}")
+            codes = [_WEATHER_CODES[v] for v in value if v in _WEATHER_CODES]
+            return np.isin(columns["weather"], codes)
+        data = columns[column]
+        if op == "in":
+            return np.isin(data, list(value))
+        with np.errstate(invalid="ignore"):
+            # NaN (missing) compares False, like the old `is not None` checks
+            return _OPS[op](data, value)
+
+    def _masks(self, columns):
+        n = len(columns["temp"])
+        masks = np.zeros((n, len(self.rules)), dtype=bool)
+        for r, rule in enumerate(self.rules):
+            mask = np.ones(n, dtype=bool)
+            for column, op, value in rule["when"]:
+                mask &= self._clause_mask(columns, column, op, value)
+            masks[:, r] = mask
+        return masks
+
+    def _events(self, columns, slots, rule_ids):
+        events = []
+        for slot, r in zip(slots, rule_ids):
+            label = self.rules[r]["condition"]
+            if "{weather}" in label:
+                label = label.replace("{weather}", _WEATHER_NAMES[columns["weather"][slot]].title())
+            events.append({"time": columns["time"][slot], "condition": label})
+        return events
+
+    def evaluate(self, columns):
+        # `columns` from forecast_to_columns(). Returns (crisis_mode,
+        # crisis_events) with events in slot order, then rule order.
+        slots, rule_ids = np.nonzero(self._masks(columns))
+        events = self._events(columns, slots, rule_ids)
+        return bool(events), events
+
+    def evaluate_bulk(self, columns_by_key):
+        # One vectorized pass over {key: columns}; returns {key: (mode, events)}
+        keys = list(columns_by_key)
+        columns = stack_columns([columns_by_key[k] for k in keys])
+        slots, rule_ids = np.nonzero(self._masks(columns))
+        owners = columns["owner"][slots]
+        results = {k: (False, []) for k in keys}
+        if len(slots):
+            # np.nonzero is row-major, so per-owner events stay in slot order
+            bounds = np.flatnonzero(np.diff(owners)) + 1
+            for group in np.split(np.arange(len(slots)), bounds):
+                events = self._events(columns, slots[group], rule_ids[group])
+                results[keys[owners[group[0]]]] = (True, events)
+        return results
@@ -0,0 +1,158 @@
+"""Export the disease model to TFLite for lightweight CPU inference.
+
+Strips the training-only data_augmentation block from the Keras model,
+converts it to TFLite (float32, float16, dynamic-range or INT8 calibrated
+on the validation split) and checks that its predictions agree with the
+Keras model before writing the file. Run from the backend folder:
+
+    python export_model.py --quantize int8 --data-dir /path/to/PlantVillage/raw/color
+
+Serve the result with DISEASE_MODEL_PATH=plant_disease_prediction_model.int8.tflite.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import tensorflow as tf
+
+from inference import TFLiteBackend
+
+QUANTIZATION_MODES = ("none", "float16", "dynamic", "int8")
+IMG_SIZE = (224, 224)
+# Same split as augmentation.py, so calibration and parity use held-out images
+SPLIT_SEED = 123
+
+
+# -----------------------------
+# Inference Graph
+# -----------------------------
+def _is_augmentation(layer):
+    if layer.name == "data_augmentation":
+        return True
+    if isinstance(layer, tf.keras.Sequential):
+        return bool(layer.layers) and all(_is_augmentation(sub) for sub in layer.layers)
+    return type(layer).__name__.startswith("Random")
+
+
+def strip_augmentation(model):
+    # Rebuilds the linear model from augmentation.py without its Random*
+    # layers. They are no-ops at inference, but they stay in the graph and
+    # their ops (e.g. ImageProjectiveTransform) have no TFLite kernels.
+    inputs = tf.keras.Input(shape=model.input_shape[1:])
+    x = inputs
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.layers.InputLayer) or _is_augmentation(layer):
+            continue
+        x = layer(x)
+    stripped = tf.keras.Model(inputs, x, name=f"{model.name}_inference")
+    probe = np.random.default_rng(0).random((2,) + tuple(model.input_shape[1:]), dtype=np.float32)
+    if not np.allclose(model(probe, training=False), stripped(probe, training=False), atol=1e-5):
+        raise ValueError("Model is not a linear chain; stripping augmentation changed its output.")
+    return stripped
+
+
+def validation_samples(data_dir, count, batch_size=32):
+    # (images, labels) from the validation split, scaled like the serving
+    # path (preprocessing.preprocess_image divides by 255)
+    dataset = tf.keras.utils.image_dataset_from_directory(
+        data_dir,
+        validation_split=0.2,
+        subset="validation",
+        seed=SPLIT_SEED,
+        image_size=IMG_SIZE,
+        batch_size=batch_size
+    )
+    images, labels = [], []
+    for batch_images, batch_labels in dataset.take(-(-count // batch_size)):
+        images.append(batch_images.numpy() / np.float32(255.0))
+        labels.append(batch_labels.numpy())
+    return np.concatenate(images)[:count], np.concatenate(labels)[:count]
+
+
+# -----------------------------
+# Conversion
+# -----------------------------
+def convert(model, quantize="none", calibration=None):
+    if quantize not in QUANTIZATION_MODES:
+        raise ValueError(f"quantize must be one of: {', '.join(QUANTIZATION_MODES)}.")
+
+    # A concrete function with a dynamic batch dimension converts the same
+    # way under Keras 2 and 3 and lets the interpreter resize for batches
+    @tf.function(input_signature=[tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32)])
+    def serve(images):
+        return model(images, training=False)
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([serve.get_concrete_function()], model)
+    if quantize != "none":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantize == "int8":
+        if calibration is None or not len(calibration):
+            raise ValueError("INT8 quantization needs calibration images (--data-dir).")
+        converter.representative_dataset = lambda: ([image[np.newaxis].astype(np.float32)] for image in calibration)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        # Inputs and outputs stay float32, so serving code is unchanged
+    return converter.convert()
+
+
+def _predict_in_batches(predict_fn, images, batch_size=32):
+    return np.concatenate([np.asarray(predict_fn(images[i:i + batch_size])) for i in range(0, len(images), batch_size)])
+
+
+def parity(reference_fn, candidate_fn, images, labels=None):
+    reference = _predict_in_batches(reference_fn, images)
+    candidate = _predict_in_batches(candidate_fn, images)
+    report = {
+        "samples": len(images),
+        "top1_agreement": float(np.mean(reference.argmax(axis=1) == candidate.argmax(axis=1))),
+        "max_abs_diff": float(np.max(np.abs(reference - candidate)))
+    }
+    if labels is not None:
+        report["reference_accuracy"] = float(np.mean(reference.argmax(axis=1) == labels))
+        report["candidate_accuracy"] = float(np.mean(candidate.argmax(axis=1) == labels))
+    return report
+
+
+def default_output(model_path, quantize):
+    stem = os.path.splitext(model_path)[0]
+    return f"{stem}.tflite" if quantize == "none" else f"{stem}.{quantize}.tflite"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "plant_disease_prediction_model.h5"))
+    parser.add_argument("--output", help="defaults to the model path with a .tflite suffix")
+    parser.add_argument("--quantize", choices=QUANTIZATION_MODES, default="none")
+    parser.add_argument("--data-dir", help="image folder the model was trained on (one subfolder per class)")
+    parser.add_argument("--calibration-samples", type=int, default=200)
+    parser.add_argument("--parity-samples", type=int, default=1000)
+    parser.add_argument("--min-agreement", type=float, default=0.99, help="required top-1 agreement with Keras")
+    args = parser.parse_args()
+
+    model = strip_augmentation(tf.keras.models.load_model(args.model))
+    images = labels = None
+    if args.data_dir:
+        images, labels = validation_samples(args.data_dir, max(args.calibration_samples, args.parity_samples))
+    elif args.quantize == "int8":
+        parser.error("--quantize int8 needs --data-dir for calibration images.")
+
+    content = convert(model, args.quantize, None if images is None else images[:args.calibration_samples])
+    if images is None:
+        print("No --data-dir: parity is checked on random inputs only.")
+        images = np.random.default_rng(0).random((64,) + IMG_SIZE + (3,), dtype=np.float32)
+    report = parity(lambda batch: model(batch, training=False), TFLiteBackend(model_content=content).predict,
+                    images[:args.parity_samples], None if labels is None else labels[:args.parity_samples])
+    print("Parity vs Keras:", ", ".join(f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}" for k, v in report.items()))
+    if report["top1_agreement"] < args.min_agreement:
+        sys.exit(f"Top-1 agreement {report['top1_agreement']:.4f} is below --min-agreement {args.min_agreement}; not writing the model.")
+
+    output = args.output or default_output(args.model, args.quantize)
+    with open(output, "wb") as f:
+        f.write(content)
+    print(f"Wrote {output} ({len(content) / 2**20:.1f} MiB, quantize={args.quantize}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import re
+
+
+# -----------------------------
+# SQLite FTS5 Query Helpers
+# -----------------------------
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query, prefix_last_only=False):
+    # Every term must match; each is quoted (so FTS5 syntax in user input is
+    # inert) and prefix-matched so partially typed words still hit. With
+    # prefix_last_only only the word being typed is expanded, which is much
+    # cheaper on large indexes.
+    tokens = _TOKEN.findall(query or "")
+    if not tokens:
+        return None
+    if prefix_last_only:
+        return " ".join([f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*'])
+    return " ".join(f'"{token}"*' for token in tokens)
@@ -0,0 +1,57 @@
+# Production serving with gunicorn. From the backend folder:
+#
+#     gunicorn app:app                    (this file is picked up automatically)
+#
+# SERVING_MODE decides how the web workers get at the disease model:
+#   "prefork" (default): the app and the model runtime (TensorFlow or
+#       tflite_runtime) are imported once in the master and shared by the
+#       workers copy-on-write. Each worker builds its own interpreter after
+#       the fork, since runtime thread pools do not survive fork(); a .tflite
+#       model is memory-mapped, so its weights stay in the shared page cache.
+#   "server": the model lives only in inference_server.py, started
+#       separately; workers send it images over INFERENCE_SOCKET and hold no
+#       model or TensorFlow at all. Use this for .h5 models, whose weights
+#       would otherwise be loaded into every worker's private memory.
+import os
+import sys
+
+SERVING_MODE = os.environ.get("SERVING_MODE", "prefork")
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+threads = int(os.environ.get("WORKER_THREADS", "8"))
+timeout = int(os.environ.get("WORKER_TIMEOUT_S", "60"))
+preload_app = True
+
+# Split the cores between the workers' forward passes instead of letting
+# every worker's runtime start one thread per core. Explicit
+# INFERENCE_*_THREADS settings win.
+_cores = os.cpu_count() or 1
+if SERVING_MODE == "server":
+    os.environ.setdefault("INFERENCE_SOCKET", "/tmp/krishisahay-inference.sock")
+else:
+    os.environ.setdefault("INFERENCE_INTRA_OP_THREADS", str(max(1, _cores // workers)))
+    os.environ.setdefault("INFERENCE_INTER_OP_THREADS", "1")
+# "eager" would build the model, and start its threads, in the master
+if os.environ.get("MODEL_WARMUP") == "eager":
+    os.environ["MODEL_WARMUP"] = "background"
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded, before any fork
+    disease = sys.modules.get("blueprints.disease")
+    if SERVING_MODE == "prefork" and disease is not None:
+        from inference import preload_runtime
+        try:
+            preload_runtime(disease.model_path, disease.INFERENCE_BACKEND)
+        except Exception as e:
+            server.log.warning(f"Inference runtime not preloaded: {e}")
+
+
+def post_fork(server, worker):
+    # Pooled database connections are per process
+    from app import app
+    from models import db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,196 @@
+import random
+import threading
+import time
+import urllib.parse
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# -----------------------------
+# Circuit Breaker
+# -----------------------------
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    # closed -> open after `failure_threshold` consecutive failures; after
+    # `reset_timeout` one trial call is let through (half-open) and its
+    # outcome closes or re-opens the circuit.
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+# -----------------------------
+# Per-endpoint Metrics
+# -----------------------------
+class EndpointMetrics:
+    def __init__(self, window=1000):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, error):
+        with self._lock:
+            self.requests += 1
+            if error:
+                self.errors += 1
+            self.latencies.append(seconds * 1000.0)
+
+    def count(self, name):
+        # Increments the `retries` or `short_circuited` counter
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+        def pct(q):
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 2) if latencies else None
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "short_circuited": self.short_circuited,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99)
+        }
+
+
+# -----------------------------
+# Outbound HTTP Client
+# -----------------------------
+class HttpClient:
+    # Shared client for third-party APIs: one keep-alive pool per host,
+    # connect/read timeouts, retries with full-jitter backoff for idempotent
+    # GETs, a circuit breaker per host and latency/error metrics per endpoint.
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+    def __init__(self, timeout=(3.05, 10), retries=2, backoff_base=0.2, backoff_cap=2.0,
+                 pool_maxsize=32, failure_threshold=5, reset_timeout=30.0, headers=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+        self._breakers = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def endpoint_metrics(self, endpoint):
+        with self._lock:
+            metrics = self._metrics.get(endpoint)
+            if metrics is None:
+                metrics = self._metrics[endpoint] = EndpointMetrics()
+            return metrics
+
+    def _sleep_before_retry(self, attempt):
+        time.sleep(random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt))))
+
+    def get(self, url, params=None, timeout=None, endpoint=None, headers=None):
+        # Same call shape as requests.Session.get; returns a Response or
+        # raises requests exceptions / CircuitOpenError.
+        host = urllib.parse.urlsplit(url).netloc
+        endpoint = endpoint or host
+        breaker = self.breaker(host)
+        metrics = self.endpoint_metrics(endpoint)
+        if not breaker.allow():
+            metrics.count("short_circuited")
+            raise CircuitOpenError(f"Upstream {host} is unavailable (circuit open).")
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+                failed = response.status_code in self.RETRY_STATUSES
+                error = None
+            except requests.RequestException as e:
+                response = None
+                failed = True
+                error = e
+            except BaseException:
+                # Never leave a half-open trial in flight
+                metrics.observe(time.perf_counter() - start, True)
+                breaker.record_failure()
+                raise
+            metrics.observe(time.perf_counter() - start, failed)
+            if not failed:
+                breaker.record_success()
+                return response
+            # Only transient failures are retried; e.g. TooManyRedirects or
+            # InvalidURL would fail the same way again
+            retryable = error is None or isinstance(error, self.RETRY_EXCEPTIONS)
+            if attempt >= self.retries or not retryable:
+                breaker.record_failure()
+                if error is not None:
+                    raise error
+                return response
+            attempt += 1
+            metrics.count("retries")
+            self._sleep_before_retry(attempt)
+
+    def metrics(self):
+        with self._lock:
+            endpoints = dict(self._metrics)
+            breakers = dict(self._breakers)
+        return {
+            "endpoints": {name: m.snapshot() for name, m in endpoints.items()},
+            "circuits": {host: b.state for host, b in breakers.items()}
+        }
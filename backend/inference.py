@@ -0,0 +1,272 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+# -----------------------------
+# Micro-batching Inference Engine
+# -----------------------------
+class _PendingRequest:
+    __slots__ = ("inputs", "event", "result", "error")
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BatchInferenceEngine:
+    """Merges concurrent single-image requests into one forward pass.
+
+    A background worker drains a queue of pending requests, waiting at most
+    ``max_wait_ms`` after the first arrival (or until ``max_batch_size`` images
+    are queued), runs ``predict_fn`` once on the stacked batch and hands each
+    row of the output back to the request that submitted it.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=16, max_wait_ms=5):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._batch_buffer = None
+        self._worker = None
+        self._lock = threading.Lock()
+        self._stopped = False
+        self.batches_run = 0
+        self.requests_run = 0
+
+    def start(self):
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="batch-inference", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout=None):
+        with self._lock:
+            self._stopped = True
+            worker = self._worker
+            self._worker = None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join(timeout)
+
+    def submit(self, inputs, timeout=None):
+        # `inputs` is a preprocessed batch of one, shape (1, H, W, C) or (H, W, C)
+        inputs = np.asarray(inputs)
+        if inputs.ndim == 3:
+            inputs = inputs[np.newaxis]
+        self.start()
+        pending = _PendingRequest(inputs)
+        self._queue.put(pending)
+        if not pending.event.wait(timeout):
+            raise TimeoutError("Timed out waiting for batched inference.")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect(self, first):
+        batch = [first]
+        size = len(first.inputs)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown sentinel: finish this batch, then let _run exit
+                self._queue.put(None)
+                break
+            batch.append(item)
+            size += len(item.inputs)
+        return batch
+
+    def _stack(self, batch):
+        if len(batch) == 1:
+            return batch[0].inputs
+        first = batch[0].inputs
+        size = sum(len(p.inputs) for p in batch)
+        buf = self._batch_buffer
+        if buf is None or buf.shape[1:] != first.shape[1:] or buf.dtype != first.dtype:
+            buf = np.empty((self.max_batch_size,) + first.shape[1:], dtype=first.dtype)
+            self._batch_buffer = buf
+        if size > len(buf):
+            return np.concatenate([p.inputs for p in batch], axis=0)
+        # Copy into the preallocated batch buffer; it is only reused once
+        # predict_fn has returned for the previous batch.
+        return np.concatenate([p.inputs for p in batch], axis=0, out=buf[:size])
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                if self._stopped:
+                    return
+                continue
+            batch = self._collect(first)
+            try:
+                stacked = self._stack(batch)
+                outputs = np.asarray(self.predict_fn(stacked))
+                offset = 0
+                for pending in batch:
+                    n = len(pending.inputs)
+                    pending.result = outputs[offset:offset + n]
+                    offset += n
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+            self.batches_run += 1
+            self.requests_run += len(batch)
+            for pending in batch:
+                # Drop the input reference so the caller may release or
+                # reuse its buffer (e.g. shared memory) once it has the result
+                pending.inputs = None
+                pending.event.set()
+
+
+# -----------------------------
+# Model Backends
+# -----------------------------
+# Each backend exposes predict(batch) -> (N, num_classes) probabilities for
+# a float32 (N, H, W, 3) batch. TensorFlow is imported only by the backend
+# that needs it, so a TFLite deployment can run on tflite_runtime alone.
+class KerasBackend:
+    name = "keras"
+
+    def __init__(self, model_path, intra_op_threads=None, inter_op_threads=None):
+        import tensorflow as tf
+        # Only takes effect before TensorFlow runs its first op in this process
+        try:
+            if intra_op_threads:
+                tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+            if inter_op_threads:
+                tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+        except RuntimeError as e:
+            print(f"TensorFlow thread settings ignored: {e}")
+        self.model = tf.keras.models.load_model(model_path)
+
+    def predict(self, batch):
+        # Calling the model directly skips Model.predict's per-call
+        # tf.data/callback setup, which dominates for a handful of images
+        return np.asarray(self.model(batch, training=False))
+
+
+def _tflite_interpreter_class():
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class _TFLiteSlot:
+    # One interpreter allocated for a fixed batch size, with a reusable
+    # input buffer for zero-padding smaller batches up to that size
+    def __init__(self, interpreter, batch_size):
+        self.interpreter = interpreter
+        self.batch_size = batch_size
+        shape = list(interpreter.get_input_details()[0]["shape"][1:])
+        interpreter.resize_tensor_input(interpreter.get_input_details()[0]["index"], [batch_size] + shape)
+        interpreter.allocate_tensors()
+        self.input = interpreter.get_input_details()[0]
+        self.output = interpreter.get_output_details()[0]
+        self.padded = np.zeros([batch_size] + shape, dtype=np.float32)
+        # One interpreter: invocations must not overlap
+        self.lock = threading.Lock()
+
+
+class TFLiteBackend:
+    # Resizing the input and reallocating tensors on every new batch size
+    # costs more than a small forward pass, so batches are zero-padded to a
+    # power-of-two bucket up to max_batch_size. Each bucket gets its own
+    # interpreter, allocated on first use and kept; the weights are shared
+    # through the mmapped model file or model_content.
+    name = "tflite"
+
+    def __init__(self, model_path=None, model_content=None, num_threads=None, max_batch_size=16):
+        self._interpreter_class = _tflite_interpreter_class()
+        self._interpreter_args = {"model_path": model_path, "model_content": model_content, "num_threads": num_threads}
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.buckets = []
+        size = 1
+        while size < self.max_batch_size:
+            self.buckets.append(size)
+            size *= 2
+        self.buckets.append(self.max_batch_size)
+        self._slots = {}
+        self._slots_lock = threading.Lock()
+        # Fails here, at load time, for a missing or invalid model
+        self._slot(1)
+
+    def _slot(self, bucket):
+        with self._slots_lock:
+            slot = self._slots.get(bucket)
+            if slot is None:
+                slot = _TFLiteSlot(self._interpreter_class(**self._interpreter_args), bucket)
+                self._slots[bucket] = slot
+            return slot
+
+    def predict(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        n = len(batch)
+        if n > self.max_batch_size:
+            step = self.max_batch_size
+            return np.concatenate([self.predict(batch[i:i + step]) for i in range(0, n, step)], axis=0)
+        slot = self._slot(next(b for b in self.buckets if b >= n))
+        with slot.lock:
+            if n < slot.batch_size:
+                slot.padded[:n] = batch
+                slot.padded[n:] = 0.0
+                batch = slot.padded
+            dtype = slot.input["dtype"]
+            if dtype != np.float32:
+                # Models exported with integer inputs take quantized pixels
+                scale, zero_point = slot.input["quantization"]
+                batch = np.clip(np.round(batch / scale + zero_point), np.iinfo(dtype).min, np.iinfo(dtype).max).astype(dtype)
+            slot.interpreter.set_tensor(slot.input["index"], batch)
+            slot.interpreter.invoke()
+            output = slot.interpreter.get_tensor(slot.output["index"])[:n]
+            if output.dtype != np.float32:
+                scale, zero_point = slot.output["quantization"]
+                return (output.astype(np.float32) - zero_point) * scale
+            return output.copy()
+
+
+MODEL_BACKENDS = {"keras": KerasBackend, "tflite": TFLiteBackend}
+
+
+def _backend_name(model_path, backend):
+    # The backend follows the file type unless named explicitly
+    if backend is None:
+        backend = "tflite" if model_path.endswith(".tflite") else "keras"
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}; expected one of: {', '.join(MODEL_BACKENDS)}.")
+    return backend
+
+
+def load_backend(model_path, backend=None, intra_op_threads=None, inter_op_threads=None, max_batch_size=16):
+    # intra_op_threads is the thread count of one forward pass (TFLite's
+    # num_threads); inter_op_threads only applies to TensorFlow graphs.
+    # max_batch_size sizes TFLite's largest preallocated batch bucket.
+    if _backend_name(model_path, backend) == "tflite":
+        return TFLiteBackend(model_path, num_threads=intra_op_threads, max_batch_size=max_batch_size)
+    return KerasBackend(model_path, intra_op_threads=intra_op_threads, inter_op_threads=inter_op_threads)
+
+
+def preload_runtime(model_path, backend=None):
+    # Imports the backend's runtime without building a model, for a
+    # pre-fork server master: workers then share the imported code and
+    # Python heap copy-on-write. Nothing here may start threads, which do
+    # not survive fork(), so models are still built after the fork.
+    if _backend_name(model_path, backend) == "tflite":
+        _tflite_interpreter_class()
+    else:
+        import tensorflow  # noqa: F401
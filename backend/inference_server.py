@@ -0,0 +1,215 @@
+"""Dedicated inference process shared by all web workers over a Unix socket.
+
+    python inference_server.py --socket /tmp/krishisahay-inference.sock --model model.tflite
+
+Start it once per host, then run the web workers with
+INFERENCE_SOCKET=/tmp/krishisahay-inference.sock so each one uses
+RemoteModel instead of loading its own copy of the model and runtime.
+
+Each client connection owns a shared-memory input buffer. The client writes
+its preprocessed batch into the buffer and sends only the batch shape over
+the socket; the server runs the model directly on a view of that buffer,
+so image tensors are never serialized. Requests from all workers are
+merged by one BatchInferenceEngine.
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from inference import BatchInferenceEngine, load_backend
+from preprocessing import TTA_VIEWS
+
+_HANDSHAKE = struct.Struct("!I")
+_REQUEST = struct.Struct("!IIII")
+_RESPONSE = struct.Struct("!II")
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+def _recv_exact(sock, size):
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Inference socket closed.")
+        received += n
+    return bytes(buf)
+
+
+def _attach_shared_memory(name, owner_pid):
+    # The client owns the segment; keep this process's resource tracker
+    # from unlinking it on exit (unless the client is this process).
+    shm = shared_memory.SharedMemory(name=name)
+    if owner_pid != os.getpid():
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+# -----------------------------
+# Server
+# -----------------------------
+class _ClientHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        sock = self.request
+        try:
+            size, = _HANDSHAKE.unpack(_recv_exact(sock, _HANDSHAKE.size))
+            hello = json.loads(_recv_exact(sock, size))
+            shm = _attach_shared_memory(hello["shm"], hello.get("pid"))
+        except (ConnectionError, ValueError, KeyError, OSError):
+            return
+        try:
+            while True:
+                try:
+                    n, h, w, c = _REQUEST.unpack(_recv_exact(sock, _REQUEST.size))
+                except ConnectionError:
+                    return
+                try:
+                    if n * h * w * c * 4 > shm.size:
+                        raise ValueError(f"Batch of {n}x{h}x{w}x{c} does not fit the {shm.size}-byte input buffer.")
+                    inputs = np.ndarray((n, h, w, c), dtype=np.float32, buffer=shm.buf)
+                    outputs = np.ascontiguousarray(self.server.engine.submit(inputs, timeout=self.server.timeout_s), dtype=np.float32)
+                    payload = outputs.tobytes()
+                    del inputs
+                    sock.sendall(_RESPONSE.pack(STATUS_OK, len(payload)) + payload)
+                except Exception as e:
+                    message = str(e).encode("utf-8")
+                    sock.sendall(_RESPONSE.pack(STATUS_ERROR, len(message)) + message)
+        finally:
+            try:
+                shm.close()
+            except BufferError:
+                pass
+
+
+class InferenceServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, model, max_batch_size=16, max_wait_ms=5, timeout_s=30):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.model = model
+        self.engine = BatchInferenceEngine(model.predict, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self.timeout_s = timeout_s
+        super().__init__(socket_path, _ClientHandler)
+        os.chmod(socket_path, 0o660)
+
+    def server_close(self):
+        super().server_close()
+        self.engine.stop(timeout=1)
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+# -----------------------------
+# Client
+# -----------------------------
+class RemoteModel:
+    """Model backend interface (predict(batch) -> probabilities) backed by an
+    InferenceServer. One connection and input buffer per instance; calls are
+    serialized, so callers batch with their own BatchInferenceEngine."""
+
+    name = "remote"
+
+    def __init__(self, socket_path, max_batch_size=16, input_shape=(224, 224, 3), connect_timeout_s=5):
+        self.socket_path = socket_path
+        # Room for at least one request's full set of test-time augmentation
+        # views, so a TTA batch is never split
+        self._capacity = int(max(max_batch_size, len(TTA_VIEWS)) * np.prod(input_shape) * 4)
+        self._lock = threading.Lock()
+        self._sock = None
+        self._shm = None
+        self._connect_timeout_s = connect_timeout_s
+
+    def _connect(self):
+        shm = shared_memory.SharedMemory(create=True, size=self._capacity)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self._connect_timeout_s)
+            sock.connect(self.socket_path)
+            sock.settimeout(None)
+            hello = json.dumps({"shm": shm.name, "pid": os.getpid()}).encode("utf-8")
+            sock.sendall(_HANDSHAKE.pack(len(hello)) + hello)
+        except Exception:
+            sock.close()
+            shm.close()
+            shm.unlink()
+            raise
+        self._sock, self._shm = sock, shm
+
+    def predict(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        if batch.nbytes > self._capacity:
+            if len(batch) <= 1:
+                raise ValueError(f"Input of shape {batch.shape} does not fit the {self._capacity}-byte input buffer.")
+            # Larger than the shared buffer: split rather than reallocate
+            half = len(batch) // 2
+            return np.concatenate([self.predict(batch[:half]), self.predict(batch[half:])], axis=0)
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                np.copyto(np.ndarray(batch.shape, dtype=np.float32, buffer=self._shm.buf), batch)
+                self._sock.sendall(_REQUEST.pack(*batch.shape))
+                status, size = _RESPONSE.unpack(_recv_exact(self._sock, _RESPONSE.size))
+                payload = _recv_exact(self._sock, size)
+            except (ConnectionError, OSError):
+                # Reconnect on the next call, e.g. after a server restart
+                self._close_locked()
+                raise
+        if status != STATUS_OK:
+            raise RuntimeError(f"Inference server error: {payload.decode('utf-8', 'replace')}")
+        return np.frombuffer(payload, dtype=np.float32).reshape(len(batch), -1)
+
+    def _close_locked(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default=os.environ.get("INFERENCE_SOCKET", "/tmp/krishisahay-inference.sock"))
+    parser.add_argument("--model", default=os.environ.get("DISEASE_MODEL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "plant_disease_prediction_model.h5")))
+    parser.add_argument("--backend", default=os.environ.get("INFERENCE_BACKEND") or None, help="keras or tflite (default: by file type)")
+    parser.add_argument("--intra-op-threads", type=int, default=int(os.environ.get("INFERENCE_INTRA_OP_THREADS", "0")) or None)
+    parser.add_argument("--inter-op-threads", type=int, default=int(os.environ.get("INFERENCE_INTER_OP_THREADS", "0")) or None)
+    parser.add_argument("--max-batch-size", type=int, default=int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", "16")))
+    parser.add_argument("--max-wait-ms", type=float, default=float(os.environ.get("INFERENCE_MAX_WAIT_MS", "5")))
+    args = parser.parse_args()
+
+    model = load_backend(args.model, args.backend, intra_op_threads=args.intra_op_threads, inter_op_threads=args.inter_op_threads,
+                         max_batch_size=args.max_batch_size)
+    server = InferenceServer(args.socket, model, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    print(f"Serving {model.name} model {args.model} on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import threading
+import time
+
+
+# -----------------------------
+# Lazily Built Subsystems
+# -----------------------------
+class Lazy:
+    """A value built by ``factory`` on first use, once, from any thread.
+
+    Heavy imports (TensorFlow, google.generativeai, speech_recognition) go
+    inside the factory, so a worker that never needs them never pays for
+    them. ``warm_up()`` builds the value on a background thread instead of
+    the first request that needs it. A failed build is retried on the next
+    use and reported by ``status()`` meanwhile.
+    """
+
+    def __init__(self, factory, name=None):
+        self.factory = factory
+        self.name = name or getattr(factory, "__name__", "lazy")
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._warm_thread = None
+        self._warm_lock = threading.Lock()
+        self.error = None
+        self.load_seconds = None
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                try:
+                    self._value = self.factory()
+                except Exception as e:
+                    self.error = e
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                self.error = None
+                self._loaded = True
+        return self._value
+
+    def _warm(self):
+        try:
+            self.get()
+        except Exception as e:
+            print(f"Warm-up of {self.name} failed: {e}")
+            # Let the next warm_up() start a fresh attempt
+            with self._warm_lock:
+                self._warm_thread = None
+
+    def warm_up(self):
+        # Idempotent; returns immediately
+        if self._loaded or self._warm_thread is not None:
+            return
+        with self._warm_lock:
+            if self._warm_thread is None:
+                self._warm_thread = threading.Thread(target=self._warm, name=f"warm-{self.name}", daemon=True)
+                self._warm_thread.start()
+
+    def status(self):
+        if self._loaded:
+            return "ready"
+        if self.error is not None:
+            return "error"
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            return "loading"
+        return "not_loaded"
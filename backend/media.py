@@ -0,0 +1,181 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from flask import send_file, url_for
+from PIL import Image, ImageOps
+
+
+# -----------------------------
+# Content-addressed Photo Store
+# -----------------------------
+# Photos are stored once per SHA-256 of their bytes under
+# <root>/<hash[:2]>/<hash>/original, with WebP renditions next to them.
+# Paths never depend on client filenames, and a URL's content never changes,
+# so responses are cacheable forever.
+PHOTO_SIZES = {"thumb": 320, "large": 1280}
+_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+
+class InvalidImageError(ValueError):
+    pass
+
+
+def is_content_hash(value):
+    return bool(value) and bool(_HASH.match(value))
+
+
+def photo_urls(photo):
+    # (list-view URL, {size: URL}) for a stored photo hash. Legacy rows that
+    # hold a server file path get no URL rather than leaking the path.
+    if not is_content_hash(photo):
+        return None, None
+    urls = {size: url_for("marketplace.media_endpoint", content_hash=photo, size=size, _external=True)
+            for size in list(PHOTO_SIZES) + ["original"]}
+    return urls["thumb"], urls
+
+
+class MediaStore:
+    def __init__(self, root, sizes=None, max_workers=2, max_bytes=15 * 1024 * 1024, quality=80):
+        self.root = root
+        self.sizes = dict(PHOTO_SIZES if sizes is None else sizes)
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnails")
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.renditions_made = 0
+
+    def _dir(self, content_hash):
+        return os.path.join(self.root, content_hash[:2], content_hash)
+
+    def path_for(self, content_hash, size):
+        name = "original" if size == "original" else f"{size}.webp"
+        return os.path.join(self._dir(content_hash), name)
+
+    @staticmethod
+    def _write_atomic(path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def save(self, stream):
+        # Stores an uploaded image and queues its renditions; returns the hash.
+        # Raises InvalidImageError for oversized or undecodable uploads.
+        data = stream.read(self.max_bytes + 1)
+        if len(data) > self.max_bytes:
+            raise InvalidImageError(f"Photo is larger than {self.max_bytes // (1024 * 1024)} MB.")
+        try:
+            with Image.open(BytesIO(data)) as img:
+                img.verify()
+            # verify() only checks the headers; decode the pixels (at reduced
+            # scale for JPEG) so truncated or corrupt files are caught here
+            # rather than when a rendition is made
+            with Image.open(BytesIO(data)) as img:
+                img.draft("RGB", (min(self.sizes.values(), default=320),) * 2)
+                img.load()
+        except Exception:
+            raise InvalidImageError("Photo is not a valid image.")
+        content_hash = hashlib.sha256(data).hexdigest()
+        original = self.path_for(content_hash, "original")
+        if not os.path.exists(original):
+            self._write_atomic(original, data)
+        for size in self.sizes:
+            self._schedule(content_hash, size)
+        return content_hash
+
+    def _schedule(self, content_hash, size):
+        key = (content_hash, size)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                if os.path.exists(self.path_for(content_hash, size)):
+                    return None
+                future = self._pending[key] = self.executor.submit(self._render, content_hash, size)
+            return future
+
+    def _render(self, content_hash, size):
+        try:
+            edge = self.sizes[size]
+            with Image.open(self.path_for(content_hash, "original")) as img:
+                # JPEGs decode straight at a reduced scale >= the target size
+                img.draft("RGB", (edge, edge))
+                img = ImageOps.exif_transpose(img)
+                if img.mode not in ("RGB", "RGBA"):
+                    img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+                img.thumbnail((edge, edge), Image.LANCZOS)
+                out = BytesIO()
+                img.save(out, "WEBP", quality=self.quality, method=4)
+            self._write_atomic(self.path_for(content_hash, size), out.getvalue())
+            self.renditions_made += 1
+        finally:
+            with self._lock:
+                self._pending.pop((content_hash, size), None)
+
+    def ensure(self, content_hash, size):
+        # Path to a rendition, rendering it now if the worker hasn't yet.
+        # None if the photo or size is unknown; InvalidImageError if the
+        # stored original can't be rendered.
+        if not is_content_hash(content_hash) or (size != "original" and size not in self.sizes):
+            return None
+        path = self.path_for(content_hash, size)
+        if os.path.exists(path):
+            return path
+        if size == "original" or not os.path.exists(self.path_for(content_hash, "original")):
+            return None
+        future = self._schedule(content_hash, size)
+        if future is not None:
+            try:
+                future.result()
+            except Exception as e:
+                raise InvalidImageError(f"Photo could not be rendered: {e}")
+        return path
+
+    def send(self, content_hash, size):
+        # Response for /media/<hash>/<size>, or None for 404; raises
+        # InvalidImageError like ensure(). send_file hands
+        # the open file to the server (sendfile() under gunicorn) and answers
+        # If-None-Match / Range itself.
+        path = self.ensure(content_hash, size)
+        if path is None:
+            return None
+        mimetype = "image/webp" if size != "original" else _sniff_mimetype(path)
+        response = send_file(path, mimetype=mimetype, conditional=True, etag=f"{content_hash}-{size}", max_age=365 * 24 * 3600)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {"renditions_made": self.renditions_made, "pending": pending}
+
+
+_SIGNATURES = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG", "image/png"),
+    (b"GIF8", "image/gif"),
+]
+
+
+def _sniff_mimetype(path):
+    with open(path, "rb") as f:
+        head = f.read(12)
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mimetype in _SIGNATURES:
+        if head.startswith(signature):
+            return mimetype
+    return "application/octet-stream"
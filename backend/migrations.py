@@ -0,0 +1,197 @@
+import time
+
+import sqlalchemy as sa
+
+from models import db
+
+
+# -----------------------------
+# Versioned Schema Migrations
+# -----------------------------
+# Migrations run once each, in version order, and are recorded in the
+# schema_version table. Never edit one that has shipped: append a new one.
+# They only use frozen table definitions and raw DDL, not the current
+# models, so replaying old versions creates exactly the old schema.
+#
+# SQLite's driver commits DDL as it goes, so every step is also written to
+# be idempotent (IF NOT EXISTS, checkfirst, column checks): a migration
+# interrupted halfway is simply re-run. Databases created before versioning
+# (by create_all) are adopted the same way.
+MIGRATIONS = []
+
+_schema_version = sa.Table(
+    "schema_version", sa.MetaData(),
+    sa.Column("version", sa.Integer, primary_key=True),
+    sa.Column("description", sa.String(255), nullable=False),
+    sa.Column("applied_at", sa.Float, nullable=False)
+)
+
+
+def migration(version, description):
+    def register(fn):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} is out of order.")
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return register
+
+
+def _add_column(conn, table, name, column_type):
+    existing = {column["name"] for column in sa.inspect(conn).get_columns(table)}
+    if name not in existing:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+
+@migration(1, "user and rental tables")
+def _initial_tables(conn):
+    metadata = sa.MetaData()
+    sa.Table(
+        "user", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("username", sa.String(80), unique=True, nullable=False),
+        sa.Column("password_hash", sa.String(128), nullable=False)
+    )
+    sa.Table(
+        "rental", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text, nullable=False),
+        sa.Column("price", sa.Float, nullable=False),
+        sa.Column("contact", sa.String(100), nullable=False),
+        sa.Column("equipment_type", sa.String(100), nullable=False),
+        sa.Column("rental_duration", sa.String(100), nullable=False),
+        sa.Column("location", sa.String(255), nullable=False),
+        sa.Column("posted_by", sa.String(80), nullable=False),
+        sa.Column("photo", sa.String(255), nullable=True)
+    )
+    metadata.create_all(conn, checkfirst=True)
+
+
+@migration(2, "user locations and alert outbox")
+def _alert_tables(conn):
+    metadata = sa.MetaData()
+    sa.Table("user", metadata, sa.Column("id", sa.Integer, primary_key=True))
+    sa.Table(
+        "user_location", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("user.id"), unique=True, nullable=False),
+        sa.Column("lat", sa.Float, nullable=False),
+        sa.Column("lon", sa.Float, nullable=False),
+        sa.Column("tile", sa.String(12), nullable=False, index=True),
+        sa.Column("updated_at", sa.Float, nullable=False)
+    )
+    sa.Table(
+        "alert_outbox", metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("user.id"), nullable=False, index=True),
+        sa.Column("tile", sa.String(12), nullable=False),
+        sa.Column("condition", sa.String(100), nullable=False),
+        sa.Column("event_time", sa.String(40), nullable=False),
+        sa.Column("dedupe_key", sa.String(255), unique=True, nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, index=True),
+        sa.Column("created_at", sa.Float, nullable=False),
+        sa.Column("sent_at", sa.Float, nullable=True)
+    )
+    metadata.create_all(conn, tables=[metadata.tables["user_location"], metadata.tables["alert_outbox"]], checkfirst=True)
+
+
+@migration(3, "rental keyset pagination indexes")
+def _rental_list_indexes(conn):
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS ix_rental_price_id ON rental (price, id)",
+        "CREATE INDEX IF NOT EXISTS ix_rental_type_id ON rental (lower(equipment_type), id)",
+        "CREATE INDEX IF NOT EXISTS ix_rental_type_price_id ON rental (lower(equipment_type), price, id)",
+        "CREATE INDEX IF NOT EXISTS ix_rental_location ON rental (lower(location))",
+    ):
+        conn.exec_driver_sql(statement)
+
+
+@migration(4, "rental coordinates")
+def _rental_coordinates(conn):
+    _add_column(conn, "rental", "lat", "FLOAT")
+    _add_column(conn, "rental", "lon", "FLOAT")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_rental_lat_lon ON rental (lat, lon)")
+
+
+# Fine (0.25 degree) and coarse (2 degree) grid cell of a row's location,
+# e.g. "q441x1015 w55x126"; rental_search builds query cells the same way
+_RENTAL_GEO_TOKENS = (
+    "CASE WHEN {row}.lat IS NULL OR {row}.lon IS NULL THEN '' ELSE"
+    " 'q' || CAST(({row}.lat + 90) / 0.25 AS INTEGER) || 'x' || CAST(({row}.lon + 180) / 0.25 AS INTEGER)"
+    " || ' ' || 'w' || CAST(({row}.lat + 90) / 2.0 AS INTEGER) || 'x' || CAST(({row}.lon + 180) / 2.0 AS INTEGER) END"
+)
+_RENTAL_FTS_COLUMNS = "title, description, equipment_type, geo"
+
+
+@migration(5, "rental full-text and spatial search index")
+def _rental_search_index(conn):
+    # SQLite only: other engines search with LIKE and the (lat, lon) index
+    if conn.dialect.name != "sqlite":
+        return
+    existing = {row[0] for row in conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE name IN ('rental_fts', 'rental_geo')"
+    )}
+    old, new = _RENTAL_GEO_TOKENS.format(row="old"), _RENTAL_GEO_TOKENS.format(row="new")
+    for statement in (
+        "CREATE VIEW IF NOT EXISTS rental_search_source AS"
+        f" SELECT id, title, description, equipment_type, {_RENTAL_GEO_TOKENS.format(row='rental')} AS geo FROM rental",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS rental_fts USING fts5("
+        f" {_RENTAL_FTS_COLUMNS}, content='rental_search_source', content_rowid='id',"
+        " tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS rental_fts_ai AFTER INSERT ON rental BEGIN"
+        f" INSERT INTO rental_fts (rowid, {_RENTAL_FTS_COLUMNS})"
+        f" VALUES (new.id, new.title, new.description, new.equipment_type, {new}); END",
+        "CREATE TRIGGER IF NOT EXISTS rental_fts_ad AFTER DELETE ON rental BEGIN"
+        f" INSERT INTO rental_fts (rental_fts, rowid, {_RENTAL_FTS_COLUMNS})"
+        f" VALUES ('delete', old.id, old.title, old.description, old.equipment_type, {old}); END",
+        "CREATE TRIGGER IF NOT EXISTS rental_fts_au AFTER UPDATE OF title, description, equipment_type, lat, lon ON rental BEGIN"
+        f" INSERT INTO rental_fts (rental_fts, rowid, {_RENTAL_FTS_COLUMNS})"
+        f" VALUES ('delete', old.id, old.title, old.description, old.equipment_type, {old});"
+        f" INSERT INTO rental_fts (rowid, {_RENTAL_FTS_COLUMNS})"
+        f" VALUES (new.id, new.title, new.description, new.equipment_type, {new}); END",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS rental_geo USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+        "CREATE TRIGGER IF NOT EXISTS rental_geo_ai AFTER INSERT ON rental"
+        " WHEN new.lat IS NOT NULL AND new.lon IS NOT NULL BEGIN"
+        " INSERT INTO rental_geo VALUES (new.id, new.lat, new.lat, new.lon, new.lon); END",
+        "CREATE TRIGGER IF NOT EXISTS rental_geo_ad AFTER DELETE ON rental BEGIN"
+        " DELETE FROM rental_geo WHERE id = old.id; END",
+        "CREATE TRIGGER IF NOT EXISTS rental_geo_au AFTER UPDATE OF lat, lon ON rental BEGIN"
+        " DELETE FROM rental_geo WHERE id = old.id;"
+        " INSERT INTO rental_geo SELECT new.id, new.lat, new.lat, new.lon, new.lon"
+        " WHERE new.lat IS NOT NULL AND new.lon IS NOT NULL; END",
+    ):
+        conn.exec_driver_sql(statement)
+    # Index rows stored before the search tables existed
+    if "rental_fts" not in existing:
+        conn.exec_driver_sql("INSERT INTO rental_fts (rental_fts) VALUES ('rebuild')")
+    if "rental_geo" not in existing:
+        conn.exec_driver_sql(
+            "INSERT INTO rental_geo SELECT id, lat, lat, lon, lon FROM rental WHERE lat IS NOT NULL AND lon IS NOT NULL"
+        )
+
+
+@migration(6, "alert outbox delivery retries")
+def _alert_outbox_retries(conn):
+    _add_column(conn, "alert_outbox", "attempts", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(conn, "alert_outbox", "next_attempt_at", "FLOAT")
+
+
+def current_version(conn):
+    _schema_version.create(conn, checkfirst=True)
+    return conn.execute(sa.select(sa.func.max(_schema_version.c.version))).scalar() or 0
+
+
+def migrate(target=None):
+    # Applies pending migrations up to `target` (default: latest), each in
+    # its own transaction. Returns [(version, description)] applied.
+    with db.engine.begin() as conn:
+        version = current_version(conn)
+    applied = []
+    for number, description, fn in MIGRATIONS:
+        if number <= version or (target is not None and number > target):
+            continue
+        with db.engine.begin() as conn:
+            fn(conn)
+            conn.execute(_schema_version.insert().values(version=number, description=description, applied_at=time.time()))
+        applied.append((number, description))
+    return applied
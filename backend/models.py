@@ -0,0 +1,116 @@
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+db = SQLAlchemy()
+
+
+# -----------------------------
+# Database Models
+# -----------------------------
+# Schema changes ship as versioned migrations (migrations.py); keep these
+# definitions in sync with them.
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    password_hash = db.Column(db.String(128), nullable=False)
+
+class UserLocation(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), unique=True, nullable=False)
+    lat = db.Column(db.Float, nullable=False)
+    lon = db.Column(db.Float, nullable=False)
+    tile = db.Column(db.String(12), nullable=False, index=True)  # geohash used by the forecast cache
+    updated_at = db.Column(db.Float, nullable=False)
+
+class AlertOutbox(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    tile = db.Column(db.String(12), nullable=False)
+    condition = db.Column(db.String(100), nullable=False)
+    event_time = db.Column(db.String(40), nullable=False)
+    dedupe_key = db.Column(db.String(255), unique=True, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="pending", index=True)
+    created_at = db.Column(db.Float, nullable=False)
+    sent_at = db.Column(db.Float, nullable=True)
+    # Failed deliveries stay pending until next_attempt_at, with backoff
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.Float, nullable=True)
+
+class Rental(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(255), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    price = db.Column(db.Float, nullable=False)
+    contact = db.Column(db.String(100), nullable=False)  # required phone number
+    equipment_type = db.Column(db.String(100), nullable=False)
+    rental_duration = db.Column(db.String(100), nullable=False)
+    location = db.Column(db.String(255), nullable=False)
+    posted_by = db.Column(db.String(80), nullable=False)
+    photo = db.Column(db.String(255), nullable=True)  # optional photo field
+    lat = db.Column(db.Float, nullable=True)  # geocoded from location (or sent by the app)
+    lon = db.Column(db.Float, nullable=True)
+
+    # Keyset pagination for /rentals: newest first is id order; price sorts
+    # seek on (price, id); type/location filters are case-insensitive.
+    __table_args__ = (
+        db.Index('ix_rental_price_id', 'price', 'id'),
+        db.Index('ix_rental_type_id', db.func.lower(equipment_type), 'id'),
+        db.Index('ix_rental_type_price_id', db.func.lower(equipment_type), 'price', 'id'),
+        db.Index('ix_rental_location', db.func.lower(location)),
+        # Bounding-box prefilter for distance search on engines without R-tree
+        db.Index('ix_rental_lat_lon', 'lat', 'lon'),
+    )
+
+
+
+# -----------------------------
+# Engine Configuration
+# -----------------------------
+def normalize_database_uri(uri):
+    # Hosted PostgreSQL often hands out postgres://, which SQLAlchemy rejects
+    if uri.startswith("postgres://"):
+        uri = "postgresql://" + uri[len("postgres://"):]
+    return uri
+
+
+def engine_options(uri, pool_size=5, max_overflow=10, pool_timeout=10, pool_recycle=1800):
+    # Each gunicorn worker gets its own pool, so workers * (pool_size +
+    # max_overflow) must stay below the server's max_connections. A short
+    # pool_timeout turns pool exhaustion into a fast error instead of a hang.
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return {}
+        return {"pool_size": pool_size, "max_overflow": max_overflow, "pool_timeout": pool_timeout}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,  # below typical server/proxy idle timeouts
+        "pool_pre_ping": True
+    }
+
+
+def _sqlite_pragmas(busy_timeout_ms):
+    # WAL lets readers run alongside the single writer, busy_timeout makes a
+    # second writer wait for the lock instead of failing with "database is
+    # locked", and synchronous=NORMAL skips the fsync per commit (still
+    # durable against application crashes, safe against corruption in WAL).
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+    return on_connect
+
+
+def configure_database(app, uri, busy_timeout_ms=5000, **pool_options):
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri = normalize_database_uri(uri)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(uri, **pool_options)
+    db.init_app(app)
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _sqlite_pragmas(busy_timeout_ms))
@@ -0,0 +1,23 @@
+import base64
+import json
+
+
+# -----------------------------
+# Keyset Pagination Cursors
+# -----------------------------
+# A cursor is a JSON list as URL-safe base64: the sort (or query) it was
+# issued for, then the sort key of the last row on the page, e.g.
+# ["price_asc", price, id]. Callers check the tag and key types; malformed
+# cursors decode to None.
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) and values else None
@@ -0,0 +1,266 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from cache import ResponseCache, SingleFlight
+from weather import geohash_encode
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+# -----------------------------
+# GoMaps Places Client
+# -----------------------------
+class PlacesAPIError(RuntimeError):
+    def __init__(self, status, details=None):
+        super().__init__(f"GoMaps Places API error: {status}")
+        self.status = status
+        self.details = details or "No additional details provided"
+
+
+class GoMapsClient:
+    # `client` is an http_client.HttpClient; base_url is the API root that
+    # holds place/ and geocode/
+    def __init__(self, client, api_key, base_url="https://maps.gomaps.pro/maps/api"):
+        self.client = client
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+
+    def _get(self, path, params, endpoint):
+        params = dict(params, key=self.api_key)
+        r = self.client.get(f"{self.base_url}/{path}", params=params, endpoint=endpoint)
+        r.raise_for_status()
+        data = r.json()
+        if data.get("status") not in ("OK", "ZERO_RESULTS"):
+            raise PlacesAPIError(data.get("status"), data.get("error_message"))
+        return data
+
+    def text_search(self, lat, lon, store_type=None, radius=50000):
+        query = f"{store_type} near me" if store_type else "agriculture supply store near me"
+        data = self._get("place/textsearch/json", {"query": query, "location": f"{lat},{lon}", "radius": radius}, "gomaps.textsearch")
+        stores = []
+        for result in data.get("results", []):
+            location = result.get("geometry", {}).get("location", {})
+            stores.append({
+                "name": result.get("name"),
+                "address": result.get("formatted_address"),
+                "lat": location.get("lat"),
+                "lon": location.get("lng"),
+                "place_id": result.get("place_id")
+            })
+        return stores
+
+    def details(self, place_id, fields=None):
+        params = {"place_id": place_id}
+        if fields:
+            params["fields"] = ",".join(fields)
+        data = self._get("place/details/json", params, "gomaps.details")
+        if "result" not in data:
+            raise PlacesAPIError(data.get("status"), data.get("error_message"))
+        return data
+
+    def geocode(self, address, region="in"):
+        # (lat, lon) of the best match, or None
+        data = self._get("geocode/json", {"address": address, "region": region}, "gomaps.geocode")
+        results = data.get("results", [])
+        if not results:
+            return None
+        location = results[0].get("geometry", {}).get("location", {})
+        return location.get("lat"), location.get("lng")
+
+
+# -----------------------------
+# Place Details Cache
+# -----------------------------
+# What the store details sheet shows; reviews, photos, address components
+# etc. make up most of a raw details payload and are dropped.
+PLACE_DETAIL_FIELDS = (
+    "place_id", "name", "formatted_address", "formatted_phone_number", "website",
+    "opening_hours", "geometry", "rating", "user_ratings_total", "business_status"
+)
+
+
+def slim_place_details(result):
+    slim = {field: result[field] for field in PLACE_DETAIL_FIELDS if field in result}
+    if "opening_hours" in slim:
+        slim["opening_hours"] = {k: v for k, v in slim["opening_hours"].items() if k in ("open_now", "weekday_text")}
+    if "geometry" in slim:
+        slim["geometry"] = {"location": slim["geometry"].get("location")}
+    return slim
+
+
+class PlaceDetailsCache:
+    # Slim place details by place_id with a long TTL. prefetch() warms the
+    # cache for store search results on a small bounded pool, so opening a
+    # store is usually a hit.
+    def __init__(self, fetch_fn, ttl=7 * 24 * 3600, max_entries=5000, db_path=None, prefetch_workers=4, max_pending=256):
+        self.fetch_fn = fetch_fn
+        self.cache = ResponseCache(ttl, max_entries=max_entries, db_path=db_path, table="place_details")
+        self.executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="place-prefetch")
+        self.max_pending = max_pending
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.prefetched = 0
+        self.prefetch_skipped = 0
+
+    def get(self, place_id):
+        return self.cache.get_or_compute(
+            ResponseCache.key(place_id),
+            lambda: slim_place_details(self.fetch_fn(place_id)["result"])
+        )
+
+    def _prefetch_one(self, place_id):
+        try:
+            self.get(place_id)
+            self.prefetched += 1
+        except Exception as e:
+            print(f"Place details prefetch failed for {place_id}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(place_id)
+
+    def prefetch(self, place_ids):
+        for place_id in place_ids:
+            if not place_id or self.cache.get(ResponseCache.key(place_id)) is not None:
+                continue
+            with self._lock:
+                if place_id in self._pending:
+                    continue
+                if len(self._pending) >= self.max_pending:
+                    # Shed prefetches rather than queue unbounded work
+                    self.prefetch_skipped += 1
+                    continue
+                self._pending.add(place_id)
+            self.executor.submit(self._prefetch_one, place_id)
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats["prefetched"] = self.prefetched
+        stats["prefetch_skipped"] = self.prefetch_skipped
+        with self._lock:
+            stats["prefetch_pending"] = len(self._pending)
+        return stats
+
+
+# -----------------------------
+# Spatial Store Index
+# -----------------------------
+def haversine_km(lat, lon, lats, lons):
+    # Great-circle distance from one point to arrays of points
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class _TypeIndex:
+    # Stores and covered search centres for one store type. Readers use the
+    # current array snapshot; writers rebuild it under the lock (writes only
+    # happen after an upstream call, so they are rare).
+    def __init__(self, max_regions):
+        self.max_regions = max_regions
+        self.stores = {}
+        self.regions = []
+        self.lock = threading.Lock()
+        self.store_arrays = (np.empty(0), np.empty(0), np.empty(0), [])
+        self.region_arrays = (np.empty(0), np.empty(0), np.empty(0))
+
+    def add(self, lat, lon, stores, now, ttl):
+        with self.lock:
+            fresh = [r for r in self.regions if now - r[2] < ttl]
+            self.regions = fresh[max(0, len(fresh) - self.max_regions + 1):]
+            self.regions.append((lat, lon, now))
+            for store in stores:
+                if store.get("place_id") and store.get("lat") is not None and store.get("lon") is not None:
+                    self.stores[store["place_id"]] = (store, now)
+            self.stores = {k: v for k, v in self.stores.items() if now - v[1] < ttl}
+            records = list(self.stores.values())
+            self.store_arrays = (
+                np.array([s["lat"] for s, _ in records], dtype=float),
+                np.array([s["lon"] for s, _ in records], dtype=float),
+                np.array([t for _, t in records], dtype=float),
+                [s for s, _ in records]
+            )
+            self.region_arrays = tuple(np.array(column, dtype=float) for column in zip(*self.regions))
+
+
+class StoreIndex:
+    # Answers store searches from stores already fetched nearby. A search is
+    # "covered" if an upstream search for the same store type ran within
+    # reuse_km of the point less than ttl seconds ago; covered searches are
+    # served from the index sorted by haversine distance. Misses in the same
+    # geohash cell share one upstream call.
+    def __init__(self, search_fn, reuse_km=5.0, radius_km=50.0, ttl=24 * 3600, limit=20, max_regions=50000):
+        self.search_fn = search_fn
+        self.reuse_km = reuse_km
+        self.radius_km = radius_km
+        self.ttl = ttl
+        self.limit = limit
+        self.max_regions = max_regions
+        self._types = {}
+        self._lock = threading.Lock()
+        self.flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+
+    def _index(self, key):
+        with self._lock:
+            index = self._types.get(key)
+            if index is None:
+                index = self._types[key] = _TypeIndex(self.max_regions)
+            return index
+
+    def _covered(self, index, lat, lon, now):
+        lats, lons, fetched = index.region_arrays
+        if not len(lats):
+            return False
+        fresh = now - fetched < self.ttl
+        return bool(np.any(fresh & (haversine_km(lat, lon, lats, lons) <= self.reuse_km)))
+
+    def nearest(self, index, lat, lon, now):
+        lats, lons, fetched, records = index.store_arrays
+        if not len(lats):
+            return []
+        distances = haversine_km(lat, lon, lats, lons)
+        candidates = np.flatnonzero((distances <= self.radius_km) & (now - fetched < self.ttl))
+        if len(candidates) > self.limit:
+            candidates = candidates[np.argpartition(distances[candidates], self.limit)[:self.limit]]
+        candidates = candidates[np.argsort(distances[candidates], kind="stable")]
+        return [dict(records[i], distance_km=round(float(distances[i]), 2)) for i in candidates]
+
+    def find(self, lat, lon, store_type=None):
+        # Returns (stores, from_cache)
+        key = (store_type or "").strip().lower()
+        index = self._index(key)
+        now = time.time()
+        if self._covered(index, lat, lon, now):
+            self.hits += 1
+            return self.nearest(index, lat, lon, now), True
+
+        self.misses += 1
+
+        def fetch():
+            if self._covered(index, lat, lon, time.time()):
+                return
+            self.upstream_calls += 1
+            stores = self.search_fn(lat, lon, store_type)
+            index.add(lat, lon, stores, time.time(), self.ttl)
+
+        self.flight.do((key, geohash_encode(lat, lon, 5)), fetch)
+        return self.nearest(index, lat, lon, time.time()), False
+
+    def stats(self):
+        with self._lock:
+            indexes = list(self._types.values())
+        return {
+            "store_types": len(indexes),
+            "stores": sum(len(i.stores) for i in indexes),
+            "regions": sum(len(i.regions) for i in indexes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "upstream_calls": self.upstream_calls
+        }
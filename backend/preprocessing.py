@@ -0,0 +1,105 @@
+import threading
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+
+# -----------------------------
+# In-memory Image Preprocessing
+# -----------------------------
+_SCALE = np.float32(1.0 / 255.0)
+_local = threading.local()
+
+
+def get_thread_buffer(target_size=(224, 224), batch=1):
+    # One (N, H, W, 3) float32 buffer per request thread. The thread blocks
+    # until its prediction is done, so the buffer is never reused too early.
+    # It grows to the largest batch asked for and is returned as a view.
+    shape = (target_size[1], target_size[0], 3)
+    buf = getattr(_local, "buffer", None)
+    if buf is None or buf.shape[1:] != shape or len(buf) < batch:
+        buf = np.empty((batch,) + shape, dtype=np.float32)
+        _local.buffer = buf
+    return buf[:batch]
+
+
+def open_image(source):
+    # `source` may be raw bytes, a path or any binary file-like object
+    # (e.g. werkzeug's FileStorage.stream), so uploads never touch disk.
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = BytesIO(source)
+    return Image.open(source)
+
+
+def _decode(source, target_size):
+    img = open_image(source)
+    # For JPEGs, let libjpeg decode at a reduced 1/2, 1/4 or 1/8 scale that is
+    # still at least target_size, instead of decoding all 12 MP of a phone photo.
+    img.draft("RGB", target_size)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    return img
+
+
+def load_resized(source, target_size=(224, 224)):
+    # RGB PIL image at target_size; also used to pre-resize training shards
+    # with the same decode and resize as serving
+    img = _decode(source, target_size)
+    if img.size != tuple(target_size):
+        img = img.resize(target_size, Image.BICUBIC)
+    return img
+
+
+def preprocess_image(source, target_size=(224, 224), out=None):
+    img = load_resized(source, target_size)
+    if out is None:
+        out = np.empty((1, target_size[1], target_size[0], 3), dtype=np.float32)
+    # Scale straight into the float32 buffer without intermediate copies
+    np.multiply(np.asarray(img), _SCALE, out=out[0] if out.ndim == 4 else out, dtype=np.float32)
+    return out
+
+
+# -----------------------------
+# Test-time Augmentation
+# -----------------------------
+# Views in the order they are added as the TTA factor grows; the first one
+# is exactly what preprocess_image produces. Crops are taken from the image
+# resized to TTA_CROP_SCALE x target_size.
+TTA_VIEWS = ("identity", "flip_lr", "center_crop", "flip_ud", "crop_tl", "crop_tr", "crop_bl", "crop_br")
+TTA_CROP_SCALE = 1.15
+
+
+def preprocess_tta(source, factor, target_size=(224, 224), out=None):
+    # Decodes once and writes the first `factor` views into one
+    # (factor, H, W, 3) batch, so they run in a single forward pass.
+    if not 1 <= factor <= len(TTA_VIEWS):
+        raise ValueError(f"TTA factor must be between 1 and {len(TTA_VIEWS)}.")
+    width, height = target_size
+    img = _decode(source, target_size)
+    base = np.asarray(img if img.size == (width, height) else img.resize(target_size, Image.BICUBIC))
+    enlarged = None
+    if out is None:
+        out = np.empty((factor, height, width, 3), dtype=np.float32)
+    for i, view in enumerate(TTA_VIEWS[:factor]):
+        if view == "identity":
+            pixels = base
+        elif view == "flip_lr":
+            pixels = base[:, ::-1]
+        elif view == "flip_ud":
+            pixels = base[::-1]
+        else:
+            if enlarged is None:
+                size = (round(width * TTA_CROP_SCALE), round(height * TTA_CROP_SCALE))
+                enlarged = np.asarray(img.resize(size, Image.BICUBIC))
+            dy, dx = enlarged.shape[0] - height, enlarged.shape[1] - width
+            top, left = {
+                "center_crop": (dy // 2, dx // 2),
+                "crop_tl": (0, 0),
+                "crop_tr": (0, dx),
+                "crop_bl": (dy, 0),
+                "crop_br": (dy, dx),
+            }[view]
+            pixels = enlarged[top:top + height, left:left + width]
+        np.multiply(pixels, _SCALE, out=out[i], dtype=np.float32)
+    return out
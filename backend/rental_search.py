@@ -0,0 +1,207 @@
+import math
+
+import numpy as np
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import load_only
+
+from fts import build_match_query
+from models import Rental, db
+from places import EARTH_RADIUS_KM, haversine_km
+from rentals import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, RENTAL_FIELDS, rental_to_dict
+
+
+# -----------------------------
+# Rental Search: Index
+# -----------------------------
+# On SQLite, an FTS5 index over the text columns plus a hidden "geo" column
+# of grid-cell tokens, and an R-tree over (lat, lon), kept in sync with the
+# rental table by triggers (created by migration 5). Text + distance queries
+# AND the text with the cells covering the search area, so FTS5 intersects
+# them and only ranks nearby matches. Other engines fall back to LIKE and
+# the (lat, lon) index. The cell sizes must match the ones the migration
+# indexes rows with.
+FINE_CELL_DEG = 0.25  # ~28 km
+COARSE_CELL_DEG = 2.0
+MAX_QUERY_CELLS = 36
+
+
+def _cell_tokens(box):
+    # Cell tokens covering a bounding box, at the finest level that needs at
+    # most MAX_QUERY_CELLS of them
+    lat0, lat1, lon0, lon1 = box
+    for prefix, size in (("q", FINE_CELL_DEG), ("w", COARSE_CELL_DEG)):
+        rows = range(int((max(-90.0, lat0) + 90) // size), int((min(90.0, lat1) + 90) // size) + 1)
+        cols = range(int((max(-180.0, lon0) + 180) // size), int((min(180.0, lon1) + 180) // size) + 1)
+        if len(rows) * len(cols) <= MAX_QUERY_CELLS or prefix == "w":
+            return [f"{prefix}{i}x{j}" for i in rows for j in cols]
+
+
+def uses_sqlite():
+    return db.engine.dialect.name == "sqlite"
+
+
+# -----------------------------
+# Rental Search: Query
+# -----------------------------
+SEARCH_SORTS = ("relevance", "distance", "price_asc", "price_desc")
+DEFAULT_RADIUS_KM = 50.0
+MAX_RADIUS_KM = 500.0
+# Text relevance is divided by (1 + distance / DISTANCE_DECAY_KM)
+DISTANCE_DECAY_KM = 10.0
+
+
+def parse_search_args(args):
+    # Query-string arguments of GET /rentals/search -> search_rentals()
+    # kwargs (minus geocoding of ?near=). Raises ValueError.
+    params = {
+        "q": (args.get("q") or "").strip() or None,
+        "equipment_type": (args.get("equipment_type") or "").strip() or None,
+        "sort": args.get("sort") or None
+    }
+    if params["sort"] is not None and params["sort"] not in SEARCH_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(SEARCH_SORTS)}.")
+    for name in ("lat", "lon", "min_price", "max_price"):
+        value = args.get(name)
+        try:
+            params[name] = float(value) if value not in (None, "") else None
+        except ValueError:
+            raise ValueError(f"{name} must be a number.")
+    if (params["lat"] is None) != (params["lon"] is None):
+        raise ValueError("Provide both lat and lon.")
+    try:
+        params["radius_km"] = min(MAX_RADIUS_KM, max(0.1, float(args.get("radius_km", DEFAULT_RADIUS_KM))))
+        params["page"] = max(1, int(args.get("page", 1)))
+        params["limit"] = min(MAX_PAGE_SIZE, max(1, int(args.get("limit", DEFAULT_PAGE_SIZE))))
+    except ValueError:
+        raise ValueError("radius_km, page and limit must be numbers.")
+    return params
+
+
+def _bounding_box(lat, lon, radius_km):
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    dlon = dlat / max(0.01, math.cos(math.radians(lat)))
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+
+def _sqlite_candidates(match, box, equipment_type, min_price, max_price, order, max_rows):
+    # (id, price, lat, lon, rank) rows; rank is bm25 (lower is better)
+    where, params = [], {}
+    if match:
+        expression = "{title description equipment_type} : (" + match + ")"
+        if box:
+            expression += " AND geo : (" + " OR ".join(_cell_tokens(box)) + ")"
+        # Filters apply in the same query as the MATCH, so every matching
+        # row that passes them is ranked; only the final ordered list is cut
+        sql = (
+            "SELECT rental.id, rental.price, rental.lat, rental.lon,"
+            " bm25(rental_fts, 10.0, 1.0, 5.0, 0.0) AS rank"
+            " FROM rental_fts JOIN rental ON rental.id = rental_fts.rowid"
+        )
+        where.append("rental_fts MATCH :match")
+        params["match"] = expression
+    elif box:
+        sql = ("SELECT rental.id, rental.price, rental.lat, rental.lon, 0.0 AS rank"
+               " FROM rental_geo JOIN rental ON rental.id = rental_geo.id")
+        where.append("rental_geo.max_lat >= :lat0 AND rental_geo.min_lat <= :lat1"
+                     " AND rental_geo.max_lon >= :lon0 AND rental_geo.min_lon <= :lon1")
+        params.update(zip(("lat0", "lat1", "lon0", "lon1"), box))
+    else:
+        sql = "SELECT rental.id, rental.price, rental.lat, rental.lon, 0.0 AS rank FROM rental"
+    if equipment_type:
+        where.append("lower(rental.equipment_type) = :equipment_type")
+        params["equipment_type"] = equipment_type.lower()
+    if min_price is not None:
+        where.append("rental.price >= :min_price")
+        params["min_price"] = min_price
+    if max_price is not None:
+        where.append("rental.price <= :max_price")
+        params["max_price"] = max_price
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if order:
+        sql += f" ORDER BY {order} LIMIT :max_rows"
+        params["max_rows"] = max_rows
+    return db.session.execute(db.text(sql), params).fetchall()
+
+
+def _generic_candidates(q, box, equipment_type, min_price, max_price):
+    query = db.session.query(Rental.id, Rental.price, Rental.lat, Rental.lon, db.literal(0.0))
+    for term in (q or "").split():
+        pattern = f"%{term}%"
+        query = query.filter(or_(Rental.title.ilike(pattern), Rental.description.ilike(pattern), Rental.equipment_type.ilike(pattern)))
+    if box:
+        query = query.filter(and_(Rental.lat.between(box[0], box[1]), Rental.lon.between(box[2], box[3])))
+    if equipment_type:
+        query = query.filter(func.lower(Rental.equipment_type) == equipment_type.lower())
+    if min_price is not None:
+        query = query.filter(Rental.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Rental.price <= max_price)
+    return query.all()
+
+
+def search_rentals(q=None, lat=None, lon=None, radius_km=DEFAULT_RADIUS_KM, equipment_type=None,
+                   min_price=None, max_price=None, sort=None, page=1, limit=DEFAULT_PAGE_SIZE, fields=RENTAL_FIELDS):
+    # Returns (rentals, has_more). Candidates are narrowed in SQL (text
+    # match, bounding box, price, type) reading only id/price/lat/lon/rank;
+    # distances and scores are computed in NumPy and full rows are loaded
+    # for the requested page only.
+    match = build_match_query(q, prefix_last_only=True) if q else None
+    if q and match is None:
+        return [], False
+    geo = lat is not None and lon is not None
+    sort = sort or ("relevance" if match else "distance" if geo else "price_asc")
+    if sort == "distance" and not geo:
+        raise ValueError("sort=distance needs lat and lon.")
+    box = _bounding_box(lat, lon, radius_km) if geo else None
+    wanted = page * limit + 1
+
+    if uses_sqlite():
+        # Without a distance filter SQL can order and cut the list itself
+        order = None
+        if not geo:
+            order = {"relevance": "rank, rental.id", "price_asc": "rental.price, rental.id",
+                     "price_desc": "rental.price DESC, rental.id DESC"}[sort]
+        rows = _sqlite_candidates(match, box, equipment_type, min_price, max_price, order, wanted)
+    else:
+        rows = _generic_candidates(q, box, equipment_type, min_price, max_price)
+    if not rows:
+        return [], False
+
+    ids = np.array([r[0] for r in rows], dtype=np.int64)
+    prices = np.array([r[1] for r in rows], dtype=float)
+    relevance = -np.array([r[4] for r in rows], dtype=float)
+    distances = np.full(len(rows), np.nan)
+    if geo:
+        lats = np.array([r[2] for r in rows], dtype=float)
+        lons = np.array([r[3] for r in rows], dtype=float)
+        distances = haversine_km(lat, lon, lats, lons)
+        keep = distances <= radius_km
+        ids, prices, relevance, distances = ids[keep], prices[keep], relevance[keep], distances[keep]
+        relevance = relevance / (1.0 + distances / DISTANCE_DECAY_KM)
+
+    # np.lexsort sorts by the last key first; ids break ties
+    if sort == "relevance":
+        order = np.lexsort((ids, -relevance))
+    elif sort == "distance":
+        order = np.lexsort((ids, distances))
+    elif sort == "price_asc":
+        order = np.lexsort((ids, prices))
+    else:
+        order = np.lexsort((-ids, -prices))
+    start = (page - 1) * limit
+    page_rows = order[start:start + limit]
+    has_more = len(order) > start + limit
+
+    page_ids = [int(i) for i in ids[page_rows]]
+    loaded = Rental.query.options(load_only(*[getattr(Rental, f) for f in fields])).filter(Rental.id.in_(page_ids)).all()
+    by_id = {r.id: r for r in loaded}
+    results = []
+    for i, row in zip(page_ids, page_rows):
+        if i not in by_id:
+            continue
+        rental = rental_to_dict(by_id[i], fields)
+        if geo:
+            rental["distance_km"] = round(float(distances[row]), 2)
+        results.append(rental)
+    return results, has_more
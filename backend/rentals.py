@@ -0,0 +1,126 @@
+import math
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import load_only
+
+from media import photo_urls
+from models import Rental
+from pagination import decode_cursor, encode_cursor
+
+
+# -----------------------------
+# Rental Listings
+# -----------------------------
+RENTAL_FIELDS = (
+    "id", "title", "description", "price", "contact", "equipment_type",
+    "rental_duration", "location", "posted_by", "photo", "lat", "lon"
+)
+RENTAL_SORTS = ("newest", "price_asc", "price_desc")
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def rental_to_dict(rental, fields=RENTAL_FIELDS):
+    data = {field: getattr(rental, field) for field in fields}
+    if "photo" in data:
+        # The stored content hash becomes a thumbnail URL plus every size
+        data["photo"], data["photo_urls"] = photo_urls(rental.photo)
+    return data
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def cursor_position(cursor, sort):
+    # Sort key after which a page starts: (id,) for newest, (price, id) for
+    # the price sorts. Cursors carry the sort they were issued for, so one
+    # reused with a different sort, or tampered with, raises ValueError.
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    if not values or values[0] != sort:
+        raise ValueError("invalid cursor")
+    key = values[1:]
+    if sort == "newest":
+        valid = len(key) == 1 and isinstance(key[0], int) and not isinstance(key[0], bool)
+    else:
+        valid = len(key) == 2 and _is_number(key[0]) and isinstance(key[1], int) and not isinstance(key[1], bool)
+    if not valid:
+        raise ValueError("invalid cursor")
+    return tuple(key)
+
+
+def parse_rental_args(args):
+    # Query-string arguments of GET /rentals -> list_rentals() kwargs.
+    # Raises ValueError with a message for the client.
+    params = {
+        "equipment_type": (args.get("equipment_type") or "").strip() or None,
+        "location": (args.get("location") or "").strip() or None,
+        "sort": args.get("sort", "newest"),
+        "cursor": args.get("cursor")
+    }
+    if params["sort"] not in RENTAL_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(RENTAL_SORTS)}.")
+    cursor_position(params["cursor"], params["sort"])
+    for name in ("min_price", "max_price"):
+        value = args.get(name)
+        try:
+            params[name] = float(value) if value not in (None, "") else None
+        except ValueError:
+            raise ValueError(f"{name} must be a number.")
+    try:
+        params["limit"] = min(MAX_PAGE_SIZE, max(1, int(args.get("limit", DEFAULT_PAGE_SIZE))))
+    except ValueError:
+        raise ValueError("limit must be an integer.")
+    if args.get("fields"):
+        fields = [f.strip() for f in args["fields"].split(",") if f.strip()]
+        unknown = [f for f in fields if f not in RENTAL_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+        # id is always returned so clients can key and page the list
+        params["fields"] = ("id",) + tuple(f for f in fields if f != "id")
+    return params
+
+
+def list_rentals(equipment_type=None, location=None, min_price=None, max_price=None,
+                 sort="newest", cursor=None, limit=DEFAULT_PAGE_SIZE, fields=RENTAL_FIELDS):
+    # Returns (rentals, next_cursor). Pages seek from the cursor on the
+    # (price, id) / id indexes instead of using OFFSET. Raises ValueError
+    # for a cursor that doesn't belong to this sort.
+    query = Rental.query.options(load_only(*[getattr(Rental, f) for f in fields]))
+    if equipment_type:
+        query = query.filter(func.lower(Rental.equipment_type) == equipment_type.lower())
+    if location:
+        # Case-insensitive prefix match as a range, so it can use the index
+        prefix = location.lower()
+        query = query.filter(func.lower(Rental.location) >= prefix, func.lower(Rental.location) < prefix + "\uffff")
+    if min_price is not None:
+        query = query.filter(Rental.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Rental.price <= max_price)
+
+    after = cursor_position(cursor, sort)
+    if sort == "newest":
+        if after is not None:
+            query = query.filter(Rental.id < after[0])
+        query = query.order_by(Rental.id.desc())
+    else:
+        ascending = sort == "price_asc"
+        if after is not None:
+            price, last_id = after
+            if ascending:
+                query = query.filter(or_(Rental.price > price, and_(Rental.price == price, Rental.id > last_id)))
+            else:
+                query = query.filter(or_(Rental.price < price, and_(Rental.price == price, Rental.id < last_id)))
+        if ascending:
+            query = query.order_by(Rental.price.asc(), Rental.id.asc())
+        else:
+            query = query.order_by(Rental.price.desc(), Rental.id.desc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor([sort, last.id] if sort == "newest" else [sort, last.price, last.id])
+    return [rental_to_dict(r, fields) for r in rows[:limit]], next_cursor
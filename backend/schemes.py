@@ -0,0 +1,404 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from bs4 import BeautifulSoup
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process serving only
+    fcntl = None
+
+from cache import reopen_after_fork
+from fts import build_match_query
+from pagination import decode_cursor, encode_cursor
+
+
+# -----------------------------
+# Government Schemes: Parsing
+# -----------------------------
+SCHEMES_URL = "https://www.myscheme.gov.in/search/category/Agriculture,Rural%20&%20Environment"
+SCHEMES_BASE_URL = "https://www.myscheme.gov.in"
+
+
+def parse_schemes(html, base_url=SCHEMES_BASE_URL):
+    # Pure function over a page's HTML so it can run against saved pages
+    soup = BeautifulSoup(html, "html.parser")
+    candidate_cards = soup.find_all("div", class_="flex flex-col")
+
+    schemes = []
+    for card in candidate_cards:
+        a_tag = card.find("a", href=True)
+        if a_tag and a_tag.get("href", "").startswith("/schemes/"):
+            title = a_tag.get_text(strip=True)
+            relative_link = a_tag.get("href")
+            link = urllib.parse.urljoin(base_url, relative_link)
+            h2_tags = card.find_all("h2")
+            ministry = h2_tags[1].get_text(strip=True) if len(h2_tags) > 1 else ""
+            description_tag = card.find("span", class_=lambda v: v and "line-clamp" in v)
+            description = description_tag.get_text(strip=True) if description_tag else ""
+            schemes.append({
+                "title": title,
+                "link": link,
+                "ministry": ministry,
+                "description": description
+            })
+    return schemes
+
+
+# -----------------------------
+# Government Schemes: Scraping
+# -----------------------------
+def fetch_scheme_pages(max_pages=20, page_load_wait=5, pagination_wait=3):
+    # One headless browser session walks every results page and returns the
+    # raw HTML of each. Only the background refresher calls this.
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+
+    driver = webdriver.Chrome(options=chrome_options)
+    pages = []
+    try:
+        driver.get(SCHEMES_URL)
+        time.sleep(page_load_wait)
+        pages.append(driver.page_source)
+        for page in range(2, max_pages + 1):
+            page_xpath = f"//ul[contains(@class,'list-none') and contains(@class,'flex')]/li[normalize-space(text())='{page}']"
+            try:
+                page_button = driver.find_element("xpath", page_xpath)
+            except Exception:
+                break
+            driver.execute_script("arguments[0].click();", page_button)
+            time.sleep(pagination_wait)
+            pages.append(driver.page_source)
+    finally:
+        driver.quit()
+    return pages
+
+
+SCHEMES_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+}
+
+
+def fetch_scheme_pages_http(http_client, max_pages=20):
+    # Plain GETs through the shared HTTP client (pooled, with timeouts and
+    # retries). Returns [] when the listing is only rendered client-side, in
+    # which case the caller falls back to the browser.
+    pages = []
+    seen = set()
+    for page in range(1, max_pages + 1):
+        r = http_client.get(SCHEMES_URL, params={"page": page} if page > 1 else None,
+                            headers=SCHEMES_HEADERS, endpoint="myscheme.search")
+        r.raise_for_status()
+        links = {scheme["link"] for scheme in parse_schemes(r.text)}
+        # Stop at an empty page or one that repeats what we already have
+        if not links - seen:
+            break
+        seen |= links
+        pages.append(r.text)
+    return pages
+
+
+def scrape_schemes(max_pages=20, http_client=None):
+    # Plain HTTP first; the browser when that fails or finds nothing
+    schemes = []
+    seen = set()
+    pages = []
+    if http_client is not None:
+        try:
+            pages = fetch_scheme_pages_http(http_client, max_pages)
+        except Exception as e:
+            print(f"Scheme pages over HTTP failed, falling back to the browser: {e}")
+    for html in pages or fetch_scheme_pages(max_pages):
+        for scheme in parse_schemes(html):
+            if scheme["link"] not in seen:
+                seen.add(scheme["link"])
+                schemes.append(scheme)
+    return schemes
+
+
+# -----------------------------
+# Government Schemes: Local Store
+# -----------------------------
+class SchemeStore:
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        has_fts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schemes_fts'"
+        ).fetchone() is not None
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS schemes ("
+            " id INTEGER PRIMARY KEY,"
+            " position INTEGER NOT NULL,"
+            " title TEXT NOT NULL,"
+            " link TEXT NOT NULL UNIQUE,"
+            " ministry TEXT NOT NULL DEFAULT '',"
+            " description TEXT NOT NULL DEFAULT '');"
+            "CREATE INDEX IF NOT EXISTS ix_schemes_position ON schemes (position);"
+            "CREATE TABLE IF NOT EXISTS scheme_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            # External-content FTS5 index over the schemes table, with 2/3
+            # character prefix indexes for as-you-type queries
+            "CREATE VIRTUAL TABLE IF NOT EXISTS schemes_fts USING fts5("
+            " title, ministry, description, content='schemes', content_rowid='id',"
+            " tokenize='unicode61 remove_diacritics 2', prefix='2 3');"
+        )
+        if not has_fts:
+            # Index rows stored before the search index existed
+            self._conn.execute("INSERT INTO schemes_fts (schemes_fts) VALUES ('rebuild')")
+        self._conn.commit()
+        reopen_after_fork(self)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def reopen(self):
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    @staticmethod
+    def compute_etag(schemes):
+        payload = json.dumps(schemes, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha1(payload).hexdigest()
+
+    def get_meta(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM scheme_meta").fetchall()
+        meta = {row["key"]: row["value"] for row in rows}
+        return {
+            "etag": meta.get("etag"),
+            "last_refreshed": float(meta["last_refreshed"]) if "last_refreshed" in meta else None,
+            "last_error": meta.get("last_error")
+        }
+
+    def _set_meta(self, **values):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO scheme_meta (key, value) VALUES (?, ?)",
+            [(k, str(v)) for k, v in values.items()]
+        )
+
+    def replace_all(self, schemes):
+        # Returns True if the content changed. Unchanged scrapes only bump
+        # last_refreshed, so the ETag (and clients' caches) stay valid.
+        etag = self.compute_etag(schemes)
+        with self._lock:
+            current = self._conn.execute("SELECT value FROM scheme_meta WHERE key = 'etag'").fetchone()
+            changed = current is None or current["value"] != etag
+            with self._conn:
+                if changed:
+                    self._conn.execute("DELETE FROM schemes")
+                    self._conn.executemany(
+                        "INSERT INTO schemes (position, title, link, ministry, description) VALUES (?, ?, ?, ?, ?)",
+                        [(i, s["title"], s["link"], s["ministry"], s["description"]) for i, s in enumerate(schemes)]
+                    )
+                    self._conn.execute("INSERT INTO schemes_fts (schemes_fts) VALUES ('rebuild')")
+                self._set_meta(etag=etag, last_refreshed=time.time())
+                self._conn.execute("DELETE FROM scheme_meta WHERE key = 'last_error'")
+        return changed
+
+    def record_error(self, error):
+        with self._lock, self._conn:
+            self._set_meta(last_error=error)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM schemes").fetchone()[0]
+
+    def page(self, page=1, per_page=10, cursor=None):
+        # Returns (schemes, next_cursor). With a cursor the query seeks on the
+        # position index instead of scanning past OFFSET rows. Cursors from
+        # search() or tampered ones raise ValueError.
+        after = _cursor_key(cursor, ["page"], (int,))
+        if after is not None:
+            sql = "SELECT position, title, link, ministry, description FROM schemes WHERE position > ? ORDER BY position LIMIT ?"
+            params = (after[0], per_page + 1)
+        else:
+            sql = "SELECT position, title, link, ministry, description FROM schemes ORDER BY position LIMIT ? OFFSET ?"
+            params = (per_page + 1, (max(1, page) - 1) * per_page)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        next_cursor = encode_cursor(["page", rows[per_page - 1]["position"]]) if len(rows) > per_page else None
+        return [_scheme_row(row) for row in rows[:per_page]], next_cursor
+
+    def search(self, query, page=1, per_page=10, cursor=None):
+        # BM25-ranked full-text search (title weighted over ministry over
+        # description). Keyset pagination on (score, id) via the cursor,
+        # which is only valid for the query that issued it and the store
+        # contents (ETag) it was issued against: bm25 scores shift whenever
+        # a refresh changes the corpus.
+        match = build_match_query(query)
+        if match is None:
+            return [], None
+        score = "bm25(schemes_fts, 10.0, 2.0, 1.0)"
+        sql = (
+            f"SELECT s.id, s.title, s.link, s.ministry, s.description, {score} AS score "
+            "FROM schemes_fts JOIN schemes s ON s.id = schemes_fts.rowid "
+            "WHERE schemes_fts MATCH ?"
+        )
+        params = [match]
+        with self._lock:
+            # Read under the same lock as the query, so a concurrent
+            # replace_all can't slip between the check and the seek
+            etag = self._conn.execute("SELECT value FROM scheme_meta WHERE key = 'etag'").fetchone()
+            etag = etag["value"] if etag else None
+            after = _cursor_key(cursor, ["search", etag, match], ((int, float), int))
+            if after is not None:
+                sql += f" AND ({score} > ? OR ({score} = ? AND schemes_fts.rowid > ?))"
+                params += [after[0], after[0], after[1]]
+                sql += " ORDER BY score, s.id LIMIT ?"
+                params.append(per_page + 1)
+            else:
+                sql += " ORDER BY score, s.id LIMIT ? OFFSET ?"
+                params += [per_page + 1, (max(1, page) - 1) * per_page]
+            rows = self._conn.execute(sql, params).fetchall()
+        next_cursor = None
+        if len(rows) > per_page:
+            last = rows[per_page - 1]
+            next_cursor = encode_cursor(["search", etag, match, last["score"], last["id"]])
+        return [_scheme_row(row) for row in rows[:per_page]], next_cursor
+
+
+# -----------------------------
+# Government Schemes: Helpers
+# -----------------------------
+def _cursor_key(cursor, tag, types):
+    # The sort key after the tag (["page"] or ["search", etag, match]), checked
+    # against the expected element types; ValueError if it doesn't match
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    if not values or values[:len(tag)] != tag:
+        raise ValueError("invalid cursor")
+    key = values[len(tag):]
+    if len(key) != len(types) or any(isinstance(v, bool) or not isinstance(v, t) for v, t in zip(key, types)):
+        raise ValueError("invalid cursor")
+    return key
+
+
+def _scheme_row(row):
+    return {
+        "title": row["title"],
+        "link": row["link"],
+        "ministry": row["ministry"],
+        "description": row["description"]
+    }
+
+
+# -----------------------------
+# Government Schemes: Background Refresher
+# -----------------------------
+class SchemeRefresher:
+    # Periodically re-scrapes into the store. Readers never wait on the
+    # browser: stale data is served while a refresh runs in the background.
+    # Every forked web worker runs this thread, so scrapes also take an
+    # exclusive lock on a file next to the store: one process scrapes and
+    # the others pick up its result from the shared database.
+    def __init__(self, store, scrape_fn=scrape_schemes, interval=6 * 3600, max_age=12 * 3600, retry_after=300):
+        self.store = store
+        self.scrape_fn = scrape_fn
+        self.interval = interval
+        self.max_age = max_age
+        self.retry_after = retry_after
+        self.lock_path = os.path.abspath(store.path) + ".refresh.lock"
+        self._last_attempt = 0.0
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="scheme-refresher", daemon=True)
+            self._thread.start()
+
+    def _is_due(self):
+        last = self.store.get_meta()["last_refreshed"]
+        return last is None or time.time() - last >= self.interval
+
+    def _run(self):
+        while True:
+            # Back off after a failed attempt instead of relaunching the browser
+            # on every wake-up
+            if self._is_due() and time.time() - self._last_attempt >= self.retry_after:
+                self.refresh(only_if_due=True)
+            meta = self.store.get_meta()
+            if meta["last_error"] or meta["last_refreshed"] is None:
+                wait = self.retry_after
+            else:
+                # Sleep until the shared store is due, whichever process refreshed it
+                wait = max(self.retry_after, self.interval - (time.time() - meta["last_refreshed"]))
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def _acquire_process_lock(self):
+        # Open lock file if this process now holds the lock, None if another
+        # process does. Without fcntl there is nothing to coordinate with.
+        if fcntl is None:
+            return open(os.devnull, "w")
+        f = open(self.lock_path, "a")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return None
+        return f
+
+    def refresh(self, only_if_due=False):
+        # Only one scrape at a time, across threads and processes; concurrent
+        # callers just skip
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            lock_file = self._acquire_process_lock()
+            if lock_file is None:
+                return False
+            with lock_file:
+                # Another process may have finished a scrape just before we
+                # got the lock
+                if only_if_due and not self._is_due():
+                    return False
+                self._last_attempt = time.time()
+                try:
+                    schemes = self.scrape_fn()
+                    if not schemes:
+                        raise RuntimeError("Scrape returned no schemes.")
+                    self.store.replace_all(schemes)
+                    return True
+                except Exception as e:
+                    print(f"Scheme refresh failed: {e}")
+                    self.store.record_error(str(e))
+                    return False
+        finally:
+            self._refresh_lock.release()
+
+    @property
+    def refreshing(self):
+        return self._refresh_lock.locked()
+
+    def is_stale(self):
+        last = self.store.get_meta()["last_refreshed"]
+        return last is None or time.time() - last >= self.max_age
+
+    def revalidate(self):
+        # Stale-while-revalidate: wake the worker without blocking the caller
+        self.start()
+        if self.is_stale() and not self.refreshing:
+            self._wake.set()
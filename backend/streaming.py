@@ -0,0 +1,27 @@
+import json
+
+
+# -----------------------------
+# Server-Sent Events Helpers
+# -----------------------------
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_chat_events(model, prompt, synthesize=None):
+    # Yields one "token" event per streamed chunk, then an optional "audio"
+    # event built from the full text, then "done". Errors end the stream
+    # with an "error" event since the HTTP status has already been sent.
+    parts = []
+    try:
+        for chunk in model.generate_content(prompt, stream=True):
+            text = chunk.text
+            if text:
+                parts.append(text)
+                yield sse_event("token", {"text": text})
+        text_response = "".join(parts)
+        if synthesize is not None:
+            yield sse_event("audio", {"audio_response": synthesize(text_response)})
+        yield sse_event("done", {"response": text_response})
+    except Exception as e:
+        yield sse_event("error", {"error": str(e)})
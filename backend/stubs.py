@@ -0,0 +1,242 @@
+import time
+
+
+# -----------------------------
+# Local Stand-ins for Network Services
+# -----------------------------
+DEFAULT_FAKE_TEXT = (
+    "Late blight spreads quickly in cool, wet weather. Remove infected leaves and "
+    "avoid watering from above. Spray a copper-based fungicide every seven to ten days. "
+    "Rotate crops and plant resistant varieties next season."
+)
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    # Mimics google.generativeai.GenerativeModel.generate_content, including
+    # stream=True, with a configurable first-token delay and per-chunk delay.
+    def __init__(self, text=DEFAULT_FAKE_TEXT, words_per_chunk=4, first_token_delay=0.5, chunk_delay=0.05):
+        self.text = text
+        self.words_per_chunk = max(1, words_per_chunk)
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+
+    def _chunks(self):
+        words = self.text.split(" ")
+        for i in range(0, len(words), self.words_per_chunk):
+            piece = " ".join(words[i:i + self.words_per_chunk])
+            yield piece if i + self.words_per_chunk >= len(words) else piece + " "
+
+    def _stream(self):
+        time.sleep(self.first_token_delay)
+        for i, piece in enumerate(self._chunks()):
+            if i:
+                time.sleep(self.chunk_delay)
+            yield _FakeResponse(piece)
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        if stream:
+            return self._stream()
+        return _FakeResponse("".join(chunk.text for chunk in self._stream()))
+
+
+class FakeTTSBackend:
+    # Returns deterministic bytes after a per-call delay, standing in for gTTS
+    mimetype = "audio/mpeg"
+
+    def __init__(self, delay=0.2, bytes_per_char=64):
+        self.delay = delay
+        self.bytes_per_char = bytes_per_char
+        self.calls = 0
+
+    def synthesize(self, text, lang):
+        self.calls += 1
+        time.sleep(self.delay)
+        return (f"[{lang}]{text}".encode("utf-8") * self.bytes_per_char)[:len(text) * self.bytes_per_char]
+
+
+class _StubHTTPServer:
+    # Threaded local HTTP server that answers GETs with JSON after `latency`
+    # seconds. Subclasses implement respond(path, query) -> (status, payload).
+    # `calls` counts upstream hits, `fail` makes every request return 503 and
+    # `malformed` sends a body that claims gzip encoding but isn't.
+    name = "stub-http"
+
+    def __init__(self, latency=0.1, host="127.0.0.1", port=0):
+        import threading
+        from http.server import ThreadingHTTPServer
+
+        self.latency = latency
+        self.fail = False
+        self.malformed = False
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=self.name, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, path, query):
+        raise NotImplementedError
+
+    def _handler(self):
+        import json
+        import urllib.parse
+        from http.server import BaseHTTPRequestHandler
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this,
+            # keep-alive clients stall on Nagle + delayed ACK
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.calls += 1
+                time.sleep(stub.latency)
+                url = urllib.parse.urlparse(self.path)
+                query = {k: v[0] for k, v in urllib.parse.parse_qs(url.query).items()}
+                if stub.fail:
+                    status, payload = 503, {"cod": "503", "message": "stub failure"}
+                else:
+                    status, payload = stub.respond(url.path, query)
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if stub.malformed:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+class StubOpenWeatherServer(_StubHTTPServer):
+    # OpenWeather-style /forecast with a synthetic 40-slot forecast. Use
+    # base_url as OPENWEATHER_BASE_URL.
+    name = "stub-openweather"
+
+    def respond(self, path, query):
+        if not path.endswith("/forecast"):
+            return 404, {"cod": "404", "message": "not found"}
+        return 200, fake_forecast(float(query.get("lat", 0)), float(query.get("lon", 0)))
+
+
+class StubGoMapsServer(_StubHTTPServer):
+    # GoMaps/Google-style place/textsearch, place/details and geocode JSON
+    # APIs over a deterministic lattice of shops (one per `spacing`
+    # degrees). Use base_url as GOMAPS_BASE_URL.
+    name = "stub-gomaps"
+
+    def __init__(self, latency=0.1, spacing=0.05, **kwargs):
+        super().__init__(latency, **kwargs)
+        self.spacing = spacing
+
+    def _store(self, i, j, store_type):
+        import math
+
+        jitter = math.sin(i * 12.9898 + j * 78.233) * 0.3
+        return {
+            "place_id": f"stub:{store_type}:{i}:{j}",
+            "name": f"{store_type.title()} #{i}-{j}",
+            "formatted_address": f"Plot {abs(i) % 97}, Market Road, Lattice {i}/{j}",
+            "geometry": {"location": {"lat": (i + 0.5 + jitter) * self.spacing, "lng": (j + 0.5 - jitter) * self.spacing}},
+            "types": ["store", "point_of_interest", "establishment"]
+        }
+
+    def respond(self, path, query):
+        if path.endswith("/textsearch/json"):
+            lat, lon = (float(v) for v in query.get("location", "0,0").split(","))
+            store_type = query.get("query", "store").replace(" near me", "")
+            ci, cj = int(lat // self.spacing), int(lon // self.spacing)
+            # The 20 nearest lattice shops, like a Places text search page
+            candidates = [self._store(i, j, store_type) for i in range(ci - 3, ci + 4) for j in range(cj - 3, cj + 4)]
+            candidates.sort(key=lambda s: (s["geometry"]["location"]["lat"] - lat) ** 2 + (s["geometry"]["location"]["lng"] - lon) ** 2)
+            return 200, {"status": "OK", "results": candidates[:20]}
+        if path.endswith("/geocode/json"):
+            import hashlib
+
+            # Any address lands somewhere in India, the same place every time
+            digest = hashlib.sha1(query.get("address", "").strip().lower().encode("utf-8")).digest()
+            lat = 8.0 + 27.0 * digest[0] / 255.0 + digest[1] / 25500.0
+            lon = 68.0 + 29.0 * digest[2] / 255.0 + digest[3] / 25500.0
+            return 200, {"status": "OK", "results": [{"geometry": {"location": {"lat": lat, "lng": lon}}}]}
+        if path.endswith("/details/json"):
+            _, store_type, i, j = query.get("place_id", "stub:store:0:0").split(":")
+            return 200, {"status": "OK", "result": fake_place_details(self._store(int(i), int(j), store_type))}
+        return 404, {"status": "NOT_FOUND"}
+
+
+def fake_place_details(place):
+    # A Places details payload of realistic size: reviews, photos and
+    # address components dominate it
+    result = dict(place)
+    result.update({
+        "formatted_phone_number": "098765 43210",
+        "international_phone_number": "+91 98765 43210",
+        "website": f"https://example.com/{place['place_id'].replace(':', '-')}",
+        "rating": 4.2,
+        "user_ratings_total": 87,
+        "business_status": "OPERATIONAL",
+        "opening_hours": {
+            "open_now": True,
+            "weekday_text": [f"{day}: 9:00 AM – 8:00 PM" for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")],
+            "periods": [{"open": {"day": d, "time": "0900"}, "close": {"day": d, "time": "2000"}} for d in range(7)]
+        },
+        "address_components": [{"long_name": f"Component {k}", "short_name": f"C{k}", "types": ["political"]} for k in range(6)],
+        "photos": [{"height": 3000, "width": 4000, "photo_reference": "p" * 400, "html_attributions": ["<a href=\"https://maps.google.com\">A farmer</a>"]} for _ in range(10)],
+        "reviews": [{"author_name": f"Reviewer {k}", "rating": 4, "relative_time_description": "a month ago",
+                     "text": "Good stock of seeds and fertilizer, helpful staff. " * 8, "time": 1700000000 + k} for k in range(5)],
+        "adr_address": "<span class=\"street-address\">Market Road</span>",
+        "plus_code": {"compound_code": "XXXX+XX", "global_code": "7JXXXXXX+XX"},
+        "url": "https://maps.google.com/?cid=0",
+        "utc_offset": 330,
+        "vicinity": "Market Road"
+    })
+    return result
+
+
+def fake_forecast(lat, lon, slots=40, start=None):
+    # Deterministic OpenWeather /forecast payload for a location
+    import math
+
+    start = int(start if start is not None else time.time()) // 10800 * 10800
+    seed = math.sin(lat * 12.9898 + lon * 78.233)
+    items = []
+    for i in range(slots):
+        dt = start + i * 10800
+        phase = math.sin(i / 8.0 * 2 * math.pi + seed)
+        temp = 28 + 15 * seed + 8 * phase
+        items.append({
+            "dt": dt,
+            "dt_txt": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(dt)),
+            "main": {"temp": round(temp, 2), "humidity": int(60 + 30 * phase)},
+            "weather": [{"main": "Rain" if phase > 0.8 else "Clear", "description": ""}],
+            "wind": {"speed": round(abs(12 * seed + 6 * phase), 2)},
+            "rain": {"3h": round(max(0.0, 30 * (phase - 0.7)), 2)}
+        })
+    return {"cod": "200", "cnt": slots, "list": items, "city": {"coord": {"lat": lat, "lon": lon}}}
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate  # noqa: E402
+from models import configure_database, db  # noqa: E402
+
+
+@pytest.fixture
+def db_app(tmp_path):
+    # A bare Flask app on a migrated SQLite file, inside an app context
+    app = Flask(__name__)
+    configure_database(app, f"sqlite:///{tmp_path / 'test.db'}")
+    with app.app_context():
+        migrate()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
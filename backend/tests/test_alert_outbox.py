@@ -0,0 +1,56 @@
+import time
+
+from blueprints.geo import dispatch_weather_alerts
+from models import AlertOutbox, User, db
+
+
+class FlakyNotifier:
+    # Delivers nothing for the first `failures` calls
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def send(self, alerts):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return []
+        return [alert["id"] for alert in alerts]
+
+
+def _queue_alert():
+    db.session.add(User(username="farmer", password_hash="x"))
+    db.session.flush()
+    db.session.add(AlertOutbox(user_id=1, tile="te7u", condition="Heavy rain", event_time="2026-10-18 12:00:00",
+                               dedupe_key="1|te7u|rain", status="pending", created_at=time.time()))
+    db.session.commit()
+
+
+def _make_due():
+    AlertOutbox.query.update({AlertOutbox.next_attempt_at: time.time() - 1})
+    db.session.commit()
+
+
+def test_failed_delivery_is_retried_with_backoff(db_app):
+    _queue_alert()
+    notifier = FlakyNotifier(failures=1)
+    assert dispatch_weather_alerts(notifier, max_attempts=3, retry_backoff_s=60) == 0
+    alert = db.session.get(AlertOutbox, 1)
+    assert (alert.status, alert.attempts) == ("pending", 1)
+    assert alert.next_attempt_at > time.time() + 30
+    # Not due yet: nothing is sent
+    assert dispatch_weather_alerts(notifier, max_attempts=3) == 0
+    assert notifier.calls == 1
+    _make_due()
+    assert dispatch_weather_alerts(notifier, max_attempts=3) == 1
+    alert = db.session.get(AlertOutbox, 1)
+    assert (alert.status, alert.attempts) == ("sent", 2)
+
+
+def test_alert_fails_after_max_attempts(db_app):
+    _queue_alert()
+    notifier = FlakyNotifier(failures=10)
+    for _ in range(3):
+        dispatch_weather_alerts(notifier, max_attempts=3)
+        _make_due()
+    alert = db.session.get(AlertOutbox, 1)
+    assert (alert.status, alert.attempts) == ("failed", 3)
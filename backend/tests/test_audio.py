@@ -0,0 +1,43 @@
+import shutil
+import subprocess
+import wave
+
+import numpy as np
+import pytest
+
+from audio import TARGET_SAMPLE_RATE, _needs_seekable_input, decode_to_pcm
+
+FFMPEG = shutil.which("ffmpeg")
+
+
+@pytest.fixture
+def m4a_bytes(tmp_path):
+    # One second of a 440 Hz tone as AAC in an m4a container. ffmpeg's mp4
+    # muxer writes the moov atom at the end unless told to "faststart",
+    # like many phone recorders do.
+    wav_path = tmp_path / "tone.wav"
+    m4a_path = tmp_path / "tone.m4a"
+    t = np.arange(44100) / 44100.0
+    with wave.open(str(wav_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(44100)
+        wav.writeframes((np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2").tobytes())
+    subprocess.run([FFMPEG, "-hide_banner", "-loglevel", "error", "-i", str(wav_path), "-c:a", "aac", str(m4a_path)], check=True)
+    data = m4a_path.read_bytes()
+    assert data.find(b"moov") > data.find(b"mdat")
+    return data
+
+
+def test_mp4_family_needs_seekable_input():
+    assert _needs_seekable_input(b"\x00\x00\x00\x20ftypM4A \x00\x00\x00\x00")
+    assert not _needs_seekable_input(b"OggS\x00\x02\x00\x00\x00\x00\x00\x00")
+    assert not _needs_seekable_input(b"ID3\x04\x00\x00\x00\x00\x00\x00")
+
+
+@pytest.mark.skipif(FFMPEG is None, reason="ffmpeg not installed")
+def test_decode_m4a_with_trailing_moov(m4a_bytes):
+    pcm = decode_to_pcm(m4a_bytes, ffmpeg=FFMPEG, trim=False)
+    assert pcm.dtype == np.int16
+    assert abs(len(pcm) - TARGET_SAMPLE_RATE) < TARGET_SAMPLE_RATE // 10
+    assert np.abs(pcm).max() > 8000
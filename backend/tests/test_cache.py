@@ -0,0 +1,44 @@
+import time
+
+from cache import PredictionCache, SQLiteStore
+
+
+def test_expired_rows_are_purged(tmp_path):
+    store = SQLiteStore(str(tmp_path / "cache.sqlite3"), purge_interval=3600)
+    store.set("old", {"answer": 1}, ttl=0.01)
+    store.set("forever", {"answer": 2})
+    time.sleep(0.02)
+    assert store.get("old") is None
+    assert store.purge_expired() == 1
+    assert store.count() == 1
+    assert store.get("forever") == {"answer": 2}
+
+
+def test_set_purges_once_per_interval(tmp_path):
+    store = SQLiteStore(str(tmp_path / "cache.sqlite3"), purge_interval=0.05)
+    for i in range(3):
+        store.set(f"k{i}", i, ttl=0.01)
+    time.sleep(0.06)
+    store.set("fresh", 1, ttl=60)
+    assert store.count() == 1
+
+
+def test_store_keeps_only_the_newest_max_rows(tmp_path):
+    store = SQLiteStore(str(tmp_path / "cache.sqlite3"), purge_interval=3600, max_rows=3)
+    for i in range(6):
+        store.set(f"k{i}", i)
+    store.purge_expired()
+    assert store.count() == 3
+    assert [store.get(f"k{i}") for i in range(6)] == [None, None, None, 3, 4, 5]
+
+
+def test_prediction_cache_drops_other_model_versions_and_expires(tmp_path):
+    path = str(tmp_path / "predictions.sqlite3")
+    old = PredictionCache("v1", db_path=path)
+    old.set(old.key(b"leaf"), {"class_index": 1})
+    new = PredictionCache("v2", db_path=path, ttl=60)
+    assert new.store.count() == 0
+    key = new.key(b"leaf")
+    new.set(key, {"class_index": 2})
+    _, expires_at = new.store.get_with_expiry(key)
+    assert expires_at is not None and expires_at <= time.time() + 60
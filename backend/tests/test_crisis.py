@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from blueprints import geo
+from models import User, UserLocation, db
+from stubs import fake_forecast
+
+
+@pytest.fixture
+def stub_forecasts(monkeypatch):
+    monkeypatch.setattr(geo.forecast_cache, "fetch_fn", fake_forecast)
+    geo.forecast_cache.entries.clear()
+    geo.crisis_results.clear()
+
+
+def test_precompute_fills_crisis_results_for_stored_tiles(db_app, stub_forecasts):
+    db_app.register_blueprint(geo.bp)
+    tiles = []
+    for i, (lat, lon) in enumerate([(19.99, 73.79), (28.61, 77.21), (13.08, 80.27)]):
+        db.session.add(User(id=i + 1, username=f"farmer{i}", password_hash="x"))
+        tile = geo.forecast_cache.tile_for(lat, lon)
+        tiles.append(tile)
+        db.session.add(UserLocation(user_id=i + 1, lat=lat, lon=lon, tile=tile, updated_at=time.time()))
+    db.session.commit()
+
+    result = db_app.test_cli_runner().invoke(args=["precompute-crisis-alerts", "--crop", "wheat"])
+    assert result.exit_code == 0, result.output
+    assert "Evaluated 3 tiles" in result.output
+    snapshot = geo.forecast_cache.snapshot()
+    cached = {tile: geo.crisis_results.get((tile, snapshot[tile][1], "wheat", "")) for tile in tiles}
+    assert all(result is not None for result in cached.values())
+    # Same answers as evaluating each tile on its own
+    geo.crisis_results.clear()
+    for tile in tiles:
+        forecast, meta = geo.forecast_cache.get_tile(tile)
+        assert geo.evaluate_crisis(meta, forecast, crop="wheat") == cached[tile]
+
+
+def test_concurrent_interning_keeps_names_and_codes_aligned():
+    import threading
+
+    from crisis import _WEATHER_NAMES, _weather_code
+
+    names = [f"test-weather-{i}" for i in range(200)]
+    start = threading.Barrier(8)
+
+    def intern():
+        start.wait()
+        for name in names:
+            _weather_code(name)
+
+    threads = [threading.Thread(target=intern) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(_WEATHER_NAMES[_weather_code(name)] == name for name in names)
+    assert len(set(_WEATHER_NAMES)) == len(_WEATHER_NAMES)
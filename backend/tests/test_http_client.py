@@ -0,0 +1,48 @@
+import time
+
+import pytest
+import requests
+
+from http_client import CircuitOpenError, HttpClient
+from stubs import StubOpenWeatherServer
+
+
+def test_half_open_trial_with_undecodable_response_reopens_then_recovers():
+    client = HttpClient(timeout=(1, 2), retries=0, failure_threshold=1, reset_timeout=0.05)
+    with StubOpenWeatherServer(latency=0) as stub:
+        url = f"{stub.base_url}/forecast"
+        host = url.split("/")[2]
+        stub.fail = True
+        client.get(url, endpoint="forecast")
+        assert client.breaker(host).state == "open"
+        with pytest.raises(CircuitOpenError):
+            client.get(url, endpoint="forecast")
+
+        # Half-open trial fails with neither a connection error nor a timeout
+        time.sleep(0.06)
+        stub.fail = False
+        stub.malformed = True
+        with pytest.raises(requests.exceptions.ContentDecodingError):
+            client.get(url, endpoint="forecast")
+        assert client.breaker(host).state == "open"
+
+        # The trial was recorded, so the next one is let through and closes it
+        time.sleep(0.06)
+        stub.malformed = False
+        assert client.get(url, endpoint="forecast").status_code == 200
+        assert client.breaker(host).state == "closed"
+
+    metrics = client.metrics()["endpoints"]["forecast"]
+    assert metrics["requests"] == 3
+    assert metrics["errors"] == 2
+    assert metrics["short_circuited"] == 1
+
+
+def test_non_transient_errors_are_not_retried():
+    client = HttpClient(timeout=(1, 2), retries=2, backoff_base=0)
+    with StubOpenWeatherServer(latency=0) as stub:
+        stub.malformed = True
+        with pytest.raises(requests.exceptions.ContentDecodingError):
+            client.get(f"{stub.base_url}/forecast", endpoint="forecast")
+        assert stub.calls == 1
+    assert client.metrics()["endpoints"]["forecast"]["retries"] == 0
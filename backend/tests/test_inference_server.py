@@ -0,0 +1,35 @@
+import threading
+
+import numpy as np
+import pytest
+
+from inference_server import InferenceServer, RemoteModel
+
+
+class SumModel:
+    name = "sum"
+
+    def predict(self, batch):
+        return np.asarray(batch, dtype=np.float32).reshape(len(batch), -1).sum(axis=1, keepdims=True)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    server = InferenceServer(str(tmp_path / "inference.sock"), SumModel(), max_batch_size=4, max_wait_ms=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    model = RemoteModel(server.server_address, max_batch_size=1, input_shape=(4, 4, 3))
+    yield model
+    model.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_batches_larger_than_the_buffer_are_split(remote):
+    batch = np.random.default_rng(0).random((20, 4, 4, 3), dtype=np.float32)
+    np.testing.assert_allclose(remote.predict(batch)[:, 0], batch.reshape(20, -1).sum(axis=1), rtol=1e-5)
+
+
+def test_single_image_larger_than_the_buffer_raises(remote):
+    with pytest.raises(ValueError, match="does not fit"):
+        remote.predict(np.zeros((1, 64, 64, 3), dtype=np.float32))
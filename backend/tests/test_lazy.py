@@ -0,0 +1,28 @@
+import time
+
+from lazy import Lazy
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_warm_up_retries_after_a_failed_build():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("model file not downloaded yet")
+        return "model"
+
+    lazy = Lazy(factory, name="model")
+    lazy.warm_up()
+    assert _wait_for(lambda: lazy.status() == "error" and lazy._warm_thread is None)
+    lazy.warm_up()
+    assert _wait_for(lambda: lazy.status() == "ready")
+    assert lazy.get() == "model"
+    assert len(attempts) == 2
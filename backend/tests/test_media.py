@@ -0,0 +1,43 @@
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from media import InvalidImageError, MediaStore
+
+
+def _jpeg(size=(800, 600)):
+    buf = BytesIO()
+    Image.new("RGB", size, (40, 140, 60)).save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MediaStore(str(tmp_path / "media"), max_workers=1)
+    yield store
+    store.executor.shutdown(wait=True)
+
+
+def test_save_rejects_truncated_jpeg(store):
+    data = _jpeg()
+    with pytest.raises(InvalidImageError):
+        store.save(BytesIO(data[:len(data) // 2]))
+
+
+def test_save_renders_valid_photo(store):
+    content_hash = store.save(BytesIO(_jpeg()))
+    with Image.open(store.ensure(content_hash, "thumb")) as img:
+        assert max(img.size) == 320
+
+
+def test_unrenderable_original_raises_invalid_image(store):
+    # An original stored before uploads were fully decoded
+    content_hash = "ab" * 32
+    path = store.path_for(content_hash, "original")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(_jpeg()[:500])
+    with pytest.raises(InvalidImageError):
+        store.ensure(content_hash, "thumb")
@@ -0,0 +1,47 @@
+from models import Rental, db
+from rental_search import search_rentals
+
+
+def _seed(count, price_for):
+    rows = [{
+        "title": f"Tractor {i}", "description": "Tractor with operator", "price": price_for(i),
+        "contact": "9800000000", "equipment_type": "Tractor", "rental_duration": "per day",
+        "location": "Nashik", "posted_by": "farmer", "lat": 20.0, "lon": 73.8
+    } for i in range(count)]
+    db.session.execute(Rental.__table__.insert(), rows)
+    db.session.commit()
+
+
+def test_filters_apply_before_ranking_broad_matches(db_app):
+    # Only the 5 oldest of 2500 matching rows pass the price filter
+    _seed(2500, lambda i: 100.0 if i < 5 else 5000.0)
+    results, has_more = search_rentals(q="tractor", max_price=500, limit=20)
+    assert len(results) == 5
+    assert not has_more
+    assert all(r["price"] == 100.0 for r in results)
+
+
+def test_filters_apply_with_distance(db_app):
+    _seed(2500, lambda i: 100.0 if i < 3 else 5000.0)
+    results, _ = search_rentals(q="tractor", lat=20.0, lon=73.8, radius_km=10, max_price=500)
+    assert len(results) == 3
+
+
+def test_background_geocode_fills_missing_coordinates(db_app, monkeypatch):
+    from blueprints import marketplace
+    monkeypatch.setattr(marketplace, "geocode_location", lambda text: (20.0, 73.8))
+    _seed(1, lambda i: 100.0)
+    placed = Rental.query.one()
+    db.session.execute(Rental.__table__.insert(), [{
+        "title": "Rotavator", "description": "Rotavator for hire", "price": 800.0,
+        "contact": "9800000001", "equipment_type": "Rotavator", "rental_duration": "per day",
+        "location": "Nashik", "posted_by": "farmer", "lat": None, "lon": None
+    }])
+    db.session.commit()
+    pending = Rental.query.filter(Rental.lat.is_(None)).one()
+    assert marketplace.geocode_rental(db_app, pending.id, pending.location) == (20.0, 73.8)
+    # Already-placed listings are left alone; the new one becomes searchable by distance
+    monkeypatch.setattr(marketplace, "geocode_location", lambda text: (0.0, 0.0))
+    marketplace.geocode_rental(db_app, placed.id, placed.location)
+    results, _ = search_rentals(lat=20.0, lon=73.8, radius_km=10)
+    assert {r["title"] for r in results} == {"Tractor 0", "Rotavator"}
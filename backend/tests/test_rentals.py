@@ -0,0 +1,45 @@
+import pytest
+
+from models import Rental, db
+from pagination import encode_cursor
+from rentals import list_rentals, parse_rental_args
+
+
+def _seed(prices):
+    db.session.execute(Rental.__table__.insert(), [{
+        "title": f"Sprayer {i}", "description": "", "price": price, "contact": "9800000000",
+        "equipment_type": "Sprayer", "rental_duration": "per day", "location": "Pune", "posted_by": "farmer"
+    } for i, price in enumerate(prices)])
+    db.session.commit()
+
+
+@pytest.mark.parametrize("sort", ["newest", "price_asc", "price_desc"])
+def test_cursor_walk_returns_every_row_once(db_app, sort):
+    _seed([float(i % 7) for i in range(45)])
+    seen, cursor = [], None
+    while True:
+        rentals, cursor = list_rentals(**parse_rental_args({"sort": sort, "limit": "10", "cursor": cursor}))
+        seen.extend(r["id"] for r in rentals)
+        if cursor is None:
+            break
+    assert sorted(seen) == list(range(1, 46))
+
+
+@pytest.mark.parametrize("cursor", [
+    encode_cursor(["x"]),
+    encode_cursor(["price_asc", "cheap", 3]),
+    encode_cursor(["price_asc", 10.0]),
+    encode_cursor([10.0, 3]),
+    encode_cursor({"id": 3}),
+    "not base64!"
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="invalid cursor"):
+        parse_rental_args({"sort": "price_asc", "cursor": cursor})
+
+
+def test_cursor_from_another_sort_is_rejected(db_app):
+    _seed([5.0] * 3)
+    _, cursor = list_rentals(sort="newest", limit=1)
+    with pytest.raises(ValueError, match="invalid cursor"):
+        parse_rental_args({"sort": "price_asc", "cursor": cursor})
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+import schemes
+from http_client import CircuitOpenError
+from pagination import encode_cursor
+from schemes import SchemeStore, scrape_schemes
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SchemeStore(str(tmp_path / "schemes.sqlite3"))
+    store.replace_all([{
+        "title": f"Crop insurance scheme {i}", "link": f"https://www.myscheme.gov.in/schemes/s{i}",
+        "ministry": "Ministry of Agriculture", "description": "Insurance cover for crop loss"
+    } for i in range(25)])
+    return store
+
+
+def test_cursors_walk_pages_and_search(store):
+    for fetch in (lambda c: store.page(per_page=10, cursor=c), lambda c: store.search("insurance", per_page=10, cursor=c)):
+        seen, cursor = [], None
+        while True:
+            schemes, cursor = fetch(cursor)
+            seen.extend(s["link"] for s in schemes)
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == 25
+
+
+@pytest.mark.parametrize("cursor", [encode_cursor(["x"]), encode_cursor(["page", "3"]), encode_cursor([3]), "%%%"])
+def test_tampered_page_cursor_is_rejected(store, cursor):
+    with pytest.raises(ValueError, match="invalid cursor"):
+        store.page(cursor=cursor)
+
+
+def test_cursor_of_another_kind_or_query_is_rejected(store):
+    _, page_cursor = store.page(per_page=10)
+    _, search_cursor = store.search("insurance", per_page=10)
+    with pytest.raises(ValueError, match="invalid cursor"):
+        store.search("insurance", cursor=page_cursor)
+    with pytest.raises(ValueError, match="invalid cursor"):
+        store.page(cursor=search_cursor)
+    with pytest.raises(ValueError, match="invalid cursor"):
+        store.search("crop", cursor=search_cursor)
+
+
+def test_search_cursor_is_rejected_after_the_corpus_changes(store):
+    _, cursor = store.search("insurance", per_page=10)
+    schemes_now = [{
+        "title": f"Crop insurance scheme {i}", "link": f"https://www.myscheme.gov.in/schemes/s{i}",
+        "ministry": "Ministry of Agriculture", "description": "Insurance cover for crop loss"
+    } for i in range(25)]
+    # An unchanged refresh keeps the ETag, so the cursor still works
+    store.replace_all(schemes_now)
+    assert store.search("insurance", per_page=10, cursor=cursor)[0]
+    store.replace_all(schemes_now + [{
+        "title": "Weather insurance", "link": "https://www.myscheme.gov.in/schemes/wbcis",
+        "ministry": "Ministry of Agriculture", "description": "Insurance against adverse weather"
+    }])
+    with pytest.raises(ValueError, match="invalid cursor"):
+        store.search("insurance", per_page=10, cursor=cursor)
+
+
+class _DownHttpClient:
+    def get(self, url, **kwargs):
+        raise CircuitOpenError("Upstream www.myscheme.gov.in is unavailable (circuit open).")
+
+
+def test_scrape_falls_back_to_the_browser_when_http_fails(monkeypatch):
+    with open(os.path.join(FIXTURES, "schemes_page.html"), encoding="utf-8") as f:
+        page = f.read()
+    monkeypatch.setattr(schemes, "fetch_scheme_pages", lambda max_pages: [page])
+    scraped = scrape_schemes(http_client=_DownHttpClient())
+    assert [s["link"] for s in scraped] == [
+        "https://www.myscheme.gov.in/schemes/pmfby",
+        "https://www.myscheme.gov.in/schemes/pmkisan"
+    ]
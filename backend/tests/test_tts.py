@@ -0,0 +1,24 @@
+from stubs import FakeTTSBackend
+from tts import TTSService
+
+
+def test_blank_text_makes_no_clip(tmp_path):
+    backend = FakeTTSBackend(delay=0)
+    service = TTSService(backend, max_workers=2, clip_dir=str(tmp_path))
+    assert service.synthesize("", "en") is None
+    assert service.synthesize("  \n\t ", "hi") is None
+    assert backend.calls == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_clip_is_shared_through_clip_dir(tmp_path):
+    backend = FakeTTSBackend(delay=0)
+    writer = TTSService(backend, max_workers=2, clip_dir=str(tmp_path))
+    clip_id = writer.synthesize("Water the field. Then add urea.", "en")
+    reader = TTSService(backend, max_workers=2, clip_dir=str(tmp_path))
+    assert reader.get_clip(clip_id) == writer.get_clip(clip_id)
+    assert reader.get_clip(clip_id)
+    # A clip file left empty is treated as missing rather than served
+    empty_id = TTSService.clip_id("", "en")
+    (tmp_path / f"{empty_id}.mp3").write_bytes(b"")
+    assert reader.get_clip(empty_id) is None
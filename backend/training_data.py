@@ -0,0 +1,230 @@
+"""Sharded TFRecord input pipeline for training the disease model.
+
+Converts the PlantVillage image tree once into TFRecord shards of
+pre-resized 224x224 images (same train/validation split as
+image_dataset_from_directory with seed 123), then streams them back with
+parallel interleave, parallel augmentation and prefetching. Augmentation
+(flip, rotation, zoom, like the old in-model data_augmentation block) runs
+in tf.data with stateless random ops, so a given seed yields the same
+batches on every run. Run from the backend folder:
+
+    python training_data.py --data-dir /path/to/PlantVillage/raw/color --out-dir shards
+"""
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import tensorflow as tf
+
+from preprocessing import load_resized
+
+IMG_SIZE = (224, 224)
+SPLIT_SEED = 123
+VALIDATION_SPLIT = 0.2
+ENCODINGS = ("jpeg", "raw")
+METADATA_FILE = "metadata.json"
+AUTOTUNE = tf.data.AUTOTUNE
+
+# Ranges of the old Keras layers: RandomRotation(0.1) is a fraction of a
+# full turn, RandomZoom(0.1) scales by 1 +/- 0.1
+ROTATION_FACTOR = 0.1
+ZOOM_FACTOR = 0.1
+
+
+# -----------------------------
+# Writing Shards
+# -----------------------------
+def split_files(data_dir, seed=SPLIT_SEED, validation_split=VALIDATION_SPLIT):
+    # {"train": [(path, label)], "validation": [...]}, class_names. Keras
+    # lists and shuffles the files, so the split matches augmentation.py's
+    # old datasets and export_model.validation_samples.
+    splits = {}
+    class_names = None
+    for subset, name in (("training", "train"), ("validation", "validation")):
+        dataset = tf.keras.utils.image_dataset_from_directory(
+            data_dir, validation_split=validation_split, subset=subset, seed=seed, image_size=IMG_SIZE
+        )
+        class_names = dataset.class_names
+        index = {class_name: i for i, class_name in enumerate(class_names)}
+        splits[name] = [(path, index[os.path.basename(os.path.dirname(path))]) for path in dataset.file_paths]
+    return splits, class_names
+
+
+def _encode(path, encoding, quality):
+    img = load_resized(path, IMG_SIZE)
+    if encoding == "raw":
+        return np.asarray(img, dtype=np.uint8).tobytes()
+    buf = BytesIO()
+    img.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def _example(image_bytes, label):
+    return tf.train.Example(features=tf.train.Features(feature={
+        "image": tf.train.Feature(bytes_list=tf.train.BytesList(value=[image_bytes])),
+        "label": tf.train.Feature(int64_list=tf.train.Int64List(value=[label]))
+    })).SerializeToString()
+
+
+def _write_shard(path, samples, encoding, quality):
+    with tf.io.TFRecordWriter(path) as writer:
+        for image_path, label in samples:
+            writer.write(_example(_encode(image_path, encoding, quality), label))
+    return len(samples)
+
+
+def shard_paths(shard_dir, split):
+    return sorted(tf.io.gfile.glob(os.path.join(shard_dir, f"{split}-*.tfrecord")))
+
+
+def write_shards(data_dir, shard_dir, images_per_shard=2000, encoding="jpeg", quality=95, workers=None, seed=SPLIT_SEED):
+    # One pass over the image tree. Files are spread round-robin over the
+    # shards in Keras' shuffled order, so every shard mixes all classes.
+    if encoding not in ENCODINGS:
+        raise ValueError(f"encoding must be one of: {', '.join(ENCODINGS)}.")
+    os.makedirs(shard_dir, exist_ok=True)
+    splits, class_names = split_files(data_dir, seed)
+    counts = {}
+    jobs = []
+    for split, samples in splits.items():
+        for stale in shard_paths(shard_dir, split):
+            os.remove(stale)
+        num_shards = max(1, math.ceil(len(samples) / images_per_shard))
+        for i in range(num_shards):
+            path = os.path.join(shard_dir, f"{split}-{i:05d}-of-{num_shards:05d}.tfrecord")
+            jobs.append((path, samples[i::num_shards]))
+        counts[split] = len(samples)
+    # PIL decode/resize and TFRecord writes release the GIL
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        list(pool.map(lambda job: _write_shard(job[0], job[1], encoding, quality), jobs))
+    metadata = {
+        "class_names": class_names,
+        "counts": counts,
+        "image_size": list(IMG_SIZE),
+        "encoding": encoding,
+        "seed": seed
+    }
+    with open(os.path.join(shard_dir, METADATA_FILE), "w") as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+
+def read_metadata(shard_dir):
+    with open(os.path.join(shard_dir, METADATA_FILE)) as f:
+        return json.load(f)
+
+
+# -----------------------------
+# Reading Shards
+# -----------------------------
+def _parser(encoding):
+    height, width = IMG_SIZE
+    spec = {
+        "image": tf.io.FixedLenFeature([], tf.string),
+        "label": tf.io.FixedLenFeature([], tf.int64)
+    }
+
+    def parse(record):
+        example = tf.io.parse_single_example(record, spec)
+        if encoding == "raw":
+            image = tf.reshape(tf.io.decode_raw(example["image"], tf.uint8), (height, width, 3))
+        else:
+            image = tf.io.decode_jpeg(example["image"], channels=3)
+            image.set_shape((height, width, 3))
+        return image, tf.cast(example["label"], tf.int32)
+
+    return parse
+
+
+def augment_batch(images, labels, seed):
+    # Random horizontal flip, rotation and zoom per image, from stateless ops
+    # keyed by `seed` (a [2] int64 tensor). Images stay float32 in [0, 255].
+    images = tf.cast(images, tf.float32)
+    n = tf.shape(images)[0]
+    height, width = IMG_SIZE
+    flip_seed, angle_seed, zoom_seed = tf.unstack(tf.random.experimental.stateless_split(seed, 3))
+
+    flip = tf.random.stateless_uniform([n], flip_seed) < 0.5
+    images = tf.where(flip[:, None, None, None], tf.reverse(images, axis=[2]), images)
+
+    angle = tf.random.stateless_uniform([n], angle_seed, -ROTATION_FACTOR, ROTATION_FACTOR) * 2.0 * math.pi
+    zoom = tf.random.stateless_uniform([n], zoom_seed, 1.0 - ZOOM_FACTOR, 1.0 + ZOOM_FACTOR)
+    # Output pixel -> input pixel: rotate and scale about the image centre
+    cx, cy = (width - 1) / 2.0, (height - 1) / 2.0
+    cos, sin = tf.cos(angle) * zoom, tf.sin(angle) * zoom
+    zeros = tf.zeros_like(cos)
+    transforms = tf.stack([
+        cos, -sin, cx - cos * cx + sin * cy,
+        sin, cos, cy - sin * cx - cos * cy,
+        zeros, zeros
+    ], axis=1)
+    images = tf.raw_ops.ImageProjectiveTransformV3(
+        images=images, transforms=transforms, output_shape=[height, width], fill_value=0.0,
+        interpolation="BILINEAR", fill_mode="REFLECT"
+    )
+    return images, labels
+
+
+def load_dataset(shard_dir, split, batch_size=32, seed=SPLIT_SEED, training=None, shuffle_buffer=4096, cycle_length=8):
+    # (images, labels) batches: float32 [0, 255] images like
+    # image_dataset_from_directory. The training split is shuffled and
+    # augmented; both depend only on `seed` and change every epoch.
+    training = split == "train" if training is None else training
+    metadata = read_metadata(shard_dir)
+    files = shard_paths(shard_dir, split)
+    if not files:
+        raise FileNotFoundError(f"No {split} shards in {shard_dir}; run training_data.py first.")
+
+    dataset = tf.data.Dataset.from_tensor_slices(files)
+    if training:
+        dataset = dataset.shuffle(len(files), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.interleave(
+        tf.data.TFRecordDataset,
+        cycle_length=min(cycle_length, len(files)),
+        num_parallel_calls=AUTOTUNE,
+        deterministic=True
+    )
+    if training:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.map(_parser(metadata["encoding"]), num_parallel_calls=AUTOTUNE, deterministic=True)
+    dataset = dataset.batch(batch_size, num_parallel_calls=AUTOTUNE, deterministic=True)
+    if training:
+        # Each batch is augmented with its own [2] seed drawn from a random
+        # stream seeded by `seed`. The stream is redrawn for every epoch
+        # (deterministically, like the shuffles), so an image gets different
+        # augmentations each epoch and the same ones on every run.
+        seeds = tf.data.Dataset.random(seed=seed, rerandomize_each_iteration=True).batch(2)
+        dataset = tf.data.Dataset.zip((dataset, seeds)).map(
+            lambda batch, batch_seed: augment_batch(batch[0], batch[1], batch_seed),
+            num_parallel_calls=AUTOTUNE,
+            deterministic=True
+        )
+    else:
+        dataset = dataset.map(lambda images, labels: (tf.cast(images, tf.float32), labels), num_parallel_calls=AUTOTUNE)
+    options = tf.data.Options()
+    options.deterministic = True
+    return dataset.with_options(options).prefetch(AUTOTUNE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", required=True, help="image folder with one subfolder per class")
+    parser.add_argument("--out-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "shards"))
+    parser.add_argument("--images-per-shard", type=int, default=2000)
+    parser.add_argument("--encoding", choices=ENCODINGS, default="jpeg",
+                        help="jpeg: ~10x smaller shards, decoded in parallel; raw: no decode, 147 KiB per image")
+    parser.add_argument("--quality", type=int, default=95)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    metadata = write_shards(args.data_dir, args.out_dir, args.images_per_shard, args.encoding, args.quality, args.workers)
+    print(f"Wrote {metadata['counts']['train']} training and {metadata['counts']['validation']} validation images "
+          f"({len(metadata['class_names'])} classes) to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from cache import LRUCache
+
+
+# -----------------------------
+# Text-to-Speech Backends
+# -----------------------------
+class GTTSBackend:
+    mimetype = "audio/mpeg"
+
+    def synthesize(self, text, lang):
+        from gtts import gTTS
+
+        mp3_fp = BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(mp3_fp)
+        return mp3_fp.getvalue()
+
+
+# -----------------------------
+# Sentence Chunking
+# -----------------------------
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+
+
+def split_sentences(text, max_chars=200):
+    # Split on sentence boundaries (including the Devanagari danda), then
+    # pack short sentences together so we don't pay a request per fragment.
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# -----------------------------
+# TTS Service
+# -----------------------------
+_CLIP_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class TTSService:
+    # Synthesizes sentence chunks concurrently on a bounded pool, caches each
+    # chunk by (text, lang) and keeps finished clips addressable by id so they
+    # can be served from /audio/<id> instead of inlined as base64. With a
+    # clip_dir, clips are also written there so any worker process can serve
+    # a clip another one synthesized; files older than clip_ttl_s are pruned.
+    def __init__(self, backend, max_workers=4, chunk_cache_entries=2048, clip_cache_entries=256, max_chunk_chars=200,
+                 clip_dir=None, clip_ttl_s=24 * 3600):
+        self.backend = backend
+        self.mimetype = getattr(backend, "mimetype", "audio/mpeg")
+        self.max_chunk_chars = max_chunk_chars
+        self.chunks = LRUCache(chunk_cache_entries)
+        self.clips = LRUCache(clip_cache_entries)
+        self.clip_dir = clip_dir
+        self.clip_ttl_s = clip_ttl_s
+        self._last_prune = 0.0
+        if clip_dir:
+            os.makedirs(clip_dir, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+
+    @staticmethod
+    def clip_id(text, lang):
+        return hashlib.sha256(f"{lang}\x1f{text}".encode("utf-8")).hexdigest()[:32]
+
+    def _synthesize_chunk(self, chunk, lang):
+        key = (chunk, lang)
+        audio = self.chunks.get(key)
+        if audio is None:
+            audio = self.backend.synthesize(chunk, lang)
+            self.chunks.set(key, audio)
+        return audio
+
+    def synthesize(self, text, lang="en"):
+        # Returns the clip id, or None if there is nothing to say; the audio
+        # itself is fetched with get_clip()
+        chunks = split_sentences(text, self.max_chunk_chars)
+        if not chunks:
+            return None
+        clip_id = self.clip_id(text, lang)
+        if self.clips.get(clip_id) is not None:
+            return clip_id
+        # MP3 frames are self-delimiting, so per-sentence clips concatenate
+        # into one playable stream.
+        parts = self._pool.map(lambda chunk: self._synthesize_chunk(chunk, lang), chunks)
+        audio = b"".join(parts)
+        self.clips.set(clip_id, audio)
+        self._write_clip(clip_id, audio)
+        return clip_id
+
+    def _clip_path(self, clip_id):
+        return os.path.join(self.clip_dir, f"{clip_id}.mp3")
+
+    def _write_clip(self, clip_id, audio):
+        if not self.clip_dir:
+            return
+        # Write-then-rename, so readers in other processes never see a
+        # partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.clip_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, self._clip_path(clip_id))
+        self._prune()
+
+    def _prune(self):
+        now = time.time()
+        if now - self._last_prune < 600:
+            return
+        self._last_prune = now
+        for entry in os.scandir(self.clip_dir):
+            try:
+                if now - entry.stat().st_mtime > self.clip_ttl_s:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def get_clip(self, clip_id):
+        audio = self.clips.get(clip_id)
+        if audio is not None or not self.clip_dir or not _CLIP_ID.match(clip_id):
+            return audio
+        try:
+            with open(self._clip_path(clip_id), "rb") as f:
+                audio = f.read()
+        except OSError:
+            return None
+        if not audio:
+            return None
+        self.clips.set(clip_id, audio)
+        return audio
+
+    def stats(self):
+        return {"chunks": self.chunks.stats(), "clips": self.clips.stats()}
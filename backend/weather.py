@@ -0,0 +1,153 @@
+import time
+
+from cache import LRUCache, SingleFlight
+
+
+# -----------------------------
+# Geohash Tiles
+# -----------------------------
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat, lon, precision=5):
+    # Precision 5 is a ~4.9 km x 4.9 km cell, about one village/town
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    bits = 0
+    bit_count = 0
+    even = True
+    chars = []
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_center(tile):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in tile:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+# -----------------------------
+# OpenWeather Client
+# -----------------------------
+class OpenWeatherClient:
+    # `client` is an http_client.HttpClient; timeout=None uses its defaults
+    def __init__(self, client, api_key, base_url="https://api.openweathermap.org/data/2.5", timeout=None):
+        self.client = client
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def fetch_forecast(self, lat, lon):
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.api_key,
+            "units": "metric"
+        }
+        r = self.client.get(f"{self.base_url}/forecast", params=params, timeout=self.timeout, endpoint="openweather.forecast")
+        r.raise_for_status()
+        return r.json()
+
+
+# -----------------------------
+# Per-tile Forecast Cache
+# -----------------------------
+FORECAST_SLOT_SECONDS = 3 * 3600
+
+
+class ForecastCache:
+    # Forecasts are cached per geohash tile until the provider's next 3-hour
+    # slot. Concurrent misses for a tile share one upstream fetch, and if the
+    # upstream fails a previous entry is served (flagged stale) for up to
+    # stale_ttl seconds.
+    def __init__(self, fetch_fn, precision=5, max_tiles=10000, stale_ttl=24 * 3600, slot_seconds=FORECAST_SLOT_SECONDS):
+        self.fetch_fn = fetch_fn
+        self.precision = precision
+        self.stale_ttl = stale_ttl
+        self.slot_seconds = slot_seconds
+        self.entries = LRUCache(max_tiles)
+        self.flight = SingleFlight()
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+        self.stale_served = 0
+
+    def tile_for(self, lat, lon):
+        return geohash_encode(lat, lon, self.precision)
+
+    def _expiry(self, now):
+        return (int(now // self.slot_seconds) + 1) * self.slot_seconds
+
+    def _fetch(self, tile):
+        entry = self.entries.get(tile)
+        if entry is not None and entry["expires_at"] > time.time():
+            return entry
+        self.upstream_calls += 1
+        # Query the tile centre so every user in the tile gets the same answer
+        lat, lon = geohash_center(tile)
+        data = self.fetch_fn(lat, lon)
+        now = time.time()
+        entry = {"data": data, "fetched_at": now, "expires_at": self._expiry(now)}
+        self.entries.set(tile, entry)
+        return entry
+
+    def get(self, lat, lon):
+        # Returns (forecast, meta). The forecast dict is shared; copy before
+        # mutating it.
+        return self.get_tile(self.tile_for(lat, lon))
+
+    def get_tile(self, tile):
+        entry = self.entries.get(tile)
+        now = time.time()
+        if entry is None or entry["expires_at"] <= now:
+            try:
+                entry = self.flight.do(tile, lambda: self._fetch(tile))
+            except Exception:
+                self.upstream_errors += 1
+                if entry is None or now - entry["fetched_at"] > self.stale_ttl:
+                    raise
+                self.stale_served += 1
+                return entry["data"], self._meta(tile, entry, stale=True)
+        return entry["data"], self._meta(tile, entry, stale=False)
+
+    @staticmethod
+    def _meta(tile, entry, stale):
+        return {"tile": tile, "fetched_at": entry["fetched_at"], "stale": stale}
+
+    def snapshot(self):
+        # {tile: (forecast, fetched_at)} for every unexpired tile, e.g. to
+        # evaluate crisis rules over all active regions at once
+        now = time.time()
+        return {tile: (e["data"], e["fetched_at"]) for tile, e in self.entries.items() if e["expires_at"] > now}
+
+    def stats(self):
+        stats = self.entries.stats()
+        stats["upstream_calls"] = self.upstream_calls
+        stats["upstream_errors"] = self.upstream_errors
+        stats["stale_served"] = self.stale_served
+        return stats
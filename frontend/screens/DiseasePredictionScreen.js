@@ -112,33 +112,19 @@ const DiseasePredictionScreen = () => {
       type: "image/jpeg",
     });
     try {
-      const response = await fetch(`${BACKEND_URL}/predict`, {
+      // Prediction, disease info/advice and store type in one round-trip
+      const response = await fetch(`${BACKEND_URL}/diagnose`, {
         method: "POST",
         body: formData,
       });
       const data = await response.json();
-      setPrediction(data.predicted_disease);
-      if (data.predicted_disease.toLowerCase().includes("healthy")) {
-        const adviceResponse = await fetch(`${BACKEND_URL}/healthy_advice`);
-        const adviceData = await adviceResponse.json();
-        setAdditionalInfo(adviceData.advice);
-      } else {
-        const diseaseInfoResponse = await fetch(
-          `${BACKEND_URL}/disease_info?disease_name=${encodeURIComponent(
-            data.predicted_disease
-          )}`
-        );
-        const diseaseInfoData = await diseaseInfoResponse.json();
-        setAdditionalInfo(diseaseInfoData.disease_info);
+      if (data.error) {
+        throw new Error(data.error);
       }
-      const storeTypeResponse = await fetch(
-        `${BACKEND_URL}/recommended_store_type?disease_name=${encodeURIComponent(
-          data.predicted_disease
-        )}`
-      );
-      const storeTypeData = await storeTypeResponse.json();
-      if (storeTypeData.store_type) {
-        setRecommendedStoreType(storeTypeData.store_type);
+      setPrediction(data.predicted_disease);
+      setAdditionalInfo(data.advice || data.disease_info || null);
+      if (data.store_type) {
+        setRecommendedStoreType(data.store_type);
       }
     } catch (error) {
       console.error(error);
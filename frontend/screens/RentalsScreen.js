@@ -22,6 +22,8 @@ const farmlandImage = {
 
 const RentalsScreen = ({ navigation }) => {
   const [rentals, setRentals] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showAddModal, setShowAddModal] = useState(false);
   const [loggedIn, setLoggedIn] = useState(false);
   const [loginForm, setLoginForm] = useState({ username: "", password: "" });
@@ -41,16 +43,28 @@ const RentalsScreen = ({ navigation }) => {
     fetchRentals();
   }, []);
 
-  const fetchRentals = async () => {
+  // Loads the first page, or the next one when `cursor` is given
+  const fetchRentals = async (cursor = null) => {
     try {
-      const response = await fetch(`${BACKEND_URL}/rentals`);
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+      const response = await fetch(`${BACKEND_URL}/rentals${query}`);
       const data = await response.json();
-      setRentals(data.rentals);
+      setRentals((current) =>
+        cursor ? [...current, ...data.rentals] : data.rentals
+      );
+      setNextCursor(data.next_cursor);
     } catch (error) {
       console.error("Error fetching rentals:", error);
     }
   };
 
+  const fetchMoreRentals = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    await fetchRentals(nextCursor);
+    setLoadingMore(false);
+  };
+
   const handleLogin = async () => {
     try {
       const response = await fetch(`${BACKEND_URL}/login`, {
@@ -136,7 +150,7 @@ const RentalsScreen = ({ navigation }) => {
             location: "",
             photo: null,
           });
-          fetchRentals();
+          setRentals((current) => [data.rental, ...current]);
         } else {
           Alert.alert("Error", data.error || "Could not add rental.");
         }
@@ -167,7 +181,7 @@ const RentalsScreen = ({ navigation }) => {
             location: "",
             photo: null,
           });
-          fetchRentals();
+          setRentals((current) => [data.rental, ...current]);
         } else {
           Alert.alert("Error", data.error || "Could not add rental.");
         }
@@ -192,6 +206,8 @@ const RentalsScreen = ({ navigation }) => {
         <FlatList
           data={rentals}
           keyExtractor={(item) => item.id.toString()}
+          onEndReached={fetchMoreRentals}
+          onEndReachedThreshold={0.5}
           contentContainerStyle={styles.listContainer}
           renderItem={({ item }) => (
             <View style={styles.rentalItem}>